@@ -0,0 +1,109 @@
+"""
+News store memory benchmark for the Comrade backend
+
+Reports bytes per article for the previous dict-per-article layout and for
+the columnar NewsStore. Run from the backend directory:
+
+    python -m benchmarks.news_store_memory --articles 100000
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Callable, List, Tuple
+
+from models.news import NewsCategory, NewsSource
+from services.news_store import NewsStore
+
+TAGS = ["Army", "Navy", "Air Force", "LAC", "Defense", "Policy", "Technology", "Exercise"]
+VOCABULARY_SIZE = 5000
+
+
+def make_vocabulary(rng: random.Random) -> Tuple[List[str], List[float]]:
+    """Pseudo-words with cumulative Zipf weights, so content compresses roughly like prose"""
+    letters = "etaoinshrdlucmfwypvbgkqjxz"
+    words = [
+        "".join(rng.choices(letters, weights=range(26, 0, -1), k=rng.randint(2, 10)))
+        for _ in range(VOCABULARY_SIZE)
+    ]
+    return words, list(accumulate(1 / rank for rank in range(1, VOCABULARY_SIZE + 1)))
+
+
+def make_articles(count: int, content_words: int, seed: int = 7) -> List[dict]:
+    """Synthetic articles shaped like ingested RSS items"""
+    rng = random.Random(seed)
+    words, cum_weights = make_vocabulary(rng)
+    now = datetime.now(timezone.utc)
+    categories = list(NewsCategory)
+    sources = list(NewsSource)
+    articles = []
+    for index in range(count):
+        published_at = now - timedelta(minutes=rng.randrange(60 * 24 * 365))
+        articles.append({
+            "id": f"news_{index:016x}",
+            "title": " ".join(rng.choices(words, cum_weights=cum_weights, k=10)).capitalize(),
+            "description": " ".join(rng.choices(words, cum_weights=cum_weights, k=35)).capitalize(),
+            "content": " ".join(rng.choices(words, cum_weights=cum_weights, k=content_words)),
+            "image_url": f"https://cdn.example.com/images/{index}.jpg",
+            "source_url": f"https://news.example.com/articles/{index}",
+            "source": rng.choice(sources),
+            "author": rng.choice([None, "Defense Correspondent", "Staff Reporter"]),
+            "category": rng.choice(categories),
+            "tags": rng.sample(TAGS, k=rng.randint(1, 4)),
+            "read_time": rng.randint(1, 10),
+            "published_at": published_at,
+            "created_at": published_at,
+            "updated_at": None,
+            "also_reported_by": [],
+            "is_featured": rng.random() < 0.05,
+            "view_count": rng.randrange(5000),
+        })
+    return articles
+
+
+def measure(build: Callable[[], object]) -> int:
+    """Bytes still allocated by the structure build() returns"""
+    gc.collect()
+    tracemalloc.start()
+    structure = build()
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del structure
+    return allocated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=50000)
+    parser.add_argument("--content-words", type=int, default=300)
+    args = parser.parse_args()
+
+    count = args.articles
+
+    def dict_rows() -> dict:
+        # Fresh objects so nothing is shared with a previous measurement
+        return {article["id"]: article for article in make_articles(count, args.content_words)}
+
+    def columnar() -> NewsStore:
+        store = NewsStore()
+        store.add_many(make_articles(count, args.content_words))
+        return store
+
+    content_bytes = sum(
+        len(article["content"].encode()) for article in make_articles(count, args.content_words)
+    )
+    before = measure(dict_rows)
+    after = measure(columnar)
+
+    print(f"articles:            {count}")
+    print(f"content per article: {content_bytes / count:,.0f} bytes of UTF-8")
+    print(f"dict rows:           {before / count:,.0f} bytes/article")
+    print(f"NewsStore:           {after / count:,.0f} bytes/article (indexes included)")
+    print(f"saved:               {(1 - after / before) * 100:.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -12,9 +12,12 @@ class Settings(BaseSettings):
     # App settings
     app_name: str = "Comrade Backend"
     debug: bool = False
+    app_timezone: str = "Asia/Kolkata"  # day boundaries for daily news, quizzes and streaks
     
     # Database settings
-    database_url: Optional[str] = None
+    database_url: Optional[str] = None  # memory:// (default) or sqlite:///path/to/comrade.db
+    database_pool_size: int = 4  # SQLite reader connections
+    database_write_batch_size: int = 500  # writes per SQLite group commit
     
     # Firebase settings
     firebase_credentials_path: Optional[str] = None
@@ -24,6 +27,74 @@ class Settings(BaseSettings):
     pib_rss_url: str = "https://pib.gov.in/rss/leng.xml"
     hindu_rss_url: str = "https://www.thehindu.com/news/national/feeder/default.rss"
     indian_express_rss_url: str = "https://indianexpress.com/section/india/feed/"
+    rss_ingestion_enabled: bool = True
+    rss_poll_interval_minutes: int = 15
+    rss_fetch_timeout_seconds: float = 10.0
+    rss_max_connections: int = 10
+    rss_backoff_base_seconds: float = 30.0
+    rss_backoff_max_seconds: float = 3600.0
+    enrichment_workers: int = 2
+    enrichment_batch_size: int = 32
+    enrichment_cache_size: int = 10000  # enrichment results kept by content hash
+    nltk_download_enabled: bool = True
+    dedup_max_distance: int = 3  # SimHash bits that may differ between near-duplicates
+    
+    # Trending settings
+    trending_half_life_hours: float = 6.0  # views lose half their weight every N hours
+    trending_window_hours: float = 72.0  # only articles published within the window rank
+    trending_board_size: int = 50  # most articles /trending returns per board
+    
+    # News card settings
+    news_card_excerpt_chars: int = 280
+    news_response_cache_size: int = 5000  # articles whose serialized responses are cached (LRU)
+    
+    # Related articles settings
+    related_neighbours: int = 10  # neighbours stored per article (max /related limit)
+    
+    # News stream settings
+    news_stream_queue_size: int = 100  # frames buffered per client before it is dropped
+    news_stream_buffer_size: int = 500  # recent events kept for Last-Event-ID resume
+    news_stream_heartbeat_seconds: float = 15.0
+    news_stream_retry_ms: int = 5000  # reconnect delay suggested to clients
+    
+    # News archive settings
+    news_archive_dir: Optional[str] = None  # sealed day segments are written here; unset disables archiving
+    news_archive_after_days: int = 30  # whole days older than this move to the archive
+    news_archive_open_segments: int = 32  # day segments kept memory-mapped at once
+    news_archive_interval_minutes: int = 60
+    
+    # Bulk ingestion settings
+    news_bulk_max_items: int = 5000
+    news_bulk_max_bytes: int = 32 * 1024 * 1024  # request bodies larger than this are refused unread
+    news_importer_token: Optional[str] = None  # X-Importer-Token for /news/bulk; unset disables the endpoint
+    
+    # Quiz grading settings
+    quiz_batch_max_attempts: int = 100
+    quiz_answer_unicode_normalization: bool = True  # NFKC + casefold fill-in-blank answers
+    quiz_answer_collapse_whitespace: bool = True
+    
+    # Daily quiz generation settings
+    quiz_generation_enabled: bool = True
+    quiz_generation_hour: int = 23  # local time the next day's quiz is built
+    quiz_generation_minute: int = 30
+    quiz_generation_workers: int = 1
+    daily_quiz_questions: int = 10
+    daily_quiz_min_questions: int = 3
+    
+    # Quiz submission settings
+    idempotency_cache_size: int = 10000  # Idempotency-Key outcomes kept for replay
+    idempotency_ttl_seconds: float = 86400.0
+    
+    # Leaderboard settings
+    leaderboard_retention_days: int = 7  # days of results ranked in memory
+    
+    # User stats settings
+    user_stats_cache_size: int = 50000  # users whose running stats are kept in memory (LRU)
+    
+    # View counter settings
+    view_counter_shards: int = 8
+    view_flush_interval_seconds: float = 5.0
+    view_flush_max_pending: int = 1000  # flush early once this many views are buffered
     
     # JWT settings
     secret_key: str = "your-secret-key-change-in-production"
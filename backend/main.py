@@ -6,6 +6,9 @@ Defense Aspirants App Backend
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
+from datetime import datetime
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import uvicorn
 from dotenv import load_dotenv
 import os
@@ -14,7 +17,13 @@ import os
 load_dotenv()
 
 # Import routers
+from config import settings
 from routers import auth_router, news_router, quiz_router
+from services.clock import local_tz, today
+from services.enrichment import EnrichmentStage, ensure_nltk_data
+from services.quiz_generation import QuizGenerator
+from services.repository import repository
+from services.rss_ingestion import FeedIngestor, default_feeds
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -24,13 +33,84 @@ async def lifespan(app: FastAPI):
     
     # Initialize services here
     # - Firebase Admin SDK
-    # - RSS feed scheduler
-    # - NLTK data download
+    await repository.connect()
+    await news_router.load_news()
+    await quiz_router.initialize_mock_quizzes()
+    await quiz_router.load_leaderboards()
+    if settings.nltk_download_enabled:
+        await asyncio.to_thread(ensure_nltk_data)
+    news_router.view_counter.start()
+    news_router.news_stream.start()
+    
+    enrichment = EnrichmentStage(
+        workers=settings.enrichment_workers,
+        batch_size=settings.enrichment_batch_size,
+        cache_size=settings.enrichment_cache_size
+    )
+    quiz_generator = QuizGenerator(workers=settings.quiz_generation_workers)
+    scheduler = AsyncIOScheduler()
+    ingestor = FeedIngestor(
+        default_feeds(settings),
+        news_router.upsert_ingested_news,
+        timeout=settings.rss_fetch_timeout_seconds,
+        max_connections=settings.rss_max_connections,
+        backoff_base=settings.rss_backoff_base_seconds,
+        backoff_max=settings.rss_backoff_max_seconds,
+        enrich=enrichment.enrich
+    )
+    app.state.feed_ingestor = ingestor
+    if settings.rss_ingestion_enabled:
+        scheduler.add_job(
+            ingestor.poll_all,
+            "interval",
+            minutes=settings.rss_poll_interval_minutes,
+            next_run_time=datetime.now(),
+            max_instances=1,
+            coalesce=True
+        )
+    if news_router.news_archive.enabled:
+        scheduler.add_job(
+            news_router.archive_old_news,
+            "interval",
+            minutes=settings.news_archive_interval_minutes,
+            max_instances=1,
+            coalesce=True
+        )
+    if settings.quiz_generation_enabled:
+        # Catch up on today's quiz in case the server was down at generation time
+        scheduler.add_job(
+            quiz_router.generate_daily_quiz,
+            "date",
+            args=[quiz_generator, today()]
+        )
+        scheduler.add_job(
+            quiz_router.generate_upcoming_quiz,
+            "cron",
+            hour=settings.quiz_generation_hour,
+            minute=settings.quiz_generation_minute,
+            timezone=local_tz,
+            args=[quiz_generator],
+            max_instances=1,
+            coalesce=True
+        )
+    if scheduler.get_jobs():
+        scheduler.start()
     
     yield
     
     # Shutdown
     print("🛑 Comrade Backend shutting down...")
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    await ingestor.close()
+    enrichment.shutdown()
+    quiz_generator.shutdown()
+    await news_router.news_stream.stop()
+    # Seal late arrivals for archived days before the archive closes
+    await news_router.archive_old_news()
+    await news_router.view_counter.stop()
+    news_router.news_archive.close()
+    await repository.close()
 
 # Create FastAPI app
 app = FastAPI(
@@ -68,6 +148,14 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "comrade-backend"}
 
+@app.get("/health/ingestion")
+async def ingestion_health():
+    """RSS ingestion fetch metrics per feed"""
+    ingestor = getattr(app.state, "feed_ingestor", None)
+    if ingestor is None:
+        return {"feeds": {}}
+    return {"feeds": {name: metrics.as_dict() for name, metrics in ingestor.metrics.items()}}
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
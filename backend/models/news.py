@@ -30,6 +30,12 @@ class NewsSource(str, Enum):
     ECONOMIC_TIMES = "Economic Times"
 
 
+class NewsView(str, Enum):
+    """News payload views for list endpoints"""
+    CARD = "card"  # compact swipe-card fields, no full content
+    FULL = "full"
+
+
 class NewsBase(BaseModel):
     """Base news model"""
     title: str = Field(..., min_length=10, max_length=500)
@@ -44,6 +50,12 @@ class NewsBase(BaseModel):
     read_time: int = Field(default=3, ge=1, le=60)  # in minutes
 
 
+class NewsReport(BaseModel):
+    """Another outlet's report of the same story"""
+    source: str
+    source_url: str
+
+
 class NewsCreate(NewsBase):
     """News creation model"""
     pass
@@ -66,6 +78,7 @@ class News(NewsBase):
     published_at: datetime
     created_at: datetime
     updated_at: Optional[datetime] = None
+    also_reported_by: List[NewsReport] = Field(default_factory=list)
     is_featured: bool = False
     view_count: int = 0
     
@@ -88,6 +101,27 @@ class NewsResponse(BaseModel):
     read_time: int
     published_at: datetime
     created_at: datetime
+    also_reported_by: List[NewsReport] = Field(default_factory=list)
+    is_featured: bool = False
+    view_count: int = 0
+    is_bookmarked: bool = False  # Will be set based on user context
+
+
+class NewsCardResponse(BaseModel):
+    """Compact news card model (full content only via GET /news/{news_id})"""
+    id: str
+    title: str
+    description: str
+    excerpt: Optional[str] = None  # Truncated content, only when requested
+    image_url: Optional[str] = None
+    source_url: str
+    source: str
+    author: Optional[str] = None
+    category: str
+    tags: List[str]
+    read_time: int
+    published_at: datetime
+    also_reported_by: List[NewsReport] = Field(default_factory=list)
     is_featured: bool = False
     view_count: int = 0
     is_bookmarked: bool = False  # Will be set based on user context
@@ -101,6 +135,18 @@ class NewsListResponse(BaseModel):
     per_page: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None  # Opaque keyset cursor for the next page
+
+
+class NewsCardListResponse(BaseModel):
+    """News card list response model"""
+    news: List[NewsCardResponse]
+    total: int
+    page: int
+    per_page: int
+    has_next: bool
+    has_prev: bool
+    next_cursor: Optional[str] = None
 
 
 class NewsFilter(BaseModel):
@@ -120,3 +166,38 @@ class DailyNewsResponse(BaseModel):
     news: List[NewsResponse]
     total_count: int
     categories_count: dict  # category -> count mapping
+
+
+class DailyNewsCardResponse(BaseModel):
+    """Daily news card response model"""
+    date: datetime
+    news: List[NewsCardResponse]
+    total_count: int
+    categories_count: dict  # category -> count mapping
+
+
+class NewsBulkItemError(BaseModel):
+    """Validation errors of one bulk ingestion item"""
+    index: int  # position in the submitted array or NDJSON line number - 1
+    errors: List[dict]
+
+
+class NewsBulkTimings(BaseModel):
+    """Time spent in each bulk ingestion phase, in milliseconds"""
+    parse_ms: float
+    validate_ms: float
+    commit_ms: float
+    total_ms: float
+
+
+class NewsBulkResponse(BaseModel):
+    """Bulk news ingestion result"""
+    received: int
+    inserted: int
+    updated: int
+    merged: int
+    unchanged: int
+    failed: int
+    news_ids: List[Optional[str]]  # aligned with the input; None for failed items
+    errors: List[NewsBulkItemError]
+    timings: NewsBulkTimings
@@ -187,8 +187,8 @@ class QuizResult(BaseModel):
         from_attributes = True
 
 
-class QuizResultResponse(BaseModel):
-    """Quiz result response model"""
+class QuizResultSummary(BaseModel):
+    """Quiz result summary model"""
     id: str
     quiz: QuizResponse
     score: int
@@ -197,13 +197,84 @@ class QuizResultResponse(BaseModel):
     time_taken: Optional[int] = None
     passed: bool
     submitted_at: datetime
+
+
+class QuizResultResponse(QuizResultSummary):
+    """Quiz result response model"""
     questions_with_answers: List[QuestionWithAnswer]
     user_answers: List[UserAnswer]
 
 
+class QuizAttempt(QuizSubmission):
+    """One offline attempt in a batch submission"""
+    submitted_at: Optional[datetime] = None  # when the attempt was finished on the client
+
+
+class QuizBatchSubmission(BaseModel):
+    """Batch of offline attempts of one quiz"""
+    attempts: List[QuizAttempt] = Field(..., min_items=1)
+
+
+class QuizAttemptGrade(BaseModel):
+    """Graded attempt in a batch response"""
+    index: int  # position in the submitted batch
+    id: str
+    score: int
+    points_earned: int
+    total_points: int
+    time_taken: Optional[int] = None
+    passed: bool
+    submitted_at: datetime
+    correct: List[bool]  # per question, in quiz order
+
+
+class QuizAttemptError(BaseModel):
+    """Rejected attempt in a batch response"""
+    index: int
+    detail: str
+
+
+class QuizBatchGradeResponse(BaseModel):
+    """Batch grading response model"""
+    quiz: QuizResponse
+    questions_with_answers: List[QuestionWithAnswer]
+    graded: int
+    failed: int
+    results: List[QuizAttemptGrade]
+    errors: List[QuizAttemptError]
+
+
 class DailyQuizResponse(BaseModel):
     """Daily quiz response model"""
     date: datetime
     quiz: Optional[QuizWithQuestions] = None
     has_attempted: bool = False
     result: Optional[QuizResultResponse] = None
+
+
+class LeaderboardEntry(BaseModel):
+    """Leaderboard entry model"""
+    rank: int
+    user_id: str
+    name: Optional[str] = None
+    score: int
+    time_taken: Optional[int] = None
+    submitted_at: datetime
+
+
+class LeaderboardResponse(BaseModel):
+    """Top of a quiz leaderboard for one day"""
+    quiz_id: str
+    date: datetime
+    participants: int
+    entries: List[LeaderboardEntry]
+
+
+class LeaderboardStanding(BaseModel):
+    """Caller's standing on a quiz leaderboard, with the entries around them"""
+    quiz_id: str
+    date: datetime
+    participants: int
+    rank: Optional[int] = None  # None if the caller has no result that day
+    percentile: Optional[float] = None  # share of participants ranked at or below the caller
+    entries: List[LeaderboardEntry]
@@ -2,7 +2,7 @@
 User model for the Comrade backend
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
 from pydantic import BaseModel, EmailStr, Field
 
@@ -35,7 +35,8 @@ class UserStats(BaseModel):
     best_streak: int = 0
     quizzes_taken: int = 0
     minutes_practiced: int = 0
-    weekly_streak: List[bool] = Field(default_factory=lambda: [False] * 7)
+    weekly_streak: List[bool] = Field(default_factory=lambda: [False] * 7)  # last seven local days, oldest first
+    last_active_date: Optional[date] = None  # local day of the latest quiz or read
 
 
 class User(UserBase):
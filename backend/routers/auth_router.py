@@ -2,23 +2,26 @@
 Authentication router for the Comrade backend
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 
+from config import settings
 from models.user import (
-    User, UserCreate, UserLogin, UserResponse, Token,
+    User, UserCreate, UserLogin, UserResponse, UserStats, Token,
     PasswordReset, PasswordResetConfirm, PhoneVerification
 )
+from services.clock import today
+from services.ids import new_id
+from services.repository import repository
+from services.user_stats import UserStatsEngine
 
 router = APIRouter()
 security = HTTPBearer()
 
-# Mock user database - replace with real database
-mock_users_db = {}
-mock_tokens_db = {}
+user_stats = UserStatsEngine(settings.user_stats_cache_size)
 
 
 class AuthService:
@@ -35,33 +38,33 @@ class AuthService:
         return f"hashed_{plain_password}" == hashed_password
     
     @staticmethod
-    def create_access_token(user_id: str) -> str:
+    async def create_access_token(user_id: str) -> str:
         """Create JWT token - replace with real JWT"""
         token = f"token_{user_id}_{datetime.now().timestamp()}"
-        mock_tokens_db[token] = {
+        await repository.save_token(token, {
             "user_id": user_id,
             "expires_at": datetime.now() + timedelta(hours=24)
-        }
+        })
         return token
     
     @staticmethod
-    def verify_token(token: str) -> Optional[str]:
+    async def verify_token(token: str) -> Optional[str]:
         """Verify JWT token - replace with real JWT verification"""
-        token_data = mock_tokens_db.get(token)
+        token_data = await repository.get_token(token)
         if not token_data:
             return None
         
         if datetime.now() > token_data["expires_at"]:
-            del mock_tokens_db[token]
+            await repository.delete_token(token)
             return None
         
         return token_data["user_id"]
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserResponse:
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserResponse:
     """Get current authenticated user"""
     token = credentials.credentials
-    user_id = AuthService.verify_token(token)
+    user_id = await AuthService.verify_token(token)
     
     if not user_id:
         raise HTTPException(
@@ -70,29 +73,48 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = mock_users_db.get(user_id)
+    user = await repository.get_user(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
     
-    return UserResponse(**user)
+    return user_response(user)
+
+
+def user_response(user: dict) -> UserResponse:
+    """UserResponse with stats brought up to the current local day"""
+    stats = user_stats.stats(user["id"], UserStats(**user["stats"]), today())
+    return UserResponse(**{**user, "stats": stats})
+
+
+def record_quiz_activity(user_id: str, day: date, seconds: Optional[int]) -> None:
+    """Update a user's stats for a submitted quiz and queue them for writing"""
+    stats = user_stats.record_quiz(user_id, day, seconds)
+    if stats is not None:
+        repository.queue_user_stats(user_id, stats.model_dump())
+
+
+def record_reading_activity(user_id: str, news_id: str, minutes: int) -> None:
+    """Update a user's stats for an article read and queue them for writing"""
+    stats = user_stats.record_reading(user_id, today(), news_id, minutes)
+    if stats is not None:
+        repository.queue_user_stats(user_id, stats.model_dump())
 
 
 @router.post("/register", response_model=Token)
 async def register(user_data: UserCreate):
     """Register a new user"""
     # Check if user already exists
-    for user in mock_users_db.values():
-        if user.get("email") == user_data.email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
+    if user_data.email and await repository.find_user(email=user_data.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
     # Create new user
-    user_id = f"user_{len(mock_users_db) + 1}"
+    user_id = new_id("user")
     new_user = {
         "id": user_id,
         "name": user_data.name,
@@ -113,13 +135,12 @@ async def register(user_data: UserCreate):
         "last_login_at": None
     }
     
-    mock_users_db[user_id] = new_user
-    
     # Create access token
-    access_token = AuthService.create_access_token(user_id)
+    access_token = await AuthService.create_access_token(user_id)
     
     # Update last login
     new_user["last_login_at"] = datetime.now()
+    await repository.save_user(new_user)
     
     return Token(
         access_token=access_token,
@@ -133,15 +154,7 @@ async def register(user_data: UserCreate):
 async def login(user_data: UserLogin):
     """Login user"""
     # Find user by email or phone
-    user = None
-    user_id = None
-    
-    for uid, u in mock_users_db.items():
-        if (user_data.email and u.get("email") == user_data.email) or \
-           (user_data.phone_number and u.get("phone_number") == user_data.phone_number):
-            user = u
-            user_id = uid
-            break
+    user = await repository.find_user(email=user_data.email, phone_number=user_data.phone_number)
     
     if not user:
         raise HTTPException(
@@ -157,16 +170,17 @@ async def login(user_data: UserLogin):
         )
     
     # Create access token
-    access_token = AuthService.create_access_token(user_id)
+    access_token = await AuthService.create_access_token(user["id"])
     
     # Update last login
     user["last_login_at"] = datetime.now()
+    await repository.save_user(user)
     
     return Token(
         access_token=access_token,
         token_type="bearer",
         expires_in=86400,  # 24 hours
-        user=UserResponse(**user)
+        user=user_response(user)
     )
 
 
@@ -180,6 +194,7 @@ async def logout(current_user: UserResponse = Depends(get_current_user)):
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: UserResponse = Depends(get_current_user)):
     """Get current user information"""
+    # Stats were re-anchored to today by get_current_user; no result history is read
     return current_user
 
 
@@ -187,11 +202,7 @@ async def get_current_user_info(current_user: UserResponse = Depends(get_current
 async def forgot_password(data: PasswordReset):
     """Send password reset email"""
     # Find user by email
-    user = None
-    for u in mock_users_db.values():
-        if u.get("email") == data.email:
-            user = u
-            break
+    user = await repository.find_user(email=data.email)
     
     if not user:
         # Don't reveal if email exists or not
@@ -228,7 +239,7 @@ async def resend_otp(phone_number: str):
 async def refresh_token(current_user: UserResponse = Depends(get_current_user)):
     """Refresh access token"""
     # Create new access token
-    access_token = AuthService.create_access_token(current_user.id)
+    access_token = await AuthService.create_access_token(current_user.id)
     
     return Token(
         access_token=access_token,
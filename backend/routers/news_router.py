@@ -2,27 +2,108 @@
 News router for the Comrade backend
 """
 
-from datetime import datetime, timedelta
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, Query, status
+import asyncio
+import hashlib
+import json
+import secrets
+import time
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 
 from models.news import (
     News, NewsCreate, NewsUpdate, NewsResponse, NewsListResponse,
-    NewsFilter, DailyNewsResponse, NewsCategory, NewsSource
+    NewsFilter, DailyNewsResponse, NewsCategory, NewsSource, NewsView,
+    NewsCardResponse, NewsCardListResponse, DailyNewsCardResponse,
+    NewsBulkItemError, NewsBulkTimings, NewsBulkResponse
 )
+from config import settings
 from models.user import UserResponse
-from routers.auth_router import get_current_user
+from routers.auth_router import get_current_user, record_reading_activity
+from services.bookmarks import BookmarkStore
+from services.clock import local_date, start_of_day, today
+from services.daily_buckets import DailyBuckets
+from services.dedup import DuplicateIndex, canonicalize_url, simhash
+from services.news_archive import ArchivedNews, NewsArchive
+from services.news_store import NewsStore, decode_cursor, encode_cursor, timeline_key
+from services.news_stream import NewsStreamHub
+from services.rss_ingestion import IngestedItem
+from services.related import RelatedArticles
+from services.repository import repository
+from services.response_cache import NewsResponseCache, json_array, json_object, json_response
+from services.search_index import SearchIndex
+from services.trending import TrendingEngine
+from services.versioning import etag_matches, make_etag, not_modified
+from services.view_counter import ViewCounterBuffer
 
 router = APIRouter()
 
-# Mock news database - replace with real database
-mock_news_db = {}
-mock_bookmarks_db = {}  # user_id -> set of news_ids
+# In-process read model of the news table, loaded from the repository at startup
+news_store = NewsStore()
+repository.attach_news_store(news_store)
+search_index = SearchIndex()
+news_store.add_listener(search_index.index_news)
+news_store.add_removal_listener(search_index.remove_news)
+trending_engine = TrendingEngine(
+    half_life_hours=settings.trending_half_life_hours,
+    window_hours=settings.trending_window_hours,
+    capacity=settings.trending_board_size
+)
+news_store.add_listener(trending_engine.track)
+news_store.add_removal_listener(trending_engine.untrack)
+daily_buckets = DailyBuckets()
+news_store.add_listener(daily_buckets.track)
+news_store.add_removal_listener(daily_buckets.untrack)
+
+
+def persist_view_counts(deltas: Dict[str, int]) -> None:
+    """Apply flushed view increments to the store and queue the touched rows for writing"""
+    news_store.apply_view_counts(deltas)
+    for news_id in deltas:
+        news_data = news_store.get(news_id)
+        if news_data is not None:
+            repository.queue_news(news_data)
+
+
+view_counter = ViewCounterBuffer(
+    persist_view_counts,
+    shards=settings.view_counter_shards,
+    flush_interval=settings.view_flush_interval_seconds,
+    max_pending=settings.view_flush_max_pending
+)
+duplicate_index = DuplicateIndex(settings.dedup_max_distance)
+news_store.add_removal_listener(duplicate_index.discard)
+response_cache = NewsResponseCache(settings.news_response_cache_size)
+news_store.add_listener(response_cache.invalidate)
+news_store.add_removal_listener(response_cache.invalidate)
+related_articles = RelatedArticles(settings.related_neighbours)
+news_store.add_listener(related_articles.track)
+news_store.add_removal_listener(related_articles.discard)
+bookmark_store = BookmarkStore()
+# Cold tier: whole days older than the hot window, read from memory-mapped segments
+news_archive = NewsArchive(settings.news_archive_dir, settings.news_archive_open_segments)
+archive_lock = asyncio.Lock()  # one seal at a time: the periodic job and shutdown may overlap
+
+
+def render_stream_card(news_data: dict) -> bytes:
+    """Card payload pushed to stream subscribers (no per-user bookmark flag)"""
+    return response_cache.render(news_data, view_counter.view_count(news_data), False, NewsView.CARD)
+
+
+news_stream = NewsStreamHub(
+    render_stream_card,
+    queue_size=settings.news_stream_queue_size,
+    buffer_size=settings.news_stream_buffer_size,
+    heartbeat_interval=settings.news_stream_heartbeat_seconds
+)
 
 # Initialize with some mock news data
-def initialize_mock_news():
-    """Initialize mock news data"""
-    mock_news = [
+def mock_news_items() -> List[dict]:
+    """Mock news data seeded into an empty repository"""
+    return [
         {
             "id": "news_1",
             "title": "Indian Army Conducts Major Exercise Along LAC",
@@ -96,34 +177,239 @@ def initialize_mock_news():
             "view_count": 1560
         }
     ]
+
+
+async def load_news() -> None:
+    """Load hot news and bookmarks into the in-process indexes (seeds mock news on first start)"""
+    news_archive.open()
+    # Days before the archive watermark are served from sealed segments
+    since = start_of_day(news_archive.sealed_before) if news_archive.sealed_before else None
+    stored_news = await repository.load_news(since)
+    if since is not None:
+        # Late arrivals for sealed days stay in the repository only until the next archive run seals them
+        late_ids = [
+            news_id for news_id in await repository.list_news_ids(since) if not news_archive.indexes(news_id)
+        ]
+        stored_news += await repository.get_news(late_ids)
+    seeded = not stored_news and not len(news_archive)
+    news_store.add_many(mock_news_items() if seeded else stored_news)
+    for news_data in news_store:
+        duplicate_index.register(
+            news_data["id"],
+            canonicalize_url(news_data["source_url"]),
+            simhash(f"{news_data['title']} {news_data['content']}")
+        )
+        for report in news_data.get("also_reported_by", []):
+            duplicate_index.register(news_data["id"], canonicalize_url(report["source_url"]))
+    
+    # Every later insert, update and view count flush is written through
+    news_store.add_listener(repository.queue_news, replay=seeded)
+    # Only news arriving after startup is announced to stream subscribers
+    news_stream.prime(news_store)
+    news_store.add_listener(news_stream.track, replay=False)
+    news_store.add_removal_listener(news_stream.forget)
+    bookmark_store.load(await repository.load_bookmarks())
+    related_articles.refresh()
+    await archive_old_news()
+
+
+async def archive_old_news() -> int:
+    """Seal whole days older than the hot window into the archive and drop them from the store
+    
+    Runs on every archive interval, so late arrivals for already sealed days
+    are sealed too. Segment files are written in a worker thread.
+    """
+    if not news_archive.enabled:
+        return 0
+    async with archive_lock:
+        cutoff = today() - timedelta(days=settings.news_archive_after_days)
+        # Sealed copies should carry every view counted so far
+        view_counter.flush()
+        news_by_day: Dict[date, List[dict]] = {}
+        for news_data in news_store.iter_published_between(None, start_of_day(cutoff)):
+            # Copied: store rows must not be read from the worker thread
+            news_by_day.setdefault(local_date(news_data["published_at"]), []).append(dict(news_data))
+        if not news_by_day:
+            return 0
+        
+        sealed_days = await asyncio.to_thread(news_archive.write_days, news_by_day, cutoff)
+        sealed = news_archive.apply(sealed_days)
+        news_store.remove_many([news_data["id"] for news_items in news_by_day.values() for news_data in news_items])
+        return sealed
+
+
+def news_id_for(canonical_url: str) -> str:
+    """Stable news ID derived from the canonical article URL, so re-ingestion upserts"""
+    return "news_" + hashlib.sha1(canonical_url.encode()).hexdigest()[:16]
+
+
+def upsert_news_batch(items: List[Tuple[NewsCreate, Optional[datetime]]]) -> List[Tuple[str, str]]:
+    """Upsert news items, applying all inserts to the store and its indexes in one batch
+    
+    Each item is inserted, folded into a near-duplicate cluster ("merged"),
+    used to update the stored copy, or found "unchanged". Returns a
+    (status, news_id) pair per item.
+    """
+    pending: Dict[str, dict] = {}  # news_id -> new news data, committed at the end
+    results = []
+    now = datetime.now(timezone.utc)
+    
+    for news, published_at in items:
+        fields = news.model_dump()
+        fields["source_url"] = str(news.source_url)
+        fields["image_url"] = str(news.image_url) if news.image_url else None
+        canonical_url = canonicalize_url(fields["source_url"])
+        news_id = news_id_for(canonical_url)
+        
+        cluster_id = duplicate_index.lookup_url(canonical_url)
+        if cluster_id is not None and cluster_id != news_id:
+            # Already folded into another article's cluster earlier
+            results.append(("unchanged", cluster_id))
+            continue
+        
+        existing = pending.get(news_id) or news_store.get(news_id)
+        if existing is None and news_id in news_archive:
+            # Sealed articles are immutable; feeds rarely carry them again
+            results.append(("unchanged", news_id))
+            continue
+        if existing is None:
+            signature = simhash(f"{fields['title']} {fields['content']}")
+            canonical_id = duplicate_index.find_similar(signature)
+            if canonical_id is not None:
+                duplicate_index.register(canonical_id, canonical_url)
+                merged = add_duplicate_report(canonical_id, fields["source"], fields["source_url"], pending)
+                results.append(("merged" if merged else "unchanged", canonical_id))
+                continue
+            
+            duplicate_index.register(news_id, canonical_url, signature)
+            pending[news_id] = {
+                "id": news_id,
+                **fields,
+                "published_at": published_at or now,
+                "created_at": now,
+                "updated_at": None,
+                "also_reported_by": [],
+                "is_featured": False,
+                "view_count": 0
+            }
+            results.append(("inserted", news_id))
+            continue
+        
+        # source_url only differs by tracking noise here, so keep the first one seen
+        changes = {
+            key: value for key, value in fields.items()
+            if key != "source_url" and existing.get(key) != value
+        }
+        if not changes:
+            results.append(("unchanged", news_id))
+        elif news_id in pending:
+            pending[news_id].update(changes)
+            results.append(("inserted", news_id))
+        else:
+            news_store.update(news_id, changes)
+            results.append(("updated", news_id))
     
-    for news in mock_news:
-        mock_news_db[news["id"]] = news
+    if pending:
+        news_store.add_many(list(pending.values()))
+    # Score new and re-worded articles against the corpus while ingesting, not on read
+    related_articles.refresh()
+    return results
+
 
-# Initialize mock data
-initialize_mock_news()
+def add_duplicate_report(
+    news_id: str,
+    source: NewsSource,
+    source_url: str,
+    pending: Optional[Dict[str, dict]] = None
+) -> bool:
+    """Record that another outlet reported the same story; returns False if already known"""
+    news_data = (pending or {}).get(news_id) or news_store.get(news_id)
+    if news_data is None or news_data["source_url"] == source_url:
+        return False
+    reports = news_data.get("also_reported_by", [])
+    if any(report["source_url"] == source_url for report in reports):
+        return False
+    
+    reports = reports + [{"source": source, "source_url": source_url}]
+    if pending and news_id in pending:
+        news_data["also_reported_by"] = reports
+    else:
+        news_store.update(news_id, {"also_reported_by": reports})
+    return True
+
+
+def upsert_ingested_news(items: List[IngestedItem]) -> int:
+    """Upsert a batch of feed items; returns how many were inserted or changed"""
+    results = upsert_news_batch([(item.news, item.published_at) for item in items])
+    return sum(status != "unchanged" for status, _ in results)
 
 
 def get_news_response(news_data: dict, user_id: Optional[str] = None) -> NewsResponse:
     """Convert news data to NewsResponse with bookmark status"""
     is_bookmarked = False
     if user_id:
-        user_bookmarks = mock_bookmarks_db.get(user_id, set())
-        is_bookmarked = news_data["id"] in user_bookmarks
+        is_bookmarked = bookmark_store.contains(user_id, news_data["id"])
     
     return NewsResponse(
-        **news_data,
+        **{**news_data, "view_count": view_counter.view_count(news_data)},
         is_bookmarked=is_bookmarked
     )
 
 
-@router.get("/daily", response_model=DailyNewsResponse)
+def get_news_fragments(
+    news_items: Iterable[dict],
+    user_id: Optional[str] = None,
+    view: NewsView = NewsView.FULL,
+    excerpt: bool = False
+) -> List[bytes]:
+    """Serialized news payloads from the response cache, with bookmark status"""
+    user_bookmarks = bookmark_store.get(user_id) if user_id else frozenset()
+    excerpt_chars = settings.news_card_excerpt_chars if excerpt else None
+    return [
+        response_cache.render(
+            news_data,
+            view_counter.view_count(news_data),
+            news_data["id"] in user_bookmarks,
+            view,
+            excerpt_chars,
+            # Archived articles are rendered on demand so the cache stays bounded by the hot store
+            cache=not isinstance(news_data, ArchivedNews)
+        )
+        for news_data in news_items
+    ]
+
+
+def news_of_day(day: date) -> List[dict]:
+    """News published on a local day, newest first, from the hot store and the archive"""
+    bucket = daily_buckets.get(day)
+    segment = news_archive.day(day)
+    news_items = [news_store.get(news_id) for news_id in bucket.newest_first()] if bucket else []
+    if segment:
+        # Sealed days are read from the archive; late arrivals stay hot until the next seal
+        news_items = sorted([*news_items, *segment.newest_first()], key=timeline_key, reverse=True)
+    return news_items
+
+
+def merge_category_counts(*counts: Dict[str, int]) -> Dict[str, int]:
+    """Sum per-category counts keyed by NewsCategory members or their values"""
+    merged: Dict[str, int] = {}
+    for category_counts in counts:
+        for category, count in category_counts.items():
+            key = NewsCategory(category).value
+            merged[key] = merged.get(key, 0) + count
+    return merged
+
+
+@router.get("/daily", response_model=Union[DailyNewsResponse, DailyNewsCardResponse])
 async def get_daily_news(
+    request: Request,
     date: Optional[str] = Query(None, description="Date in YYYY-MM-DD format"),
+    view: NewsView = Query(NewsView.FULL, description="card omits full content"),
+    excerpt: bool = Query(False, description="Include a truncated content excerpt in card view"),
     current_user: Optional[UserResponse] = Depends(get_current_user)
 ):
     """Get daily news for a specific date"""
-    target_date = datetime.now().date()
+    target_date = today()
     if date:
         try:
             target_date = datetime.strptime(date, "%Y-%m-%d").date()
@@ -133,86 +419,142 @@ async def get_daily_news(
                 detail="Invalid date format. Use YYYY-MM-DD"
             )
     
-    # Filter news for the target date
-    daily_news = []
-    categories_count = {}
-    
-    for news_data in mock_news_db.values():
-        news_date = news_data["published_at"].date()
-        if news_date == target_date:
-            news_response = get_news_response(
-                news_data, 
-                current_user.id if current_user else None
-            )
-            daily_news.append(news_response)
-            
-            # Count categories
-            category = news_data["category"]
-            categories_count[category] = categories_count.get(category, 0) + 1
+    # Read the prebuilt bucket for the date (already newest first, counts materialized)
+    bucket = daily_buckets.get(target_date)
+    segment = news_archive.day(target_date)
+    user_id = current_user.id if current_user else None
+    etag = make_etag(
+        "daily", target_date, bucket.version if bucket else 0, segment.version if segment else 0,
+        view_counter.version, view, excerpt, user_id, bookmark_store.versions.get(user_id)
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    # Sort by published time (newest first)
-    daily_news.sort(key=lambda x: x.published_at, reverse=True)
+    daily_items = news_of_day(target_date)
+    categories_count = bucket.categories_count if bucket else {}
+    if segment:
+        categories_count = merge_category_counts(segment.categories_count, categories_count)
+    daily_news = get_news_fragments(daily_items, user_id, view, excerpt)
     
-    return DailyNewsResponse(
-        date=datetime.combine(target_date, datetime.min.time()),
-        news=daily_news,
-        total_count=len(daily_news),
-        categories_count=categories_count
-    )
+    # Assemble the DailyNewsResponse payload from cached fragments
+    return json_response(json_object("news", daily_news, {
+        "date": datetime.combine(target_date, datetime.min.time()),
+        "total_count": len(daily_news),
+        "categories_count": categories_count,
+    }), etag)
 
 
-@router.get("/", response_model=NewsListResponse)
+@router.get("/", response_model=Union[NewsListResponse, NewsCardListResponse])
 async def get_news(
+    request: Request,
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor; overrides page"),
     category: Optional[NewsCategory] = None,
     source: Optional[NewsSource] = None,
-    search: Optional[str] = None,
+    search: Optional[str] = Query(None, description='Terms, "quoted phrases" and prefix* queries'),
     featured_only: bool = False,
+    view: NewsView = Query(NewsView.FULL, description="card omits full content"),
+    excerpt: bool = Query(False, description="Include a truncated content excerpt in card view"),
     current_user: Optional[UserResponse] = Depends(get_current_user)
 ):
     """Get news with pagination and filters"""
-    # Filter news
-    filtered_news = []
-    
-    for news_data in mock_news_db.values():
-        # Apply filters
-        if category and news_data["category"] != category:
-            continue
-        if source and news_data["source"] != source:
-            continue
-        if featured_only and not news_data["is_featured"]:
-            continue
-        if search:
-            search_lower = search.lower()
-            if (search_lower not in news_data["title"].lower() and 
-                search_lower not in news_data["description"].lower()):
-                continue
-        
-        filtered_news.append(news_data)
+    user_id = current_user.id if current_user else None
+    etag = make_etag(
+        "news", request.url.path, sorted(request.query_params.multi_items()),
+        news_store.version, view_counter.version, user_id, bookmark_store.versions.get(user_id)
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    # Sort by published time (newest first)
-    filtered_news.sort(key=lambda x: x["published_at"], reverse=True)
+    next_cursor = None
     
-    # Pagination
-    total = len(filtered_news)
-    start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-    paginated_news = filtered_news[start_idx:end_idx]
+    if search:
+        if cursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination is not supported for search results"
+            )
+        
+        # Search results are ranked by relevance instead of recency
+        filtered_news = []
+        for news_id, _ in search_index.search(search):
+            news_data = news_store.get(news_id)
+            if news_store.matches(news_data, category, source, featured_only):
+                filtered_news.append(news_data)
+        total = len(filtered_news)
+        start_idx = (page - 1) * per_page
+        paginated_news = filtered_news[start_idx:start_idx + per_page]
+        has_next = start_idx + per_page < total
+        has_prev = page > 1
+    else:
+        before = None
+        start_idx = (page - 1) * per_page
+        if cursor:
+            try:
+                before = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            start_idx = 0
+        
+        # Walk the pre-ordered index and stop once the page (plus one lookahead) is full
+        total = news_store.count(category, source, featured_only)
+        paginated_news = list(islice(
+            news_store.iter_newest(category, source, featured_only, before=before),
+            start_idx,
+            start_idx + per_page + 1
+        ))
+        has_next = len(paginated_news) > per_page
+        has_prev = before is not None or page > 1
+        paginated_news = paginated_news[:per_page]
+        if has_next:
+            next_cursor = encode_cursor(news_store.key_of(paginated_news[-1]["id"]))
     
-    # Convert to response format
-    news_responses = [
-        get_news_response(news_data, current_user.id if current_user else None)
-        for news_data in paginated_news
-    ]
+    # Assemble the NewsListResponse payload from cached fragments
+    news_fragments = get_news_fragments(paginated_news, user_id, view, excerpt)
     
-    return NewsListResponse(
-        news=news_responses,
-        total=total,
-        page=page,
-        per_page=per_page,
-        has_next=end_idx < total,
-        has_prev=page > 1
+    return json_response(json_object("news", news_fragments, {
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "has_next": has_next,
+        "has_prev": has_prev,
+        "next_cursor": next_cursor,
+    }), etag)
+
+
+@router.get("/trending", response_model=Union[List[NewsResponse], List[NewsCardResponse]])
+async def get_trending_news(
+    limit: int = Query(10, ge=1, le=20),
+    category: Optional[NewsCategory] = None,
+    view: NewsView = Query(NewsView.FULL, description="card omits full content"),
+    excerpt: bool = Query(False, description="Include a truncated content excerpt in card view"),
+    current_user: Optional[UserResponse] = Depends(get_current_user)
+):
+    """Get trending news ranked by time-decayed views"""
+    trending_news = [news_store.get(news_id) for news_id in trending_engine.top(limit, category)]
+    return json_response(json_array(
+        get_news_fragments(trending_news, current_user.id if current_user else None, view, excerpt)
+    ))
+
+
+@router.get("/stream")
+async def stream_news(
+    category: Optional[List[NewsCategory]] = Query(None, description="Only push news in these categories"),
+    last_event_id: Optional[str] = Header(None, description="Resume after this event ID"),
+):
+    """Server-Sent Events stream of newly ingested and newly featured news cards"""
+    subscriber = news_stream.subscribe(
+        {item.value for item in category} if category else None,
+        last_event_id
+    )
+    return StreamingResponse(
+        news_stream.frames(subscriber, settings.news_stream_retry_ms),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
@@ -222,49 +564,204 @@ async def get_news_by_id(
     current_user: Optional[UserResponse] = Depends(get_current_user)
 ):
     """Get news by ID"""
-    news_data = mock_news_db.get(news_id)
-    if not news_data:
+    news_data = news_store.get(news_id)
+    if news_data is None:
+        # Archived articles are read-only; their view counts froze when they were sealed
+        archived = news_archive.get(news_id)
+        if archived is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="News not found"
+            )
+        if current_user:
+            record_reading_activity(current_user.id, news_id, archived["read_time"])
+        return get_news_response(archived, current_user.id if current_user else None)
+    
+    # Buffer the view; the store is updated in batches by the view counter
+    view_counter.increment(news_id)
+    trending_engine.record_view(news_id)
+    if current_user:
+        record_reading_activity(current_user.id, news_id, news_data["read_time"])
+    
+    return get_news_response(news_data, current_user.id if current_user else None)
+
+
+@router.get("/{news_id}/related", response_model=Union[List[NewsResponse], List[NewsCardResponse]])
+async def get_related_news(
+    news_id: str,
+    limit: int = Query(6, ge=1, le=settings.related_neighbours),
+    view: NewsView = Query(NewsView.CARD, description="card omits full content"),
+    excerpt: bool = Query(False, description="Include a truncated content excerpt in card view"),
+    current_user: Optional[UserResponse] = Depends(get_current_user)
+):
+    """Get articles similar to a news item for the Keep Reading carousel"""
+    if news_id not in news_store and news_id not in news_archive:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="News not found"
         )
     
-    # Increment view count
-    news_data["view_count"] += 1
-    
-    return get_news_response(news_data, current_user.id if current_user else None)
+    related_news = [news_store.get(related_id) for related_id in related_articles.related(news_id, limit)]
+    return json_response(json_array(
+        get_news_fragments(related_news, current_user.id if current_user else None, view, excerpt)
+    ))
 
 
-@router.get("/category/{category}", response_model=NewsListResponse)
+@router.get("/category/{category}", response_model=Union[NewsListResponse, NewsCardListResponse])
 async def get_news_by_category(
+    request: Request,
     category: NewsCategory,
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from next_cursor; overrides page"),
+    view: NewsView = Query(NewsView.FULL, description="card omits full content"),
+    excerpt: bool = Query(False, description="Include a truncated content excerpt in card view"),
     current_user: Optional[UserResponse] = Depends(get_current_user)
 ):
     """Get news by category"""
     return await get_news(
+        request=request,
         page=page,
         per_page=per_page,
+        cursor=cursor,
         category=category,
+        source=None,
+        search=None,
+        featured_only=False,
+        view=view,
+        excerpt=excerpt,
         current_user=current_user
     )
 
 
-@router.get("/trending", response_model=List[NewsResponse])
-async def get_trending_news(
-    limit: int = Query(10, ge=1, le=20),
-    current_user: Optional[UserResponse] = Depends(get_current_user)
-):
-    """Get trending news based on view count"""
-    # Sort by view count (highest first)
-    trending_news = sorted(
-        mock_news_db.values(),
-        key=lambda x: x["view_count"],
-        reverse=True
-    )[:limit]
+_bulk_adapter = TypeAdapter(List[NewsCreate])
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-lines")
+
+
+def parse_bulk_body(body: bytes, content_type: str) -> Tuple[List[Any], Dict[int, List[dict]]]:
+    """Decode a JSON array or NDJSON body; returns raw items and per-line parse errors"""
+    if content_type.split(";")[0].strip().lower() in NDJSON_MEDIA_TYPES:
+        raw_items: List[Any] = []
+        errors: Dict[int, List[dict]] = {}
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                raw_items.append(json.loads(line))
+            except ValueError as exc:
+                errors[len(raw_items)] = [{"type": "json_invalid", "loc": [], "msg": str(exc)}]
+                raw_items.append(None)
+        return raw_items, errors
     
-    return [
-        get_news_response(news_data, current_user.id if current_user else None)
-        for news_data in trending_news
-    ]
+    try:
+        raw_items = json.loads(body)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid JSON body: {exc}"
+        )
+    if not isinstance(raw_items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a JSON array of news items or an NDJSON body"
+        )
+    return raw_items, {}
+
+
+def validate_bulk_items(raw_items: List[Any], errors: Dict[int, List[dict]]) -> Dict[int, NewsCreate]:
+    """Validate all items in one adapter call, collecting per-item errors by position"""
+    positions = [index for index in range(len(raw_items)) if index not in errors]
+    while positions:
+        try:
+            validated = _bulk_adapter.validate_python([raw_items[index] for index in positions])
+            return dict(zip(positions, validated))
+        except ValidationError as exc:
+            failed: Dict[int, List[dict]] = {}
+            for error in exc.errors(include_url=False, include_context=False, include_input=False):
+                position = positions[error["loc"][0]]
+                error["loc"] = list(error["loc"][1:])
+                failed.setdefault(position, []).append(error)
+            errors.update(failed)
+            # Revalidate only the items that passed; their results were discarded
+            positions = [index for index in positions if index not in failed]
+    return {}
+
+
+def require_importer(x_importer_token: Optional[str] = Header(None)) -> None:
+    """Allow only editorial and importer clients holding the configured service token"""
+    expected = settings.news_importer_token
+    if not expected or not x_importer_token or \
+       not secrets.compare_digest(x_importer_token.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="A valid X-Importer-Token is required"
+        )
+
+
+async def read_bounded_body(request: Request, max_bytes: int) -> bytes:
+    """Read a request body, refusing it by Content-Length or streamed size before it is parsed"""
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Request body exceeds {max_bytes} bytes"
+    )
+    content_length = request.headers.get("content-length")
+    if content_length is not None:
+        try:
+            declared = int(content_length)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid Content-Length header"
+            )
+        if declared > max_bytes:
+            raise too_large
+    
+    # Chunked bodies carry no length, so count bytes as they arrive
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    return bytes(body)
+
+
+@router.post("/bulk", response_model=NewsBulkResponse, dependencies=[Depends(require_importer)])
+async def bulk_ingest_news(request: Request):
+    """Ingest many news items from a JSON array or NDJSON body in one batch (importer token required)"""
+    started = time.perf_counter()
+    body = await read_bounded_body(request, settings.news_bulk_max_bytes)
+    raw_items, errors = parse_bulk_body(body, request.headers.get("content-type", ""))
+    if len(raw_items) > settings.news_bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.news_bulk_max_items} items per request"
+        )
+    parsed = time.perf_counter()
+    
+    valid = validate_bulk_items(raw_items, errors)
+    validated = time.perf_counter()
+    
+    positions = sorted(valid)
+    results = upsert_news_batch([(valid[index], None) for index in positions])
+    committed = time.perf_counter()
+    
+    news_ids: List[Optional[str]] = [None] * len(raw_items)
+    counts = {"inserted": 0, "updated": 0, "merged": 0, "unchanged": 0}
+    for index, (outcome, news_id) in zip(positions, results):
+        news_ids[index] = news_id
+        counts[outcome] += 1
+    
+    return NewsBulkResponse(
+        received=len(raw_items),
+        **counts,
+        failed=len(errors),
+        news_ids=news_ids,
+        errors=[NewsBulkItemError(index=index, errors=errors[index]) for index in sorted(errors)],
+        timings=NewsBulkTimings(
+            parse_ms=(parsed - started) * 1000,
+            validate_ms=(validated - parsed) * 1000,
+            commit_ms=(committed - validated) * 1000,
+            total_ms=(committed - started) * 1000
+        )
+    )
@@ -2,29 +2,56 @@
 Quiz router for the Comrade backend
 """
 
-from datetime import datetime, timedelta
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, Query, status
+import logging
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable, List, Optional, TypeVar, Union
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response, status
 
 from models.quiz import (
     Quiz, QuizCreate, QuizUpdate, QuizResponse, QuizWithQuestions,
     Question, QuestionCreate, QuestionResponse, QuestionWithAnswer,
-    QuizSubmission, QuizResult, QuizResultResponse, DailyQuizResponse,
+    QuizSubmission, QuizResult, QuizResultResponse, QuizResultSummary, DailyQuizResponse,
+    QuizBatchSubmission, QuizBatchGradeResponse, QuizAttemptGrade, QuizAttemptError,
+    LeaderboardEntry, LeaderboardResponse, LeaderboardStanding,
     UserAnswer, QuestionType, DifficultyLevel
 )
+from pydantic_core import to_json
+
+from config import settings
 from models.user import UserResponse
-from routers.auth_router import get_current_user
+from routers import news_router
+from routers.auth_router import get_current_user, record_quiz_activity
+from services.clock import local_date, start_of_day, today
+from services.grading import Grade
+from services.idempotency import IdempotencyCache, IdempotencyKeyReused, fingerprint
+from services.ids import new_id
+from services.leaderboard import BoardEntry, LeaderboardStore
+from services.quiz_cache import CachedQuiz, QuizCache
+from services.quiz_generation import QuizGenerator
+from services.repository import repository
+from services.response_cache import json_response
+from services.versioning import VersionMap, etag_matches, make_etag, not_modified
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 router = APIRouter()
 
-# Mock quiz database - replace with real database
-mock_quizzes_db = {}
-mock_questions_db = {}
-mock_quiz_results_db = {}
+quiz_cache = QuizCache(repository)
+user_result_versions = VersionMap()  # user_id -> bumped on every submission
+leaderboards = LeaderboardStore(retention_days=settings.leaderboard_retention_days)
+submission_replays = IdempotencyCache(
+    capacity=settings.idempotency_cache_size,
+    ttl_seconds=settings.idempotency_ttl_seconds
+)
 
 # Initialize with some mock quiz data
-def initialize_mock_quizzes():
-    """Initialize mock quiz and question data"""
+async def initialize_mock_quizzes():
+    """Seed the repository with mock quiz and question data on first start"""
+    if await repository.get_quiz("daily_quiz_1"):
+        return
+    
     # Create mock questions
     questions = [
         {
@@ -87,9 +114,6 @@ def initialize_mock_quizzes():
         }
     ]
     
-    for question in questions:
-        mock_questions_db[question["id"]] = question
-    
     # Create mock quiz
     daily_quiz = {
         "id": "daily_quiz_1",
@@ -107,68 +131,102 @@ def initialize_mock_quizzes():
         "total_points": 8
     }
     
-    mock_quizzes_db[daily_quiz["id"]] = daily_quiz
-    
     # Link questions to quiz
     for question in questions:
         question["quiz_id"] = daily_quiz["id"]
+    
+    await save_quiz(daily_quiz, questions)
 
-# Initialize mock data
-initialize_mock_quizzes()
-
-
-def get_question_response(question_data: dict, include_answers: bool = False) -> QuestionResponse:
-    """Convert question data to response format"""
-    if include_answers:
-        return QuestionWithAnswer(
-            id=question_data["id"],
-            question_text=question_data["question_text"],
-            question_type=question_data["question_type"],
-            difficulty=question_data["difficulty"],
-            tags=question_data["tags"],
-            points=question_data["points"],
-            explanation=question_data.get("explanation"),
-            options=question_data["question_data"].get("options"),
-            correct_answer_index=question_data["question_data"].get("correct_answer_index"),
-            correct_answer=question_data["question_data"].get("correct_answer"),
-            correct_answers=question_data["question_data"].get("correct_answers")
-        )
-    else:
-        return QuestionResponse(
-            id=question_data["id"],
-            question_text=question_data["question_text"],
-            question_type=question_data["question_type"],
-            difficulty=question_data["difficulty"],
-            tags=question_data["tags"],
-            points=question_data["points"],
-            options=question_data["question_data"].get("options")
+
+async def load_leaderboards() -> None:
+    """Rank the results of the retained days after a restart"""
+    first_day = today() - timedelta(days=settings.leaderboard_retention_days - 1)
+    leaderboards.record_many(await repository.load_results(start_of_day(first_day)))
+
+
+async def save_quiz(quiz_data: dict, questions: Optional[List[dict]] = None) -> None:
+    """Persist a quiz (and optionally its questions) and drop its cached payloads"""
+    if questions:
+        await save_questions(questions)
+    await repository.save_quiz(quiz_data)
+    quiz_cache.invalidate(quiz_data["id"])
+
+
+async def save_questions(questions: List[dict]) -> None:
+    """Persist questions and drop the cached payloads of the quizzes they touch"""
+    await repository.save_questions(questions)
+    quiz_cache.invalidate_questions(questions)
+
+
+def parse_date(value: str) -> date:
+    """Parse a YYYY-MM-DD query parameter"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid date format. Use YYYY-MM-DD"
         )
 
 
+def daily_quiz_id(quiz_date: date) -> str:
+    """ID of the generated daily quiz for a date"""
+    return f"daily_quiz_{quiz_date.isoformat()}"
+
+
+async def generate_daily_quiz(generator: QuizGenerator, quiz_date: date) -> Optional[str]:
+    """Build and store a date's daily quiz from the previous day's news
+
+    Daily quizzes are immutable: a date that already has one is left alone,
+    so results and ETags stay valid once the quiz is published.
+    """
+    quiz_id = daily_quiz_id(quiz_date)
+    if await repository.get_quiz(quiz_id):
+        return quiz_id
+    
+    news_items = news_router.news_of_day(quiz_date - timedelta(days=1))
+    built = await generator.generate(quiz_id, quiz_date, news_items, settings.daily_quiz_questions)
+    if built is None or len(built[1]) < settings.daily_quiz_min_questions:
+        logger.info("Not enough news to generate the daily quiz for %s", quiz_date)
+        return None
+    
+    quiz_data, questions = built
+    await save_quiz(quiz_data, questions)
+    logger.info("Generated daily quiz %s with %d questions", quiz_id, len(questions))
+    return quiz_id
+
+
+async def generate_upcoming_quiz(generator: QuizGenerator) -> Optional[str]:
+    """Build tomorrow's daily quiz from today's news (scheduled before local midnight)"""
+    return await generate_daily_quiz(generator, today() + timedelta(days=1))
+
+
 @router.get("/daily", response_model=DailyQuizResponse)
 async def get_daily_quiz(
+    request: Request,
+    response: Response,
     date: Optional[str] = Query(None, description="Date in YYYY-MM-DD format"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """Get daily quiz for a specific date"""
-    target_date = datetime.now().date()
-    if date:
-        try:
-            target_date = datetime.strptime(date, "%Y-%m-%d").date()
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid date format. Use YYYY-MM-DD"
-            )
+    target_date = parse_date(date) if date else today()
+    
+    # Generated quizzes are keyed by date; days without one fall back to the standing daily quiz
+    cached_quiz = await quiz_cache.get(daily_quiz_id(target_date))
+    if cached_quiz is None:
+        daily_quiz_data = await repository.find_daily_quiz()
+        cached_quiz = await quiz_cache.get(daily_quiz_data["id"]) if daily_quiz_data else None
     
-    # Find daily quiz (for simplicity, using the same quiz for all days)
-    daily_quiz_data = None
-    for quiz_data in mock_quizzes_db.values():
-        if quiz_data["is_daily"]:
-            daily_quiz_data = quiz_data
-            break
+    quiz_id = cached_quiz.quiz_data["id"] if cached_quiz else None
+    etag = make_etag(
+        "quiz_daily", target_date, quiz_id, quiz_cache.versions.get(quiz_id),
+        current_user.id, user_result_versions.get(current_user.id)
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     
-    if not daily_quiz_data:
+    if not cached_quiz:
         return DailyQuizResponse(
             date=datetime.combine(target_date, datetime.min.time()),
             quiz=None,
@@ -176,223 +234,333 @@ async def get_daily_quiz(
             result=None
         )
     
-    # Get quiz questions
-    quiz_questions = []
-    for question_data in mock_questions_db.values():
-        if question_data["quiz_id"] == daily_quiz_data["id"]:
-            quiz_questions.append(get_question_response(question_data))
-    
-    quiz_with_questions = QuizWithQuestions(
-        id=daily_quiz_data["id"],
-        title=daily_quiz_data["title"],
-        description=daily_quiz_data["description"],
-        time_limit=daily_quiz_data["time_limit"],
-        passing_score=daily_quiz_data["passing_score"],
-        is_daily=daily_quiz_data["is_daily"],
-        tags=daily_quiz_data["tags"],
-        total_questions=daily_quiz_data["total_questions"],
-        total_points=daily_quiz_data["total_points"],
-        created_at=daily_quiz_data["created_at"],
-        questions=quiz_questions
-    )
-    
     # Check if user has attempted this quiz today
-    user_result_key = f"{current_user.id}_{daily_quiz_data['id']}_{target_date}"
-    has_attempted = user_result_key in mock_quiz_results_db
-    result = None
+    user_result_key = f"{current_user.id}_{quiz_id}_{target_date}"
+    result_data = await repository.get_result(user_result_key)
+    if result_data is None:
+        # Unattempted quizzes are served from the pre-serialized payload
+        return json_response(b'{"date":%s,"quiz":%s,"has_attempted":false,"result":null}' % (
+            to_json(datetime.combine(target_date, datetime.min.time())), cached_quiz.with_questions_json
+        ), etag)
     
-    if has_attempted:
-        result_data = mock_quiz_results_db[user_result_key]
-        # Get questions with answers for result
-        questions_with_answers = []
-        for question_data in mock_questions_db.values():
-            if question_data["quiz_id"] == daily_quiz_data["id"]:
-                questions_with_answers.append(get_question_response(question_data, include_answers=True))
-        
-        result = QuizResultResponse(
+    return DailyQuizResponse(
+        date=datetime.combine(target_date, datetime.min.time()),
+        quiz=None,
+        has_attempted=True,
+        result=QuizResultResponse(
             id=result_data["id"],
-            quiz=QuizResponse(**daily_quiz_data),
+            quiz=cached_quiz.quiz,
             score=result_data["score"],
             points_earned=result_data["points_earned"],
             total_points=result_data["total_points"],
             time_taken=result_data["time_taken"],
             passed=result_data["passed"],
             submitted_at=result_data["submitted_at"],
-            questions_with_answers=questions_with_answers,
+            questions_with_answers=cached_quiz.answer_key,
             user_answers=result_data["answers"]
         )
-    
-    return DailyQuizResponse(
-        date=datetime.combine(target_date, datetime.min.time()),
-        quiz=quiz_with_questions if not has_attempted else None,
-        has_attempted=has_attempted,
-        result=result
     )
 
 
+@router.get("/history", response_model=List[Union[QuizResultResponse, QuizResultSummary]])
+async def get_quiz_history(
+    current_user: UserResponse = Depends(get_current_user),
+    limit: int = Query(10, ge=1, le=50),
+    include_answers: bool = Query(False, description="Include answer keys and the user's answers")
+):
+    """Get user's quiz history"""
+    user_results = []
+    
+    # Results come newest first and already limited from the per-user index
+    for result_data in await repository.list_results(current_user.id, limit):
+        cached_quiz = await quiz_cache.get(result_data["quiz_id"])
+        if not cached_quiz:
+            continue
+        summary = dict(
+            id=result_data["id"],
+            quiz=cached_quiz.quiz,
+            score=result_data["score"],
+            points_earned=result_data["points_earned"],
+            total_points=result_data["total_points"],
+            time_taken=result_data["time_taken"],
+            passed=result_data["passed"],
+            submitted_at=result_data["submitted_at"]
+        )
+        if include_answers:
+            user_results.append(QuizResultResponse(
+                **summary,
+                questions_with_answers=cached_quiz.answer_key,
+                user_answers=result_data["answers"]
+            ))
+        else:
+            user_results.append(QuizResultSummary(**summary))
+    
+    return user_results
+
+
 @router.get("/{quiz_id}", response_model=QuizWithQuestions)
 async def get_quiz(
     quiz_id: str,
     current_user: UserResponse = Depends(get_current_user)
 ):
     """Get quiz by ID with questions"""
-    quiz_data = mock_quizzes_db.get(quiz_id)
-    if not quiz_data:
+    cached_quiz = await quiz_cache.get(quiz_id)
+    if not cached_quiz:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Quiz not found"
         )
     
-    if not quiz_data["is_active"]:
+    if not cached_quiz.quiz_data["is_active"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Quiz is not active"
         )
     
-    # Get quiz questions
-    quiz_questions = []
-    for question_data in mock_questions_db.values():
-        if question_data["quiz_id"] == quiz_id:
-            quiz_questions.append(get_question_response(question_data))
-    
-    return QuizWithQuestions(
-        id=quiz_data["id"],
-        title=quiz_data["title"],
-        description=quiz_data["description"],
-        time_limit=quiz_data["time_limit"],
-        passing_score=quiz_data["passing_score"],
-        is_daily=quiz_data["is_daily"],
-        tags=quiz_data["tags"],
-        total_questions=quiz_data["total_questions"],
-        total_points=quiz_data["total_points"],
-        created_at=quiz_data["created_at"],
-        questions=quiz_questions
-    )
+    return cached_quiz.with_questions
 
 
 @router.post("/{quiz_id}/submit", response_model=QuizResultResponse)
 async def submit_quiz(
     quiz_id: str,
     submission: QuizSubmission,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """Submit quiz answers and get results"""
-    quiz_data = mock_quizzes_db.get(quiz_id)
-    if not quiz_data:
+    return await run_idempotent(
+        response, idempotency_key, f"submit:{current_user.id}:{quiz_id}", submission.model_dump_json(),
+        lambda: grade_submission(quiz_id, submission, current_user.id)
+    )
+
+
+@router.post("/{quiz_id}/grade-batch", response_model=QuizBatchGradeResponse)
+async def grade_quiz_batch(
+    quiz_id: str,
+    batch: QuizBatchSubmission,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Grade and record many offline attempts of a quiz in one request"""
+    if len(batch.attempts) > settings.quiz_batch_max_attempts:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.quiz_batch_max_attempts} attempts per request"
+        )
+    
+    return await run_idempotent(
+        response, idempotency_key, f"grade-batch:{current_user.id}:{quiz_id}", batch.model_dump_json(),
+        lambda: grade_batch(quiz_id, batch, current_user.id)
+    )
+
+
+async def run_idempotent(
+    response: Response,
+    idempotency_key: Optional[str],
+    scope: str,
+    payload: str,
+    handler: Callable[[], Awaitable[T]]
+) -> T:
+    """Run a submission once per Idempotency-Key, replaying its response on retries"""
+    if not idempotency_key:
+        return await handler()
+    try:
+        result, replayed = await submission_replays.run(scope, idempotency_key, fingerprint(payload), handler)
+    except IdempotencyKeyReused:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different request"
+        )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
+async def grade_submission(quiz_id: str, submission: QuizSubmission, user_id: str) -> QuizResultResponse:
+    """Grade one submission and queue its result for writing"""
+    cached_quiz = await quiz_cache.get(quiz_id)
+    if not cached_quiz:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Quiz not found"
         )
     
-    # Calculate score
-    total_points = 0
-    points_earned = 0
-    detailed_answers = []
-    
-    for answer in submission.answers:
-        question_data = mock_questions_db.get(answer.question_id)
-        if not question_data:
-            continue
-        
-        total_points += question_data["points"]
-        is_correct = False
-        
-        # Check answer based on question type
-        if question_data["question_type"] == QuestionType.MULTIPLE_CHOICE:
-            correct_index = question_data["question_data"]["correct_answer_index"]
-            is_correct = answer.answer == correct_index
-        elif question_data["question_type"] == QuestionType.TRUE_FALSE:
-            correct_answer = question_data["question_data"]["correct_answer"]
-            is_correct = answer.answer == correct_answer
-        elif question_data["question_type"] == QuestionType.FILL_IN_BLANK:
-            correct_answers = question_data["question_data"]["correct_answers"]
-            is_correct = str(answer.answer).lower().strip() in [ans.lower() for ans in correct_answers]
-        
-        if is_correct:
-            points_earned += question_data["points"]
-        
-        detailed_answers.append({
-            "question_id": answer.question_id,
-            "user_answer": answer.answer,
-            "is_correct": is_correct,
-            "points_earned": question_data["points"] if is_correct else 0
-        })
-    
-    # Calculate percentage score
-    score_percentage = int((points_earned / total_points) * 100) if total_points > 0 else 0
-    passed = score_percentage >= quiz_data["passing_score"]
-    
-    # Save result
-    result_id = f"result_{len(mock_quiz_results_db) + 1}"
-    result_key = f"{current_user.id}_{quiz_id}_{datetime.now().date()}"
-    
-    result_data = {
-        "id": result_id,
-        "user_id": current_user.id,
-        "quiz_id": quiz_id,
-        "score": score_percentage,
-        "points_earned": points_earned,
-        "total_points": total_points,
-        "time_taken": submission.time_taken,
-        "passed": passed,
-        "submitted_at": datetime.now(),
-        "answers": submission.answers
-    }
-    
-    mock_quiz_results_db[result_key] = result_data
+    grade = cached_quiz.grading_key.grade(submission.answers)
+    if grade.unknown_question_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=unknown_questions_detail(grade)
+        )
     
-    # Get questions with answers for response
-    questions_with_answers = []
-    for question_data in mock_questions_db.values():
-        if question_data["quiz_id"] == quiz_id:
-            questions_with_answers.append(get_question_response(question_data, include_answers=True))
+    result_data = build_result(new_id("result"), user_id, cached_quiz, grade, submission, datetime.now())
+    record_result(result_data)
+    user_result_versions.bump(user_id)
     
     return QuizResultResponse(
-        id=result_id,
-        quiz=QuizResponse(**quiz_data),
-        score=score_percentage,
-        points_earned=points_earned,
-        total_points=total_points,
+        id=result_data["id"],
+        quiz=cached_quiz.quiz,
+        score=grade.score,
+        points_earned=grade.points_earned,
+        total_points=grade.total_points,
         time_taken=submission.time_taken,
-        passed=passed,
+        passed=result_data["passed"],
         submitted_at=result_data["submitted_at"],
-        questions_with_answers=questions_with_answers,
+        questions_with_answers=cached_quiz.answer_key,
         user_answers=submission.answers
     )
 
 
-@router.get("/history", response_model=List[QuizResultResponse])
-async def get_quiz_history(
-    current_user: UserResponse = Depends(get_current_user),
-    limit: int = Query(10, ge=1, le=50)
-):
-    """Get user's quiz history"""
-    user_results = []
+async def grade_batch(quiz_id: str, batch: QuizBatchSubmission, user_id: str) -> QuizBatchGradeResponse:
+    """Grade a batch of offline attempts and queue their results for writing"""
+    cached_quiz = await quiz_cache.get(quiz_id)
+    if not cached_quiz:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found"
+        )
     
-    for result_data in mock_quiz_results_db.values():
-        if result_data["user_id"] == current_user.id:
-            quiz_data = mock_quizzes_db.get(result_data["quiz_id"])
-            if quiz_data:
-                # Get questions with answers
-                questions_with_answers = []
-                for question_data in mock_questions_db.values():
-                    if question_data["quiz_id"] == result_data["quiz_id"]:
-                        questions_with_answers.append(get_question_response(question_data, include_answers=True))
-                
-                user_results.append(QuizResultResponse(
-                    id=result_data["id"],
-                    quiz=QuizResponse(**quiz_data),
-                    score=result_data["score"],
-                    points_earned=result_data["points_earned"],
-                    total_points=result_data["total_points"],
-                    time_taken=result_data["time_taken"],
-                    passed=result_data["passed"],
-                    submitted_at=result_data["submitted_at"],
-                    questions_with_answers=questions_with_answers,
-                    user_answers=result_data["answers"]
-                ))
+    grades = cached_quiz.grading_key.grade_many([attempt.answers for attempt in batch.attempts])
     
-    # Sort by submission date (newest first)
-    user_results.sort(key=lambda x: x.submitted_at, reverse=True)
+    now = datetime.now()
+    results = []
+    errors = []
+    for index, (attempt, grade) in enumerate(zip(batch.attempts, grades)):
+        if grade.unknown_question_ids:
+            errors.append(QuizAttemptError(index=index, detail=unknown_questions_detail(grade)))
+            continue
+        
+        result_data = build_result(
+            new_id("result"), user_id, cached_quiz, grade, attempt, attempt_time(attempt.submitted_at, now)
+        )
+        record_result(result_data)
+        results.append(QuizAttemptGrade(
+            index=index,
+            id=result_data["id"],
+            score=grade.score,
+            points_earned=grade.points_earned,
+            total_points=grade.total_points,
+            time_taken=attempt.time_taken,
+            passed=result_data["passed"],
+            submitted_at=result_data["submitted_at"],
+            correct=grade.correct
+        ))
     
-    return user_results[:limit]
+    if results:
+        user_result_versions.bump(user_id)
+    
+    return QuizBatchGradeResponse(
+        quiz=cached_quiz.quiz,
+        questions_with_answers=cached_quiz.answer_key,
+        graded=len(results),
+        failed=len(errors),
+        results=results,
+        errors=errors
+    )
+
+
+def record_result(result_data: dict) -> None:
+    """Rank a graded result, count it in the user's stats and queue it for the next batch write"""
+    repository.queue_result(result_key(result_data), result_data)
+    leaderboards.record(result_data)
+    record_quiz_activity(
+        result_data["user_id"], local_date(result_data["submitted_at"]), result_data["time_taken"]
+    )
+
+
+@router.get("/{quiz_id}/leaderboard", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    quiz_id: str,
+    date: Optional[str] = Query(None, description="Date in YYYY-MM-DD format"),
+    limit: int = Query(10, ge=1, le=100),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Get the top results of a quiz on a day"""
+    target_date = parse_date(date) if date else today()
+    board = leaderboards.get(quiz_id, target_date)
+    return LeaderboardResponse(
+        quiz_id=quiz_id,
+        date=datetime.combine(target_date, datetime.min.time()),
+        participants=len(board) if board else 0,
+        entries=await leaderboard_entries(board.top(limit) if board else [])
+    )
+
+
+@router.get("/{quiz_id}/leaderboard/me", response_model=LeaderboardStanding)
+async def get_my_standing(
+    quiz_id: str,
+    date: Optional[str] = Query(None, description="Date in YYYY-MM-DD format"),
+    radius: int = Query(5, ge=0, le=50, description="Entries shown above and below the caller"),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Get the caller's rank and percentile on a quiz leaderboard, with their neighbours"""
+    target_date = parse_date(date) if date else today()
+    board = leaderboards.get(quiz_id, target_date)
+    rank = board.rank(current_user.id) if board else None
+    return LeaderboardStanding(
+        quiz_id=quiz_id,
+        date=datetime.combine(target_date, datetime.min.time()),
+        participants=len(board) if board else 0,
+        rank=rank,
+        percentile=board.percentile(rank) if rank else None,
+        entries=await leaderboard_entries(board.around(current_user.id, radius) if rank else [])
+    )
+
+
+async def leaderboard_entries(board_entries: List[BoardEntry]) -> List[LeaderboardEntry]:
+    """Leaderboard entries with the participants' display names, loaded in one batch"""
+    users = await repository.get_users(board_entry.user_id for board_entry in board_entries)
+    return [
+        LeaderboardEntry(
+            rank=board_entry.rank,
+            user_id=board_entry.user_id,
+            name=users[board_entry.user_id]["name"] if board_entry.user_id in users else None,
+            score=board_entry.score,
+            time_taken=board_entry.time_taken,
+            submitted_at=board_entry.submitted_at
+        )
+        for board_entry in board_entries
+    ]
+
+
+def build_result(
+    result_id: str,
+    user_id: str,
+    cached_quiz: CachedQuiz,
+    grade: Grade,
+    submission: QuizSubmission,
+    submitted_at: datetime
+) -> dict:
+    """Stored result record of a graded submission"""
+    return {
+        "id": result_id,
+        "user_id": user_id,
+        "quiz_id": cached_quiz.quiz_data["id"],
+        "score": grade.score,
+        "points_earned": grade.points_earned,
+        "total_points": grade.total_points,
+        "time_taken": submission.time_taken,
+        "passed": grade.score >= cached_quiz.quiz_data["passing_score"],
+        "submitted_at": submitted_at,
+        "answers": submission.answers
+    }
+
+
+def result_key(result_data: dict) -> str:
+    """Repository key of a result: one per user, quiz and local day, matching the /daily lookup"""
+    return f"{result_data['user_id']}_{result_data['quiz_id']}_{local_date(result_data['submitted_at'])}"
+
+
+def attempt_time(submitted_at: Optional[datetime], now: datetime) -> datetime:
+    """Server-local naive submission time of an offline attempt, never in the future"""
+    if submitted_at is None:
+        return now
+    if submitted_at.tzinfo is not None:
+        submitted_at = submitted_at.astimezone().replace(tzinfo=None)
+    return min(submitted_at, now)
+
+
+def unknown_questions_detail(grade: Grade) -> str:
+    """Error message for answers to questions outside the quiz"""
+    return f"Questions not in this quiz: {', '.join(grade.unknown_question_ids)}"
@@ -0,0 +1,38 @@
+"""
+Bookmark store for the Comrade backend
+"""
+
+from typing import AbstractSet, Dict, Set
+
+from services.versioning import VersionMap
+
+
+class BookmarkStore:
+    """Per-user bookmarked news IDs with a version per user"""
+
+    def __init__(self):
+        self._bookmarks: Dict[str, Set[str]] = {}
+        self.versions = VersionMap()
+
+    def load(self, bookmarks: Dict[str, Set[str]]) -> None:
+        """Replace the cached bookmarks with a snapshot from the repository"""
+        self._bookmarks = {user_id: set(news_ids) for user_id, news_ids in bookmarks.items()}
+
+    def get(self, user_id: str) -> AbstractSet[str]:
+        """Bookmarked news IDs of a user (read-only view)"""
+        return self._bookmarks.get(user_id, frozenset())
+
+    def contains(self, user_id: str, news_id: str) -> bool:
+        return news_id in self._bookmarks.get(user_id, ())
+
+    def add(self, user_id: str, news_id: str) -> None:
+        bookmarks = self._bookmarks.setdefault(user_id, set())
+        if news_id not in bookmarks:
+            bookmarks.add(news_id)
+            self.versions.bump(user_id)
+
+    def remove(self, user_id: str, news_id: str) -> None:
+        bookmarks = self._bookmarks.get(user_id)
+        if bookmarks and news_id in bookmarks:
+            bookmarks.discard(news_id)
+            self.versions.bump(user_id)
@@ -0,0 +1,32 @@
+"""
+Timezone helpers for the Comrade backend
+"""
+
+from datetime import date, datetime, time
+from zoneinfo import ZoneInfo
+
+from config import settings
+
+# Day boundaries for daily feeds follow the configured local timezone
+local_tz = ZoneInfo(settings.app_timezone)
+
+
+def to_local(value: datetime) -> datetime:
+    """Convert a datetime to the local timezone (naive values are server-local, as datetime.now() gives)"""
+    return value.astimezone(local_tz)
+
+
+def local_date(value: datetime) -> date:
+    """Local calendar day of a datetime"""
+    return to_local(value).date()
+
+
+def start_of_day(day: date) -> datetime:
+    """Aware datetime of local midnight at the start of a day"""
+    return datetime.combine(day, time.min, tzinfo=local_tz)
+
+
+def today() -> date:
+    """Current local calendar day"""
+    return datetime.now(local_tz).date()
+
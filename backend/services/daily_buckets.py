@@ -0,0 +1,92 @@
+"""
+Per-day news buckets for the Comrade backend
+"""
+
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from services.clock import local_date
+from services.news_store import TimelineKey, timeline_key
+
+
+class DayBucket:
+    """News published on one local day, with materialized category counts"""
+
+    def __init__(self, day: date):
+        self.day = day
+        self.keys: List[TimelineKey] = []  # ascending; read backwards for newest first
+        self.categories_count: Dict[str, int] = {}
+        self.version = 0  # bumped whenever an article of the day is added, moved or edited
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def newest_first(self) -> Iterator[str]:
+        """News IDs of the day, newest first"""
+        for position in range(len(self.keys) - 1, -1, -1):
+            yield self.keys[position][1]
+
+    def add(self, key: TimelineKey, category: str) -> None:
+        insort(self.keys, key)
+        self.categories_count[category] = self.categories_count.get(category, 0) + 1
+
+    def remove(self, key: TimelineKey, category: str) -> None:
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            del self.keys[position]
+        remaining = self.categories_count.get(category, 0) - 1
+        if remaining > 0:
+            self.categories_count[category] = remaining
+        else:
+            self.categories_count.pop(category, None)
+
+
+class DailyBuckets:
+    """Date-partitioned news index kept in sync with the news store"""
+
+    def __init__(self):
+        self._buckets: Dict[date, DayBucket] = {}
+        self._placements: Dict[str, Tuple[date, TimelineKey, str]] = {}
+
+    def get(self, day: date) -> Optional[DayBucket]:
+        """Bucket for a local day, if any news was published on it"""
+        return self._buckets.get(day)
+
+    def track(self, news_data: dict) -> None:
+        """Place a news item in its day bucket, moving it if its date or category changed"""
+        placement = (
+            local_date(news_data["published_at"]),
+            timeline_key(news_data),
+            news_data["category"],
+        )
+        previous = self._placements.get(news_data["id"])
+        if previous == placement:
+            # Content edits still change the day's payload
+            self._buckets[placement[0]].version += 1
+            return
+
+        if previous is not None:
+            # Emptied buckets are kept so their version keeps increasing
+            bucket = self._buckets[previous[0]]
+            bucket.remove(previous[1], previous[2])
+            bucket.version += 1
+
+        bucket = self._buckets.get(placement[0])
+        if bucket is None:
+            bucket = self._buckets[placement[0]] = DayBucket(placement[0])
+        bucket.add(placement[1], placement[2])
+        bucket.version += 1
+        self._placements[news_data["id"]] = placement
+
+    def untrack(self, news_data: dict) -> None:
+        """Take a news item out of its day bucket, dropping the bucket once it is empty"""
+        placement = self._placements.pop(news_data["id"], None)
+        if placement is None:
+            return
+        bucket = self._buckets[placement[0]]
+        bucket.remove(placement[1], placement[2])
+        bucket.version += 1
+        if not bucket.keys:
+            # Only archived days are emptied; their ETags carry the segment version
+            del self._buckets[placement[0]]
@@ -0,0 +1,148 @@
+"""
+Near-duplicate article detection for the Comrade backend
+"""
+
+import hashlib
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from services.search_index import tokenize
+
+SIGNATURE_BITS = 64
+
+# Known click-tracking parameters; anything else may select the article and is kept
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "gbraid", "wbraid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "ref_src", "__twitter_impression",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+_HOST_PREFIXES = ("www.", "m.", "amp.")
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "to", "was", "were",
+    "will", "with",
+}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize an article URL so tracking and presentation variants compare equal"""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    if path.endswith("/amp") or path.endswith("/amp/"):
+        path = path[:path.rindex("/amp")] or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word unigrams and bigrams, ignoring stopwords"""
+    tokens = [token for token in tokenize(text) if token not in _STOPWORDS]
+    features: Dict[str, int] = {}
+    for index, token in enumerate(tokens):
+        features[token] = features.get(token, 0) + 1
+        if index:
+            bigram = f"{tokens[index - 1]} {token}"
+            features[bigram] = features.get(bigram, 0) + 1
+
+    totals = [0] * SIGNATURE_BITS
+    for feature, weight in features.items():
+        feature_hash = _feature_hash(feature)
+        for bit in range(SIGNATURE_BITS):
+            if feature_hash >> bit & 1:
+                totals[bit] += weight
+            else:
+                totals[bit] -= weight
+
+    signature = 0
+    for bit, total in enumerate(totals):
+        if total > 0:
+            signature |= 1 << bit
+    return signature
+
+
+class DuplicateIndex:
+    """Clusters articles by canonical URL and SimHash signature
+
+    Signatures are split into max_distance + 1 bands. Two signatures within
+    max_distance bits must agree exactly on at least one band, so candidates
+    come from band lookups instead of a scan over every article. Articles
+    leaving the hot store are discarded along with the URLs mapped to them.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        self._bands = max_distance + 1
+        self._band_bits = SIGNATURE_BITS // self._bands
+        self._band_tables: List[Dict[int, List[str]]] = [{} for _ in range(self._bands)]
+        self._signatures: Dict[str, int] = {}
+        self._by_url: Dict[str, str] = {}  # canonical URL -> canonical news ID
+        self._urls: Dict[str, List[str]] = {}  # canonical news ID -> URLs mapped to it
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def lookup_url(self, canonical_url: str) -> Optional[str]:
+        """News ID of the cluster a canonical URL already belongs to"""
+        return self._by_url.get(canonical_url)
+
+    def find_similar(self, signature: int) -> Optional[str]:
+        """Closest registered article within max_distance bits, if any"""
+        best_id = None
+        best_distance = self.max_distance + 1
+        for band, table in enumerate(self._band_tables):
+            for candidate in table.get(self._band_value(signature, band), ()):
+                distance = bin(signature ^ self._signatures[candidate]).count("1")
+                if distance < best_distance:
+                    best_id, best_distance = candidate, distance
+        return best_id
+
+    def register(self, news_id: str, canonical_url: str, signature: Optional[int] = None) -> None:
+        """Record a canonical article, or map a duplicate URL onto an existing cluster"""
+        if self._by_url.get(canonical_url) != news_id:
+            self._by_url[canonical_url] = news_id
+            self._urls.setdefault(news_id, []).append(canonical_url)
+        if signature is None or news_id in self._signatures:
+            return
+        self._signatures[news_id] = signature
+        for band, table in enumerate(self._band_tables):
+            table.setdefault(self._band_value(signature, band), []).append(news_id)
+
+    def discard(self, news_data: dict) -> None:
+        """Forget an article and the URLs of its cluster (news store removal listener)"""
+        news_id = news_data["id"]
+        for canonical_url in self._urls.pop(news_id, ()):
+            if self._by_url.get(canonical_url) == news_id:
+                del self._by_url[canonical_url]
+        signature = self._signatures.pop(news_id, None)
+        if signature is None:
+            return
+        for band, table in enumerate(self._band_tables):
+            value = self._band_value(signature, band)
+            members = table[value]
+            members.remove(news_id)
+            if not members:
+                del table[value]
+
+    def _band_value(self, signature: int, band: int) -> int:
+        return signature >> (band * self._band_bits) & ((1 << self._band_bits) - 1)
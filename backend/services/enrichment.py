@@ -0,0 +1,204 @@
+"""
+Process-pool NLP enrichment for ingested articles in the Comrade backend
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from services.rss_ingestion import IngestedItem
+
+logger = logging.getLogger(__name__)
+
+WORDS_PER_MINUTE = 200
+MAX_KEYWORD_TAGS = 5
+MAX_TAGS = 8
+SUMMARY_TARGET_CHARS = 240
+NLTK_PACKAGES = {"punkt": "tokenizers/punkt", "stopwords": "corpora/stopwords"}
+
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z'-]+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'])")
+STOPWORDS = frozenset(
+    "a about after against all also an and any are as at be because been before being "
+    "between both but by can could did do does during each for from further had has have "
+    "he her here his how i if in into is it its itself more most new no nor not of off on "
+    "once only or other our out over own said same says she should so some such than that "
+    "the their them then there these they this those through to too under until up very "
+    "was we were what when where which while who whom why will with would you your".split()
+)
+
+# Loaded once per worker process by _init_worker
+_sentence_splitter: Optional[Callable[[str], List[str]]] = None
+_stopwords = STOPWORDS
+
+
+class Enrichment(NamedTuple):
+    """Derived fields for one article"""
+    read_time: int
+    tags: List[str]
+    summary: str
+
+
+def ensure_nltk_data() -> None:
+    """Download the NLTK models used for enrichment if they are missing"""
+    import nltk
+
+    for package, resource in NLTK_PACKAGES.items():
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            if not nltk.download(package, quiet=True):
+                logger.warning("NLTK package %s unavailable; using regex fallbacks", package)
+
+
+def _init_worker() -> None:
+    """Load NLTK models once per worker process, falling back to regex splitting"""
+    global _sentence_splitter, _stopwords
+    try:
+        import nltk
+        from nltk.corpus import stopwords
+
+        _sentence_splitter = nltk.data.load("tokenizers/punkt/english.pickle").tokenize
+        _stopwords = frozenset(stopwords.words("english")) | STOPWORDS
+    except LookupError:
+        _sentence_splitter = None
+        _stopwords = STOPWORDS
+
+
+def _split_sentences(text: str) -> List[str]:
+    if _sentence_splitter is not None:
+        return _sentence_splitter(text)
+    return _SENTENCE_RE.split(text)
+
+
+def enrich_text(title: str, content: str) -> Enrichment:
+    """Compute read time, keyword tags and an extractive summary"""
+    words = _WORD_RE.findall(content)
+    read_time = max(1, min(60, math.ceil(len(words) / WORDS_PER_MINUTE)))
+
+    frequencies: Dict[str, int] = {}
+    surface_forms: Dict[str, Dict[str, int]] = {}
+    for word in words:
+        key = word.lower()
+        if key in _stopwords or len(key) < 3:
+            continue
+        frequencies[key] = frequencies.get(key, 0) + 1
+        forms = surface_forms.setdefault(key, {})
+        forms[word] = forms.get(word, 0) + 1
+
+    title_words = {word.lower() for word in _WORD_RE.findall(title)}
+    ranked = sorted(
+        frequencies,
+        key=lambda key: (frequencies[key] + 2 * (key in title_words), key),
+        reverse=True
+    )
+    tags = []
+    for key in ranked[:MAX_KEYWORD_TAGS]:
+        form = max(surface_forms[key], key=surface_forms[key].get)
+        tags.append(form.capitalize() if form.islower() else form)
+
+    # Score sentences by the frequency of their content words and keep the best in order
+    sentences = [sentence.strip() for sentence in _split_sentences(content) if sentence.strip()]
+    top = max(frequencies.values(), default=1)
+    scored = []
+    for position, sentence in enumerate(sentences):
+        keys = [word.lower() for word in _WORD_RE.findall(sentence)]
+        score = sum(frequencies.get(key, 0) for key in keys) / top / math.sqrt(max(len(keys), 1))
+        scored.append((score, position))
+
+    chosen = []
+    length = 0
+    for _, position in sorted(scored, reverse=True):
+        chosen.append(position)
+        length += len(sentences[position]) + 1
+        if length >= SUMMARY_TARGET_CHARS:
+            break
+    summary = " ".join(sentences[position] for position in sorted(chosen))
+    return Enrichment(read_time, tags, summary[:1000])
+
+
+def enrich_batch(texts: List[Tuple[str, str]]) -> List[Enrichment]:
+    """Enrich a batch of (title, content) pairs; runs inside a worker process"""
+    return [enrich_text(title, content) for title, content in texts]
+
+
+def content_hash(title: str, content: str) -> str:
+    return hashlib.sha256(f"{title}\0{content}".encode()).hexdigest()
+
+
+class EnrichmentStage:
+    """Runs NLP enrichment in a process pool with a content-hash result cache
+
+    Articles whose title and content hash is already cached are never sent
+    to the pool again, so unchanged items re-fetched on every poll are free.
+    """
+
+    def __init__(self, workers: int = 2, batch_size: int = 32, cache_size: int = 10000):
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Enrichment]" = OrderedDict()
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def enrich(self, items: List[IngestedItem]) -> List[IngestedItem]:
+        """Fill read_time, tags and (when the feed gave none) a summary description"""
+        hashes = [content_hash(item.news.title, item.news.content) for item in items]
+        resolved: Dict[str, Enrichment] = {}
+        missing: Dict[str, Tuple[str, str]] = {}
+        for item, digest in zip(items, hashes):
+            cached = self._cache.get(digest)
+            if cached is not None:
+                self._cache.move_to_end(digest)
+                resolved[digest] = cached
+            else:
+                missing[digest] = (item.news.title, item.news.content)
+
+        if missing:
+            digests = list(missing)
+            loop = asyncio.get_running_loop()
+            batches = [
+                digests[start:start + self.batch_size]
+                for start in range(0, len(digests), self.batch_size)
+            ]
+            results = await asyncio.gather(*(
+                loop.run_in_executor(self._executor, enrich_batch, [missing[d] for d in batch])
+                for batch in batches
+            ))
+            for batch, enrichments in zip(batches, results):
+                for digest, enrichment in zip(batch, enrichments):
+                    resolved[digest] = enrichment
+                    self._remember(digest, enrichment)
+
+        return [self._apply(item, resolved[digest]) for item, digest in zip(items, hashes)]
+
+    def _remember(self, digest: str, enrichment: Enrichment) -> None:
+        self._cache[digest] = enrichment
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _apply(item: IngestedItem, enrichment: Enrichment) -> IngestedItem:
+        news = item.news
+        tags = list(news.tags)
+        seen = {tag.lower() for tag in tags}
+        for tag in enrichment.tags:
+            if len(tags) >= MAX_TAGS:
+                break
+            if tag.lower() not in seen:
+                tags.append(tag)
+                seen.add(tag.lower())
+
+        update = {"read_time": enrichment.read_time, "tags": tags}
+        # Feeds without a summary repeat the body as description; replace it
+        weak_description = news.content.startswith(news.description) or len(news.description) < 80
+        if weak_description and len(enrichment.summary) >= 20:
+            update["description"] = enrichment.summary
+        return IngestedItem(news.model_copy(update=update), item.published_at)
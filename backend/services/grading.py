@@ -0,0 +1,120 @@
+"""
+Compiled answer-key grading for the Comrade backend
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Sequence
+
+import numpy as np
+
+from models.quiz import QuestionType, UserAnswer
+
+# Question kinds in a compiled key
+_CHOICE = 0  # expected option index
+_TRUE_FALSE = 1  # expected 0 or 1
+_TEXT = 2  # expected 1 when the normalized answer is in the accepted set
+
+# Encoded cell for unanswered questions and answers of the wrong type
+_UNANSWERED = -1
+_MAX_OPTION_INDEX = 1 << 31
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class Grade(NamedTuple):
+    """Outcome of one graded attempt"""
+    points_earned: int
+    total_points: int
+    score: int  # percentage
+    correct: List[bool]  # per question, in quiz order
+    unknown_question_ids: List[str]
+
+
+class AnswerKey:
+    """Answer key of one quiz compiled for vectorized grading
+
+    Option indexes and true/false answers become one int array and accepted
+    fill-in-blank answers are normalized once into frozensets. A batch of
+    attempts is encoded into an (attempts x questions) matrix and graded
+    with one comparison and one dot product. Unanswered questions score
+    zero; answers to questions outside the quiz are reported, not skipped.
+    """
+
+    def __init__(self, questions: List[dict], normalize_unicode: bool = True, collapse_whitespace: bool = True):
+        self.normalize_unicode = normalize_unicode
+        self.collapse_whitespace = collapse_whitespace
+        self.question_ids = [question_data["id"] for question_data in questions]
+        self.positions = {question_id: position for position, question_id in enumerate(self.question_ids)}
+        self.accepted: Dict[int, FrozenSet[str]] = {}
+
+        kinds = []
+        expected = []
+        for position, question_data in enumerate(questions):
+            answer_data = question_data["question_data"]
+            if question_data["question_type"] == QuestionType.MULTIPLE_CHOICE:
+                kinds.append(_CHOICE)
+                expected.append(answer_data["correct_answer_index"])
+            elif question_data["question_type"] == QuestionType.TRUE_FALSE:
+                kinds.append(_TRUE_FALSE)
+                expected.append(int(bool(answer_data["correct_answer"])))
+            else:
+                kinds.append(_TEXT)
+                expected.append(1)
+                self.accepted[position] = frozenset(
+                    self.normalize(answer) for answer in answer_data["correct_answers"]
+                )
+        self._kinds = kinds
+        self.expected = np.array(expected, dtype=np.int64)
+        self.points = np.array([question_data["points"] for question_data in questions], dtype=np.int64)
+        self.total_points = int(self.points.sum())
+
+    def __len__(self) -> int:
+        return len(self.question_ids)
+
+    def normalize(self, text: str) -> str:
+        """Canonical form of a fill-in-blank answer"""
+        text = unicodedata.normalize("NFKC", text).casefold() if self.normalize_unicode else text.lower()
+        if self.collapse_whitespace:
+            text = _WHITESPACE_RE.sub(" ", text)
+        return text.strip()
+
+    def grade(self, answers: Sequence[UserAnswer]) -> Grade:
+        """Grade one attempt"""
+        return self.grade_many([answers])[0]
+
+    def grade_many(self, attempts: Sequence[Sequence[UserAnswer]]) -> List[Grade]:
+        """Grade many attempts of this quiz at once"""
+        width = len(self.question_ids)
+        cells = [_UNANSWERED] * (len(attempts) * width)
+        unknown: List[List[str]] = []
+        for row, answers in enumerate(attempts):
+            missing = []
+            for answer in answers:
+                position = self.positions.get(answer.question_id)
+                if position is None:
+                    missing.append(answer.question_id)
+                else:
+                    cells[row * width + position] = self._encode(position, answer.answer)
+            unknown.append(missing)
+
+        given = np.array(cells, dtype=np.int64).reshape(len(attempts), width)
+        correct = given == self.expected
+        earned = correct.astype(np.int64) @ self.points
+        scores = earned * 100 // self.total_points if self.total_points else np.zeros_like(earned)
+        return [
+            Grade(int(earned[row]), self.total_points, int(scores[row]), correct[row].tolist(), unknown[row])
+            for row in range(len(attempts))
+        ]
+
+    def _encode(self, position: int, value: Any) -> int:
+        kind = self._kinds[position]
+        if kind == _CHOICE:
+            if isinstance(value, int) and not isinstance(value, bool) and 0 <= value < _MAX_OPTION_INDEX:
+                return value
+            return _UNANSWERED
+        if kind == _TRUE_FALSE:
+            return int(value) if isinstance(value, bool) else _UNANSWERED
+        if value is None:
+            return _UNANSWERED
+        return int(self.normalize(str(value)) in self.accepted[position])
@@ -0,0 +1,82 @@
+"""
+Idempotency-Key replay cache for the Comrade backend
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class IdempotencyKeyReused(Exception):
+    """The key was already used for a request with a different payload"""
+
+
+def fingerprint(*parts: Any) -> str:
+    """Digest of the request parts a replayed key must match"""
+    return hashlib.sha256("\0".join(str(part) for part in parts).encode()).hexdigest()
+
+
+class IdempotencyCache:
+    """Bounded LRU of request outcomes keyed by (scope, Idempotency-Key)
+
+    The first request under a key runs the handler; retries with the same
+    key and payload get the same result instead of running it again, and
+    retries that arrive while it is still running wait for it. Failed
+    requests are forgotten so the client can retry them. Entries expire
+    ttl_seconds after the first request, or are evicted least recently used
+    first when the cache is full.
+    """
+
+    def __init__(self, capacity: int = 10000, ttl_seconds: float = 86400.0):
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, float, asyncio.Future]]" = OrderedDict()
+        self.replays = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def run(
+        self,
+        scope: str,
+        key: str,
+        request_fingerprint: str,
+        handler: Callable[[], Awaitable[T]]
+    ) -> Tuple[T, bool]:
+        """Result of handler for this key, and whether it was replayed"""
+        entry_key = (scope, key)
+        entry = self._entries.get(entry_key)
+        now = time.monotonic()
+        if entry is not None and now - entry[1] > self.ttl_seconds:
+            del self._entries[entry_key]
+            entry = None
+
+        if entry is not None:
+            if entry[0] != request_fingerprint:
+                raise IdempotencyKeyReused(key)
+            self._entries.move_to_end(entry_key)
+            self.replays += 1
+            return await asyncio.shield(entry[2]), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._entries[entry_key] = (request_fingerprint, now, future)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        try:
+            result = await handler()
+        except BaseException as exc:
+            if self._entries.get(entry_key, (None, None, None))[2] is future:
+                del self._entries[entry_key]
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                # Waiting retries re-raise it; mark it retrieved for requests that had none
+                future.exception()
+            raise
+        future.set_result(result)
+        return result, False
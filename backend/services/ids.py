@@ -0,0 +1,15 @@
+"""
+Identifier generation for the Comrade backend
+"""
+
+import secrets
+import time
+
+
+def new_id(prefix: str) -> str:
+    """Unique, roughly time-ordered ID: millisecond timestamp plus 64 random bits
+
+    Unlike count-based IDs these never collide between concurrent requests
+    or across processes sharing a database.
+    """
+    return f"{prefix}_{time.time_ns() // 1_000_000:011x}{secrets.token_hex(8)}"
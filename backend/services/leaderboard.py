@@ -0,0 +1,138 @@
+"""
+Order-statistic quiz leaderboards for the Comrade backend
+"""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+from services.clock import local_date
+from services.news_store import to_epoch_us
+
+# Unrecorded solve times rank after every recorded one
+_NO_TIME = 1 << 62
+
+# (-score, time_taken, submitted_at_us, user_id): best result sorts first
+RankKey = Tuple[int, int, int, str]
+
+
+class BoardEntry(NamedTuple):
+    """One participant's standing on a board"""
+    rank: int  # 1-based
+    user_id: str
+    result_id: str
+    score: int
+    time_taken: Optional[int]
+    submitted_at: datetime
+
+
+class Board:
+    """Results of one quiz on one day, ranked by score, then time taken, then submission time
+
+    Rank keys live in a SortedList, so recording a result, looking up a
+    rank and reading a slice of the ranking are all O(log n). Each user has
+    at most one entry; a newer result replaces the previous one.
+    """
+
+    def __init__(self):
+        self._ranking = SortedList()
+        self._keys: Dict[str, RankKey] = {}
+        self._details: Dict[str, Tuple[str, datetime]] = {}  # user_id -> (result ID, submitted_at)
+
+    def __len__(self) -> int:
+        return len(self._ranking)
+
+    def record(self, result_data: dict) -> None:
+        """Insert or replace a user's result"""
+        user_id = result_data["user_id"]
+        previous = self._keys.get(user_id)
+        if previous is not None:
+            self._ranking.remove(previous)
+        time_taken = result_data["time_taken"]
+        key = (
+            -result_data["score"],
+            time_taken if time_taken is not None else _NO_TIME,
+            to_epoch_us(result_data["submitted_at"]),
+            user_id
+        )
+        self._ranking.add(key)
+        self._keys[user_id] = key
+        self._details[user_id] = (result_data["id"], result_data["submitted_at"])
+
+    def rank(self, user_id: str) -> Optional[int]:
+        """1-based rank of a user, or None if they have no result on this board"""
+        key = self._keys.get(user_id)
+        return self._ranking.bisect_left(key) + 1 if key is not None else None
+
+    def percentile(self, rank: int) -> float:
+        """Share of participants ranked at or below a rank, in percent"""
+        return round(100.0 * (len(self._ranking) - rank + 1) / len(self._ranking), 2)
+
+    def entries(self, start: int, stop: int) -> List[BoardEntry]:
+        """Entries ranked start+1 .. stop"""
+        start = max(start, 0)
+        return [
+            self._entry(position + 1, key[3])
+            for position, key in enumerate(self._ranking.islice(start, stop), start)
+        ]
+
+    def top(self, limit: int) -> List[BoardEntry]:
+        """The best limit entries"""
+        return self.entries(0, limit)
+
+    def around(self, user_id: str, radius: int) -> List[BoardEntry]:
+        """Entries within radius ranks of a user, including the user"""
+        rank = self.rank(user_id)
+        if rank is None:
+            return []
+        return self.entries(rank - 1 - radius, rank + radius)
+
+    def _entry(self, rank: int, user_id: str) -> BoardEntry:
+        negated_score, time_taken, _, _ = self._keys[user_id]
+        result_id, submitted_at = self._details[user_id]
+        return BoardEntry(
+            rank, user_id, result_id, -negated_score,
+            time_taken if time_taken != _NO_TIME else None, submitted_at
+        )
+
+
+class LeaderboardStore:
+    """Boards keyed by (quiz_id, day), keeping only the most recent days"""
+
+    def __init__(self, retention_days: int = 7):
+        self.retention_days = retention_days
+        self._boards: Dict[Tuple[str, date], Board] = {}
+        self._newest_day: Optional[date] = None
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    def get(self, quiz_id: str, day: date) -> Optional[Board]:
+        """Board of a quiz on a day, if anyone submitted a result"""
+        return self._boards.get((quiz_id, day))
+
+    def record(self, result_data: dict) -> None:
+        """Place a result on the board of its quiz and local submission day"""
+        day = local_date(result_data["submitted_at"])
+        if self._newest_day is not None and (self._newest_day - day).days >= self.retention_days:
+            return
+        key = (result_data["quiz_id"], day)
+        board = self._boards.get(key)
+        if board is None:
+            board = self._boards[key] = Board()
+            if self._newest_day is None or day > self._newest_day:
+                self._newest_day = day
+                self._prune()
+        board.record(result_data)
+
+    def record_many(self, results: Iterable[dict]) -> None:
+        """Place many results, e.g. when rebuilding the boards at startup"""
+        for result_data in results:
+            self.record(result_data)
+
+    def _prune(self) -> None:
+        # Runs only when a new day starts, so scanning the board keys is cheap
+        for quiz_id, day in list(self._boards):
+            if (self._newest_day - day).days >= self.retention_days:
+                del self._boards[(quiz_id, day)]
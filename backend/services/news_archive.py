@@ -0,0 +1,397 @@
+"""
+Memory-mapped news archive for the Comrade backend
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import date
+from heapq import merge
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from pydantic_core import from_json, to_json
+
+from services.news_store import NEWS_FIELDS, timeline_key
+from services.repository import NEWS_DATETIMES, decode
+
+SEGMENT_MAGIC = b"CNAS"
+INDEX_MAGIC = b"CNAI"
+FORMAT_VERSION = 1
+
+# magic, format version, article count, directory offset, summary offset, summary length
+_SEGMENT_HEADER = struct.Struct("<4sHIQQI")
+# published_at (epoch µs), ID hash, fields offset, fields length, body offset, body length
+_ENTRY = struct.Struct("<qQQIQI")
+# magic, format version, entry count
+_INDEX_HEADER = struct.Struct("<4sHQ")
+# ID hash, day ordinal - sorted, so one ID resolves to its day by binary search
+_ID_ENTRY = struct.Struct("<QI")
+
+MANIFEST_FILE = "manifest.json"
+ID_INDEX_FILE = "ids.idx"
+
+# ID index entries written per file write while merging
+_WRITE_CHUNK = 4096
+
+
+def id_hash(news_id: str) -> int:
+    """64-bit key of a news ID in the segment directories and the ID index"""
+    return int.from_bytes(hashlib.blake2b(news_id.encode(), digest_size=8).digest(), "little")
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Replace a file with new contents so readers never see a partial write"""
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+
+
+def write_segment(path: str, day: date, news_items: Iterable[Mapping]) -> int:
+    """Write the immutable segment of one day; returns how many articles it holds
+
+    Layout: header, then per article its JSON fields (everything but content)
+    followed by the zlib-compressed content, then the offset directory in
+    timeline order, then a JSON summary with the day's category counts.
+    """
+    ordered = sorted(news_items, key=timeline_key)
+    buffer = bytearray(_SEGMENT_HEADER.size)
+    directory = bytearray()
+    categories_count: Dict[str, int] = {}
+    for news_data in ordered:
+        fields = to_json({field: news_data[field] for field in NEWS_FIELDS if field != "content"})
+        body = zlib.compress(news_data["content"].encode())
+        fields_offset = len(buffer)
+        buffer += fields
+        body_offset = len(buffer)
+        buffer += body
+        directory += _ENTRY.pack(
+            timeline_key(news_data)[0], id_hash(news_data["id"]),
+            fields_offset, len(fields), body_offset, len(body)
+        )
+        category = news_data["category"]
+        categories_count[category] = categories_count.get(category, 0) + 1
+
+    directory_offset = len(buffer)
+    buffer += directory
+    summary = to_json({"day": day.isoformat(), "categories_count": categories_count})
+    summary_offset = len(buffer)
+    buffer += summary
+    _SEGMENT_HEADER.pack_into(
+        buffer, 0, SEGMENT_MAGIC, FORMAT_VERSION, len(ordered),
+        directory_offset, summary_offset, len(summary)
+    )
+    write_atomic(path, bytes(buffer))
+    return len(ordered)
+
+
+class ArchivedNews(Mapping):
+    """Read-only mapping view of one sealed article; content is inflated on access"""
+
+    __slots__ = ("_fields", "_segment", "_body")
+
+    def __init__(self, fields: Dict[str, Any], segment: "ArchiveSegment", body: Tuple[int, int]):
+        self._fields = fields
+        self._segment = segment
+        self._body = body
+
+    def __getitem__(self, field: str) -> Any:
+        if field == "content":
+            return self._segment.read_body(*self._body)
+        return self._fields[field]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(NEWS_FIELDS)
+
+    def __len__(self) -> int:
+        return len(NEWS_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"ArchivedNews({self['id']!r})"
+
+
+class ArchiveSegment:
+    """One sealed day, read through a read-only memory map
+
+    Only the directory entries and the articles actually requested are
+    touched, so the kernel pages in just those bytes. The directory is in
+    timeline order, so ID lookups go through a hash-sorted index built from
+    it the first time the segment is searched.
+    """
+
+    def __init__(self, path: str, version: int):
+        with open(path, "rb") as handle:
+            self._buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, format_version, self.count, self._directory, summary_offset, summary_length = (
+            _SEGMENT_HEADER.unpack_from(self._buffer, 0)
+        )
+        if magic != SEGMENT_MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f"Not a news archive segment: {path}")
+        summary = from_json(self._buffer[summary_offset:summary_offset + summary_length])
+        self.day = date.fromisoformat(summary["day"])
+        self.categories_count: Dict[str, int] = summary["categories_count"]
+        self.version = version
+        self._hashes: Optional[array] = None  # ID hashes, ascending
+        self._positions: Optional[array] = None  # directory position of each hash
+
+    def __len__(self) -> int:
+        return self.count
+
+    def newest_first(self) -> Iterator[ArchivedNews]:
+        """Articles of the day, newest first"""
+        for position in range(self.count - 1, -1, -1):
+            yield self._record(position)
+
+    def find(self, news_id: str) -> Optional[ArchivedNews]:
+        """Look up an article of this day by ID"""
+        if self._hashes is None:
+            self._index_ids()
+        key = id_hash(news_id)
+        index = bisect_left(self._hashes, key)
+        while index < len(self._hashes) and self._hashes[index] == key:
+            record = self._record(self._positions[index])
+            if record["id"] == news_id:
+                return record
+            index += 1
+        return None
+
+    def read_body(self, offset: int, length: int) -> str:
+        return zlib.decompress(self._buffer[offset:offset + length]).decode()
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def _index_ids(self) -> None:
+        entries = sorted(
+            (_ENTRY.unpack_from(self._buffer, self._directory + position * _ENTRY.size)[1], position)
+            for position in range(self.count)
+        )
+        self._hashes = array("Q", (key for key, _ in entries))
+        self._positions = array("I", (position for _, position in entries))
+
+    def _record(self, position: int) -> ArchivedNews:
+        _, _, fields_offset, fields_length, body_offset, body_length = _ENTRY.unpack_from(
+            self._buffer, self._directory + position * _ENTRY.size
+        )
+        fields = decode(self._buffer[fields_offset:fields_offset + fields_length], NEWS_DATETIMES)
+        return ArchivedNews(fields, self, (body_offset, body_length))
+
+
+class SealedDays(NamedTuple):
+    """Archive state written by NewsArchive.write_days, not yet visible to readers"""
+    days: Dict[str, int]  # ISO day -> segment version
+    count: int
+    sealed_before: date
+    written: int
+    reindexed: bool
+
+
+class NewsArchive:
+    """Cold tier of the news store: one immutable segment file per local day
+
+    Days older than the hot window are sealed into segments and dropped from
+    the in-process store. A sorted, memory-mapped index of ID hashes maps an
+    article to its day, so lookups cost a binary search plus one segment
+    read no matter how many days are archived. Only a bounded number of
+    segments is kept mapped. Re-sealing a day (late arrivals) rewrites its
+    segment and bumps its version, which feeds the /daily ETag.
+
+    Sealing is split in two: write_days only writes files, so it can run in
+    a worker thread while readers keep using the previous state, and apply
+    switches readers over on the event loop.
+    """
+
+    def __init__(self, directory: Optional[str], max_open_segments: int = 32):
+        self.directory = directory
+        self.enabled = directory is not None
+        self.max_open_segments = max_open_segments
+        self.sealed_before: Optional[date] = None  # every day before this one is archived
+        self._days: Dict[str, int] = {}  # ISO day -> segment version
+        self._count = 0
+        self._segments: "OrderedDict[date, ArchiveSegment]" = OrderedDict()
+        self._ids: Optional[mmap.mmap] = None
+        self._id_count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, news_id: str) -> bool:
+        return self.get(news_id) is not None
+
+    def open(self) -> None:
+        """Read the manifest and map the ID index (no-op when archiving is disabled)"""
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "rb") as handle:
+                manifest = from_json(handle.read())
+            sealed_before = manifest.get("sealed_before")
+            self.sealed_before = date.fromisoformat(sealed_before) if sealed_before else None
+            self._days = manifest.get("days", {})
+            self._count = manifest.get("count", 0)
+        self._map_ids()
+
+    def close(self) -> None:
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+        if self._ids is not None:
+            self._ids.close()
+            self._ids = None
+
+    def day(self, day: date) -> Optional[ArchiveSegment]:
+        """Sealed segment of a local day, if that day is archived"""
+        version = self._days.get(day.isoformat())
+        if version is None:
+            return None
+        segment = self._segments.get(day)
+        if segment is None or segment.version != version:
+            # Evicted segments are unmapped once no record refers to them any more
+            segment = self._segments[day] = ArchiveSegment(self._segment_path(day), version)
+            if len(self._segments) > self.max_open_segments:
+                self._segments.popitem(last=False)
+        self._segments.move_to_end(day)
+        return segment
+
+    def get(self, news_id: str) -> Optional[ArchivedNews]:
+        """Look up an archived article by ID"""
+        for ordinal in self._lookup_days(id_hash(news_id)):
+            segment = self.day(date.fromordinal(ordinal))
+            record = segment.find(news_id) if segment is not None else None
+            if record is not None:
+                return record
+        return None
+
+    def indexes(self, news_id: str) -> bool:
+        """Whether the ID index holds an article's hash (exact up to 64-bit hash collisions)"""
+        return bool(self._lookup_days(id_hash(news_id)))
+
+    def seal(self, news_by_day: Dict[date, List[Mapping]], sealed_before: date) -> int:
+        """Write segments for whole days and switch readers to them; returns how many articles were written"""
+        return self.apply(self.write_days(news_by_day, sealed_before))
+
+    def write_days(self, news_by_day: Dict[date, List[Mapping]], sealed_before: date) -> SealedDays:
+        """Write segments for whole days, merging with already sealed copies
+
+        Touches no reader state, so it may run in a worker thread; pass the
+        result to apply(). The manifest is replaced last, so a crash leaves
+        the previous archive state intact.
+        """
+        days = dict(self._days)
+        count = self._count
+        new_entries = set()
+        written = 0
+        for day, news_items in sorted(news_by_day.items()):
+            version = days.get(day.isoformat())
+            # A private mapping: the event loop owns the open segment cache
+            existing = ArchiveSegment(self._segment_path(day), version) if version is not None else None
+            try:
+                merged: Dict[str, Mapping] = {}
+                if existing is not None:
+                    for record in existing.newest_first():
+                        merged[record["id"]] = record
+                for news_data in news_items:
+                    merged[news_data["id"]] = news_data
+                    new_entries.add((id_hash(news_data["id"]), day.toordinal()))
+
+                written += write_segment(self._segment_path(day), day, merged.values())
+                count += len(merged) - (len(existing) if existing is not None else 0)
+            finally:
+                if existing is not None:
+                    existing.close()
+            days[day.isoformat()] = (version or 0) + 1
+
+        if new_entries:
+            self._write_id_index(sorted(new_entries))
+        if self.sealed_before is not None and self.sealed_before > sealed_before:
+            sealed_before = self.sealed_before
+        write_atomic(os.path.join(self.directory, MANIFEST_FILE), to_json({
+            "format": FORMAT_VERSION,
+            "sealed_before": sealed_before.isoformat(),
+            "count": count,
+            "days": days,
+        }))
+        return SealedDays(days, count, sealed_before, written, bool(new_entries))
+
+    def apply(self, sealed: SealedDays) -> int:
+        """Switch readers to days written by write_days; returns how many articles were written"""
+        self._days = sealed.days
+        self._count = sealed.count
+        self.sealed_before = sealed.sealed_before
+        if sealed.reindexed:
+            self._map_ids()
+        return sealed.written
+
+    def _segment_path(self, day: date) -> str:
+        return os.path.join(self.directory, f"{day.isoformat()}.seg")
+
+    def _map_ids(self) -> None:
+        path = os.path.join(self.directory, ID_INDEX_FILE)
+        if self._ids is not None:
+            self._ids.close()
+            self._ids = None
+        self._id_count = 0
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as handle:
+            self._ids = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, format_version, self._id_count = _INDEX_HEADER.unpack_from(self._ids, 0)
+        if magic != INDEX_MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f"Not a news archive ID index: {path}")
+
+    def _id_entry(self, position: int) -> Tuple[int, int]:
+        return _ID_ENTRY.unpack_from(self._ids, _INDEX_HEADER.size + position * _ID_ENTRY.size)
+
+    def _lookup_days(self, key: int) -> List[int]:
+        """Day ordinals of every ID sharing a hash key (almost always one)"""
+        low, high = 0, self._id_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._id_entry(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        ordinals = []
+        while low < self._id_count:
+            entry_key, ordinal = self._id_entry(low)
+            if entry_key != key:
+                break
+            ordinals.append(ordinal)
+            low += 1
+        return ordinals
+
+    def _write_id_index(self, new_entries: List[Tuple[int, int]]) -> None:
+        """Merge sorted new entries into the ID index, streaming the old entries from the map"""
+        path = os.path.join(self.directory, ID_INDEX_FILE)
+        temporary = path + ".tmp"
+        existing = (self._id_entry(position) for position in range(self._id_count))
+        count = 0
+        previous = None
+        with open(temporary, "wb") as handle:
+            handle.write(bytes(_INDEX_HEADER.size))
+            chunk = bytearray()
+            for entry in merge(existing, new_entries):
+                if entry == previous:
+                    continue
+                previous = entry
+                chunk += _ID_ENTRY.pack(*entry)
+                count += 1
+                if count % _WRITE_CHUNK == 0:
+                    handle.write(chunk)
+                    chunk = bytearray()
+            handle.write(chunk)
+            handle.seek(0)
+            handle.write(_INDEX_HEADER.pack(INDEX_MAGIC, FORMAT_VERSION, count))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, path)
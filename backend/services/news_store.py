@@ -0,0 +1,534 @@
+"""
+News store with secondary indexes for the Comrade backend
+"""
+
+import base64
+import binascii
+import sys
+import zlib
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import Mapping
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from models.news import NewsCategory, NewsSource
+
+# (published_at in epoch microseconds, news id) - unique and totally ordered
+TimelineKey = Tuple[int, str]
+
+# Called with the stored news record after every insert or update
+NewsListener = Callable[["NewsRecord"], None]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Stored in updated_us when an article was never updated
+_NO_TIMESTAMP = -(1 << 63)
+
+# Row flag bits
+_FEATURED = 1
+_PUBLISHED_NAIVE = 2
+_CREATED_NAIVE = 4
+_UPDATED_NAIVE = 8
+_CONTENT_COMPRESSED = 16
+
+# Bodies shorter than this are stored as plain UTF-8
+_COMPRESS_MIN_BYTES = 256
+
+# Compact the content buffer once this share of it belongs to replaced bodies
+_BLOB_GARBAGE_RATIO = 0.5
+
+# Per-row columns, rebuilt together when rows are removed
+_LIST_COLUMNS = (
+    "_ids", "_titles", "_descriptions", "_image_urls", "_source_urls", "_authors", "_tag_codes",
+)
+_ARRAY_COLUMNS = (
+    "_source_codes", "_category_codes", "_read_times", "_flags", "_view_counts",
+    "_published_us", "_created_us", "_updated_us",
+)
+
+NEWS_FIELDS = (
+    "id", "title", "description", "content", "image_url", "source_url", "source",
+    "author", "category", "tags", "read_time", "published_at", "created_at",
+    "updated_at", "also_reported_by", "is_featured", "view_count",
+)
+
+
+def to_epoch_us(value: datetime) -> int:
+    """Convert a datetime to epoch microseconds (naive values are server-local, as datetime.now() gives)"""
+    if value.tzinfo is None:
+        value = value.astimezone(timezone.utc)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def from_epoch_us(value: int, naive: bool = False) -> datetime:
+    """Inverse of to_epoch_us; aware results are in UTC, naive ones server-local"""
+    value = _EPOCH + timedelta(microseconds=value)
+    return value.astimezone().replace(tzinfo=None) if naive else value
+
+
+def timeline_key(news_data: Mapping) -> TimelineKey:
+    """Build the timeline key of a news item"""
+    return (to_epoch_us(news_data["published_at"]), news_data["id"])
+
+
+def encode_cursor(key: TimelineKey) -> str:
+    """Encode a timeline key as an opaque pagination cursor"""
+    raw = f"{key[0]}:{key[1]}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> TimelineKey:
+    """Decode a pagination cursor, raising ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        published_us, news_id = raw.split(":", 1)
+        return (int(published_us), news_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+class _Interner:
+    """Maps repeated values (enums, tags) to small integer codes"""
+
+    def __init__(self):
+        self.values: List[Hashable] = []
+        self._codes: Dict[Hashable, int] = {}
+
+    def code(self, value: Hashable) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class NewsRecord(Mapping):
+    """Read-only mapping view of one stored article
+
+    Fields are decoded from the store's columns on access; ``content`` is
+    only read from the blob buffer when it is actually requested. Records
+    stay valid across updates because they address the row, not a copy.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "NewsStore", row: int):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, field: str) -> Any:
+        reader = _READERS.get(field)
+        if reader is None:
+            raise KeyError(field)
+        return reader(self._store, self._row)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(NEWS_FIELDS)
+
+    def __len__(self) -> int:
+        return len(NEWS_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"NewsRecord({self['id']!r})"
+
+
+def _read_flag(bit: int) -> Callable[["NewsStore", int], bool]:
+    return lambda store, row: bool(store._flags[row] & bit)
+
+
+def _read_updated_at(store: "NewsStore", row: int) -> Optional[datetime]:
+    value = store._updated_us[row]
+    if value == _NO_TIMESTAMP:
+        return None
+    return from_epoch_us(value, bool(store._flags[row] & _UPDATED_NAIVE))
+
+
+_READERS: Dict[str, Callable[["NewsStore", int], Any]] = {
+    "id": lambda store, row: store._ids[row],
+    "title": lambda store, row: store._titles[row],
+    "description": lambda store, row: store._descriptions[row],
+    "content": lambda store, row: store._read_content(row),
+    "image_url": lambda store, row: store._image_urls[row],
+    "source_url": lambda store, row: store._source_urls[row],
+    "source": lambda store, row: store._sources.values[store._source_codes[row]],
+    "author": lambda store, row: store._authors[row],
+    "category": lambda store, row: store._categories.values[store._category_codes[row]],
+    "tags": lambda store, row: [store._tags.values[code] for code in store._tag_codes[row]],
+    "read_time": lambda store, row: store._read_times[row],
+    "published_at": lambda store, row: from_epoch_us(
+        store._published_us[row], bool(store._flags[row] & _PUBLISHED_NAIVE)
+    ),
+    "created_at": lambda store, row: from_epoch_us(
+        store._created_us[row], bool(store._flags[row] & _CREATED_NAIVE)
+    ),
+    "updated_at": _read_updated_at,
+    "also_reported_by": lambda store, row: list(store._reports.get(row, ())),
+    "is_featured": _read_flag(_FEATURED),
+    "view_count": lambda store, row: store._view_counts[row],
+}
+
+
+class NewsStore:
+    """In-memory news store with a published_at timeline and secondary indexes
+
+    Articles are kept in columns rather than one dict per article: enums and
+    tags are interned to small ints, timestamps are int64 epoch microseconds
+    and content bodies live zlib-compressed in one append-only buffer. Callers get
+    NewsRecord mapping views, so dict-style reads keep working.
+
+    Every index is a list of timeline keys kept in ascending order, so the
+    newest items are read by walking an index backwards and stopping as soon
+    as a page is full.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._titles: List[str] = []
+        self._descriptions: List[str] = []
+        self._image_urls: List[Optional[str]] = []
+        self._source_urls: List[str] = []
+        self._authors: List[Optional[str]] = []
+        self._tag_codes: List[Tuple[int, ...]] = []
+        self._reports: Dict[int, List[dict]] = {}  # sparse; most articles have none
+        self._sources = _Interner()
+        self._categories = _Interner()
+        self._tags = _Interner()
+        self._source_codes = array("H")
+        self._category_codes = array("H")
+        self._read_times = array("H")
+        self._flags = array("B")
+        self._view_counts = array("q")
+        self._published_us = array("q")
+        self._created_us = array("q")
+        self._updated_us = array("q")
+        self._content = bytearray()
+        self._content_offsets = array("Q")
+        self._content_lengths = array("L")
+        self._content_garbage = 0
+
+        self._keys: Dict[str, TimelineKey] = {}
+        self._timeline: List[TimelineKey] = []
+        self._by_category: Dict[NewsCategory, List[TimelineKey]] = {}
+        self._by_source: Dict[NewsSource, List[TimelineKey]] = {}
+        self._featured: List[TimelineKey] = []
+        self._listeners: List[NewsListener] = []
+        self._removal_listeners: List[NewsListener] = []
+        self.version = 0  # bumped on every insert or update (not on view count flushes)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, news_id: str) -> bool:
+        return news_id in self._rows
+
+    def __iter__(self) -> Iterator[NewsRecord]:
+        """Iterate every stored news item in insertion order"""
+        for row in self._rows.values():
+            yield NewsRecord(self, row)
+
+    def get(self, news_id: str) -> Optional[NewsRecord]:
+        """Get news data by ID"""
+        row = self._rows.get(news_id)
+        return None if row is None else NewsRecord(self, row)
+
+    def add_listener(self, listener: NewsListener, replay: bool = True) -> None:
+        """Register a callback that keeps a derived index in sync with the store"""
+        self._listeners.append(listener)
+        if replay:
+            for news_data in self:
+                listener(news_data)
+
+    def add_removal_listener(self, listener: NewsListener) -> None:
+        """Register a callback that drops a news item from a derived index before it leaves the store"""
+        self._removal_listeners.append(listener)
+
+    def add(self, news_data: Mapping) -> NewsRecord:
+        """Insert a news item, replacing any existing item with the same ID"""
+        existing = self.get(news_data["id"])
+        if existing is not None:
+            self._unindex(existing)
+
+        record = self._write_row(news_data)
+        self._index(record)
+        self._notify(record)
+        return record
+
+    def add_many(self, news_items: List[Mapping]) -> None:
+        """Insert many news items, re-sorting each touched index once instead of per item"""
+        touched: Dict[int, List[TimelineKey]] = {}
+        records = []
+        for news_data in news_items:
+            existing = self.get(news_data["id"])
+            if existing is not None:
+                self._unindex(existing)
+
+            record = self._write_row(news_data)
+            key = (self._published_us[record._row], self._ids[record._row])
+            self._keys[key[1]] = key
+            for index in self._indexes_for(record):
+                index.append(key)
+                touched[id(index)] = index
+            records.append(record)
+
+        for index in touched.values():
+            index.sort()
+        for record in records:
+            self._notify(record)
+
+    def update(self, news_id: str, changes: Dict[str, Any]) -> Optional[NewsRecord]:
+        """Apply field changes to a news item and refresh its index entries"""
+        record = self.get(news_id)
+        if record is None:
+            return None
+
+        self._unindex(record)
+        self._write_row({**record, **changes, "updated_at": datetime.now()}, record._row)
+        self._index(record)
+        self._notify(record)
+        return record
+
+    def remove_many(self, news_ids: List[str]) -> int:
+        """Drop news items and compact the columns; returns how many were removed
+
+        Row numbers change, so NewsRecords obtained before the call must not
+        be used afterwards.
+        """
+        removed = {news_id for news_id in news_ids if news_id in self._rows}
+        if not removed:
+            return 0
+
+        for news_id in removed:
+            record = NewsRecord(self, self._rows[news_id])
+            for listener in self._removal_listeners:
+                listener(record)
+            del self._keys[news_id]
+        for index in [self._timeline, self._featured, *self._by_category.values(), *self._by_source.values()]:
+            index[:] = [key for key in index if key[1] not in removed]
+        self._compact_rows([row for row, news_id in enumerate(self._ids) if news_id not in removed])
+        self.version += 1
+        return len(removed)
+
+    def apply_view_counts(self, deltas: Dict[str, int]) -> None:
+        """Add a batch of buffered view increments to the stored counts"""
+        for news_id, delta in deltas.items():
+            row = self._rows.get(news_id)
+            if row is not None:
+                self._view_counts[row] += delta
+
+    def iter_newest(
+        self,
+        category: Optional[NewsCategory] = None,
+        source: Optional[NewsSource] = None,
+        featured_only: bool = False,
+        before: Optional[TimelineKey] = None
+    ) -> Iterator[NewsRecord]:
+        """Iterate matching news items, newest first, optionally strictly before a key"""
+        index = self._smallest_index(category, source, featured_only)
+        start = len(index) if before is None else bisect_left(index, before)
+        for position in range(start - 1, -1, -1):
+            news_data = NewsRecord(self, self._rows[index[position][1]])
+            if self.matches(news_data, category, source, featured_only):
+                yield news_data
+
+    def key_of(self, news_id: str) -> Optional[TimelineKey]:
+        """Get the timeline key of a stored news item"""
+        return self._keys.get(news_id)
+
+    def iter_published_between(self, start: Optional[datetime], end: Optional[datetime]) -> Iterator[NewsRecord]:
+        """Iterate news items published in [start, end), newest first; None leaves a side open"""
+        low = bisect_left(self._timeline, (to_epoch_us(start), "")) if start is not None else 0
+        high = bisect_left(self._timeline, (to_epoch_us(end), "")) if end is not None else len(self._timeline)
+        for position in range(high - 1, low - 1, -1):
+            yield NewsRecord(self, self._rows[self._timeline[position][1]])
+
+    def count(
+        self,
+        category: Optional[NewsCategory] = None,
+        source: Optional[NewsSource] = None,
+        featured_only: bool = False
+    ) -> int:
+        """Count matching news items"""
+        filters = (category is not None) + (source is not None) + featured_only
+        index = self._smallest_index(category, source, featured_only)
+        if filters <= 1:
+            return len(index)
+        return sum(
+            1 for _, news_id in index
+            if self.matches(NewsRecord(self, self._rows[news_id]), category, source, featured_only)
+        )
+
+    def _smallest_index(
+        self,
+        category: Optional[NewsCategory],
+        source: Optional[NewsSource],
+        featured_only: bool
+    ) -> List[TimelineKey]:
+        """Pick the shortest index that covers one of the requested filters"""
+        candidates = [self._timeline]
+        if category is not None:
+            candidates.append(self._by_category.get(category, []))
+        if source is not None:
+            candidates.append(self._by_source.get(source, []))
+        if featured_only:
+            candidates.append(self._featured)
+        return min(candidates, key=len)
+
+    @staticmethod
+    def matches(
+        news_data: Mapping,
+        category: Optional[NewsCategory] = None,
+        source: Optional[NewsSource] = None,
+        featured_only: bool = False
+    ) -> bool:
+        """Check a news item against the listing filters"""
+        if category is not None and news_data["category"] != category:
+            return False
+        if source is not None and news_data["source"] != source:
+            return False
+        if featured_only and not news_data["is_featured"]:
+            return False
+        return True
+
+    def _notify(self, news_data: NewsRecord) -> None:
+        self.version += 1
+        for listener in self._listeners:
+            listener(news_data)
+
+    def _indexes_for(self, news_data: Mapping) -> List[List[TimelineKey]]:
+        indexes = [
+            self._timeline,
+            self._by_category.setdefault(news_data["category"], []),
+            self._by_source.setdefault(news_data["source"], []),
+        ]
+        if news_data["is_featured"]:
+            indexes.append(self._featured)
+        return indexes
+
+    def _index(self, news_data: NewsRecord) -> None:
+        key = (self._published_us[news_data._row], news_data["id"])
+        self._keys[key[1]] = key
+        for index in self._indexes_for(news_data):
+            insort(index, key)
+
+    def _unindex(self, news_data: NewsRecord) -> None:
+        key = self._keys.pop(news_data["id"])
+        for index in self._indexes_for(news_data):
+            position = bisect_left(index, key)
+            if position < len(index) and index[position] == key:
+                del index[position]
+
+    # Column storage
+    def _read_content(self, row: int) -> str:
+        offset = self._content_offsets[row]
+        body = self._content[offset:offset + self._content_lengths[row]]
+        if self._flags[row] & _CONTENT_COMPRESSED:
+            body = zlib.decompress(body)
+        return body.decode()
+
+    def _write_row(self, news_data: Mapping, row: Optional[int] = None) -> NewsRecord:
+        """Encode a news item into the columns, appending a row unless one is given"""
+        news_id = news_data["id"]
+        if row is None:
+            row = self._rows.get(news_id)
+        content = news_data["content"].encode()
+        compressed = len(content) >= _COMPRESS_MIN_BYTES
+        if compressed:
+            content = zlib.compress(content)
+        published_at = news_data["published_at"]
+        created_at = news_data["created_at"]
+        updated_at = news_data.get("updated_at")
+        flags = (
+            (_FEATURED if news_data.get("is_featured") else 0)
+            | (_PUBLISHED_NAIVE if published_at.tzinfo is None else 0)
+            | (_CREATED_NAIVE if created_at.tzinfo is None else 0)
+            | (_UPDATED_NAIVE if updated_at is not None and updated_at.tzinfo is None else 0)
+            | (_CONTENT_COMPRESSED if compressed else 0)
+        )
+        values = (
+            news_data["title"],
+            news_data["description"],
+            news_data.get("image_url"),
+            news_data["source_url"],
+            sys.intern(news_data["author"]) if news_data.get("author") else None,
+            tuple(self._tags.code(tag) for tag in news_data.get("tags", ())),
+            self._sources.code(news_data["source"]),
+            self._categories.code(news_data["category"]),
+            news_data.get("read_time", 3),
+            flags,
+            news_data.get("view_count", 0),
+            to_epoch_us(published_at),
+            to_epoch_us(created_at),
+            _NO_TIMESTAMP if updated_at is None else to_epoch_us(updated_at),
+        )
+        columns = (
+            self._titles, self._descriptions, self._image_urls, self._source_urls,
+            self._authors, self._tag_codes, self._source_codes, self._category_codes,
+            self._read_times, self._flags, self._view_counts, self._published_us,
+            self._created_us, self._updated_us,
+        )
+
+        if row is None:
+            row = len(self._ids)
+            self._rows[news_id] = row
+            self._ids.append(news_id)
+            for column, value in zip(columns, values):
+                column.append(value)
+            self._content_offsets.append(len(self._content))
+            self._content_lengths.append(len(content))
+            self._content += content
+        else:
+            for column, value in zip(columns, values):
+                column[row] = value
+            offset = self._content_offsets[row]
+            if content != self._content[offset:offset + self._content_lengths[row]]:
+                self._content_garbage += self._content_lengths[row]
+                self._content_offsets[row] = len(self._content)
+                self._content_lengths[row] = len(content)
+                self._content += content
+                if self._content_garbage > len(self._content) * _BLOB_GARBAGE_RATIO:
+                    self._compact_content()
+
+        reports = news_data.get("also_reported_by")
+        if reports:
+            self._reports[row] = [dict(report) for report in reports]
+        else:
+            self._reports.pop(row, None)
+        return NewsRecord(self, row)
+
+    def _compact_rows(self, keep: List[int]) -> None:
+        """Rebuild every column with only the given rows, renumbering them in order"""
+        for name in _LIST_COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, [column[row] for row in keep])
+        for name in _ARRAY_COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, (column[row] for row in keep)))
+
+        content = bytearray()
+        offsets = array("Q")
+        for row in keep:
+            offset = self._content_offsets[row]
+            offsets.append(len(content))
+            content += self._content[offset:offset + self._content_lengths[row]]
+        self._content = content
+        self._content_offsets = offsets
+        self._content_lengths = array("L", (self._content_lengths[row] for row in keep))
+        self._content_garbage = 0
+
+        self._reports = {
+            new_row: self._reports[row] for new_row, row in enumerate(keep) if row in self._reports
+        }
+        self._rows = {news_id: row for row, news_id in enumerate(self._ids)}
+
+    def _compact_content(self) -> None:
+        """Rewrite the content buffer without the bodies replaced by updates"""
+        content = bytearray()
+        for row in range(len(self._ids)):
+            offset = self._content_offsets[row]
+            length = self._content_lengths[row]
+            self._content_offsets[row] = len(content)
+            content += self._content[offset:offset + length]
+        self._content = content
+        self._content_garbage = 0
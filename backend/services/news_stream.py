@@ -0,0 +1,196 @@
+"""
+Server-Sent Events broadcast hub for the Comrade backend
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Iterable, Optional, Set, Tuple
+
+# Renders the card payload pushed for a news item
+CardRenderer = Callable[[dict], bytes]
+
+HEARTBEAT = b": ping\n\n"
+
+
+def format_event(event_id: str, event: str, data: bytes) -> bytes:
+    """One SSE frame; data must be single-line JSON"""
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (event_id.encode(), event.encode(), data)
+
+
+class _Subscriber:
+    """Bounded outbox of encoded frames for one connected client"""
+
+    __slots__ = ("categories", "capacity", "frames", "wake", "closed")
+
+    def __init__(self, categories: Optional[Set[str]], capacity: int):
+        self.categories = categories
+        self.capacity = capacity
+        self.frames: Deque[bytes] = deque()
+        self.wake = asyncio.Event()
+        self.closed = False
+
+    def wants(self, category: str) -> bool:
+        return self.categories is None or category in self.categories
+
+    def push(self, frame: bytes) -> bool:
+        """Queue a frame; returns False if the client has fallen too far behind"""
+        if len(self.frames) >= self.capacity:
+            return False
+        self.frames.append(frame)
+        self.wake.set()
+        return True
+
+    def close(self) -> None:
+        self.frames.clear()
+        self.closed = True
+        self.wake.set()
+
+
+class NewsStreamHub:
+    """Fans news events out to SSE subscribers from one shared source
+
+    Each event is encoded once and the same bytes are queued for every
+    matching subscriber. Idle clients are only touched by the shared
+    heartbeat. A subscriber whose outbox fills up is disconnected; it
+    reconnects with Last-Event-ID and catches up from the ring buffer of
+    recent events, or receives a ``reset`` event if it fell out of it or
+    missed more events than its outbox holds.
+    Event IDs carry a per-process epoch so IDs from before a restart are
+    never mistaken for current ones.
+    """
+
+    def __init__(
+        self,
+        render: CardRenderer,
+        queue_size: int = 100,
+        buffer_size: int = 500,
+        heartbeat_interval: float = 15.0
+    ):
+        self.render = render
+        self.queue_size = queue_size
+        self.heartbeat_interval = heartbeat_interval
+        self._epoch = format(int(time.time() * 1000), "x")
+        self._sequence = 0
+        self._history: Deque[Tuple[int, str, bytes]] = deque(maxlen=buffer_size)
+        self._subscribers: Set[_Subscriber] = set()
+        self._known: Set[str] = set()
+        self._featured: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.dropped_subscribers = 0
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def prime(self, news_items: Iterable[dict]) -> None:
+        """Mark already stored news as seen without announcing it"""
+        for news_data in news_items:
+            self._known.add(news_data["id"])
+            if news_data["is_featured"]:
+                self._featured.add(news_data["id"])
+
+    def forget(self, news_data: dict) -> None:
+        """Stop tracking a news item that left the store (removal listener)"""
+        self._known.discard(news_data["id"])
+        self._featured.discard(news_data["id"])
+
+    def track(self, news_data: dict) -> None:
+        """Announce inserted and newly featured news (news store listener)"""
+        news_id = news_data["id"]
+        if news_id not in self._known:
+            self._known.add(news_id)
+            event = "article"
+        elif news_data["is_featured"] and news_id not in self._featured:
+            event = "featured"
+        else:
+            event = None
+
+        if news_data["is_featured"]:
+            self._featured.add(news_id)
+        else:
+            self._featured.discard(news_id)
+        if event is not None:
+            self.publish(event, news_data["category"], self.render(news_data))
+
+    def publish(self, event: str, category: str, data: bytes) -> None:
+        """Record an event in the ring buffer and queue it for matching subscribers"""
+        self._sequence += 1
+        frame = format_event(f"{self._epoch}-{self._sequence}", event, data)
+        self._history.append((self._sequence, category, frame))
+
+        for subscriber in list(self._subscribers):
+            if subscriber.wants(category) and not subscriber.push(frame):
+                self._drop(subscriber)
+
+    def subscribe(self, categories: Optional[Set[str]] = None, last_event_id: Optional[str] = None) -> _Subscriber:
+        """Register a client, queueing any events it missed since last_event_id"""
+        subscriber = _Subscriber(categories, self.queue_size)
+        if last_event_id:
+            resumed = self._replay(last_event_id)
+            missed = [frame for _, category, frame in resumed if subscriber.wants(category)] if resumed else []
+            # A backlog that fills the outbox would get the client dropped again on the next publish
+            if resumed is None or len(missed) >= self.queue_size:
+                subscriber.frames.append(format_event(
+                    f"{self._epoch}-{self._sequence}", "reset", b"{}"
+                ))
+            else:
+                subscriber.frames.extend(missed)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    async def frames(self, subscriber: _Subscriber, retry_ms: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Yield a subscriber's frames until it is dropped or disconnects"""
+        try:
+            if retry_ms is not None:
+                yield b"retry: %d\n\n" % retry_ms
+            while True:
+                while subscriber.frames:
+                    yield subscriber.frames.popleft()
+                if subscriber.closed:
+                    return
+                subscriber.wake.clear()
+                await subscriber.wake.wait()
+        finally:
+            self._subscribers.discard(subscriber)
+
+    def start(self) -> None:
+        """Start the shared heartbeat task on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the heartbeat and end every open stream"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for subscriber in list(self._subscribers):
+            subscriber.close()
+        self._subscribers.clear()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            # Clients with frames waiting already have traffic on the wire
+            for subscriber in self._subscribers:
+                if not subscriber.frames:
+                    subscriber.push(HEARTBEAT)
+
+    def _replay(self, last_event_id: str) -> Optional[list]:
+        """Events after last_event_id, or None if they are no longer all buffered"""
+        epoch, _, sequence = last_event_id.partition("-")
+        if epoch != self._epoch or not sequence.isdigit():
+            return None
+        sequence = int(sequence)
+        oldest = self._history[0][0] if self._history else self._sequence + 1
+        if sequence > self._sequence or sequence < oldest - 1:
+            return None
+        return [entry for entry in self._history if entry[0] > sequence]
+
+    def _drop(self, subscriber: _Subscriber) -> None:
+        subscriber.close()
+        self._subscribers.discard(subscriber)
+        self.dropped_subscribers += 1
@@ -0,0 +1,119 @@
+"""
+Assembled quiz cache for the Comrade backend
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from config import settings
+from models.quiz import QuestionResponse, QuestionWithAnswer, QuizResponse, QuizWithQuestions
+from services.grading import AnswerKey
+from services.repository import Repository
+from services.versioning import VersionMap
+
+
+def get_question_response(question_data: dict, include_answers: bool = False) -> QuestionResponse:
+    """Convert question data to response format"""
+    if include_answers:
+        return QuestionWithAnswer(
+            id=question_data["id"],
+            question_text=question_data["question_text"],
+            question_type=question_data["question_type"],
+            difficulty=question_data["difficulty"],
+            tags=question_data["tags"],
+            points=question_data["points"],
+            explanation=question_data.get("explanation"),
+            options=question_data["question_data"].get("options"),
+            correct_answer_index=question_data["question_data"].get("correct_answer_index"),
+            correct_answer=question_data["question_data"].get("correct_answer"),
+            correct_answers=question_data["question_data"].get("correct_answers")
+        )
+    else:
+        return QuestionResponse(
+            id=question_data["id"],
+            question_text=question_data["question_text"],
+            question_type=question_data["question_type"],
+            difficulty=question_data["difficulty"],
+            tags=question_data["tags"],
+            points=question_data["points"],
+            options=question_data["question_data"].get("options")
+        )
+
+
+class CachedQuiz:
+    """A quiz with its ordered questions and the response models built from them"""
+
+    def __init__(self, quiz_data: dict, questions: List[dict]):
+        self.quiz_data = quiz_data
+        self.questions = questions
+        self.questions_by_id = {question_data["id"]: question_data for question_data in questions}
+        self.quiz = QuizResponse(**quiz_data)
+        self.with_questions = QuizWithQuestions(
+            **self.quiz.model_dump(),
+            questions=[get_question_response(question_data) for question_data in questions]
+        )
+        self.with_questions_json = self.with_questions.model_dump_json().encode()
+        self.answer_key: List[QuestionWithAnswer] = [
+            get_question_response(question_data, include_answers=True) for question_data in questions
+        ]
+        self.grading_key = AnswerKey(
+            questions,
+            normalize_unicode=settings.quiz_answer_unicode_normalization,
+            collapse_whitespace=settings.quiz_answer_collapse_whitespace
+        )
+
+
+class QuizCache:
+    """Per-quiz assembled payloads, loaded from the repository on first use
+
+    Each entry holds the quiz, its questions in quiz order, the
+    QuizWithQuestions / answer key models and the compiled grading key, so
+    opening, submitting and reviewing a quiz never re-reads or re-validates
+    its questions. Edits must go through invalidate(), which also bumps the
+    quiz version used in ETags.
+    """
+
+    def __init__(self, repository: Repository):
+        self.repository = repository
+        self.versions = VersionMap()  # quiz_id -> bumped on quiz or question edits
+        self._quizzes: Dict[str, CachedQuiz] = {}
+        self._question_quizzes: Dict[str, str] = {}  # question_id -> cached quiz holding it
+
+    def __len__(self) -> int:
+        return len(self._quizzes)
+
+    async def get(self, quiz_id: str) -> Optional[CachedQuiz]:
+        """Cached quiz, loading and assembling it on a miss"""
+        cached = self._quizzes.get(quiz_id)
+        if cached is not None:
+            return cached
+
+        version = self.versions.get(quiz_id)
+        quiz_data = await self.repository.get_quiz(quiz_id)
+        if quiz_data is None:
+            return None
+        cached = CachedQuiz(quiz_data, await self.repository.list_questions(quiz_id))
+        # An edit landed while loading; serve this copy but do not keep it
+        if self.versions.get(quiz_id) == version:
+            self._quizzes[quiz_id] = cached
+            for question_id in cached.questions_by_id:
+                self._question_quizzes[question_id] = quiz_id
+        return cached
+
+    def invalidate(self, quiz_id: Optional[str]) -> None:
+        """Drop a quiz after it or one of its questions changed"""
+        if quiz_id is None:
+            return
+        self.versions.bump(quiz_id)
+        cached = self._quizzes.pop(quiz_id, None)
+        if cached is not None:
+            for question_id in cached.questions_by_id:
+                self._question_quizzes.pop(question_id, None)
+
+    def invalidate_questions(self, questions: Iterable[dict]) -> None:
+        """Drop the quizzes a set of edited questions belongs (or belonged) to"""
+        quiz_ids = set()
+        for question_data in questions:
+            quiz_ids.add(question_data.get("quiz_id"))
+            quiz_ids.add(self._question_quizzes.get(question_data["id"]))
+        for quiz_id in quiz_ids:
+            self.invalidate(quiz_id)
@@ -0,0 +1,275 @@
+"""
+Daily quiz generation from the day's news for the Comrade backend
+"""
+
+import asyncio
+import random
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from models.news import NewsCategory
+from models.quiz import DifficultyLevel, QuestionType
+from services.enrichment import _init_worker, _split_sentences
+
+BLANK = "_____"
+MIN_SENTENCE_WORDS = 8
+MAX_SENTENCE_WORDS = 40
+MAX_SENTENCE_CHARS = 400
+MAX_CLOZES_PER_ARTICLE = 3
+DISTRACTORS = 3
+
+# Runs of capitalized words, optionally joined by lowercase connectors ("Line of Actual Control")
+_ENTITY_RE = re.compile(
+    r"\b(?:[A-Z][A-Za-z]+|[A-Z]{2,})(?:(?:\s+(?:of|the|and|for|de))*\s+(?:[A-Z][A-Za-z]+|[A-Z]{2,}))*\b"
+)
+_NUMBER_RE = re.compile(r"\b(?:1[89]\d\d|20\d\d|\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)\b")
+_WORD_RE = re.compile(r"\S+")
+# Capitalized only because they start a sentence or a title, never part of a name
+_LEADING_WORDS = frozenset(
+    "a an and as at but by for from he her his in it its of on our she the their these they "
+    "this those to we with".split()
+)
+
+# Question type, points and difficulty per slot, cycled over the generated questions
+QUESTION_PLAN = [
+    (QuestionType.MULTIPLE_CHOICE, 2, DifficultyLevel.MEDIUM),
+    (QuestionType.TRUE_FALSE, 1, DifficultyLevel.EASY),
+    (QuestionType.FILL_IN_BLANK, 2, DifficultyLevel.HARD),
+]
+
+
+class Cloze(NamedTuple):
+    """A sentence with one entity that can be blanked out"""
+    sentence: str
+    answer: str
+    start: int  # offset of the answer in the sentence
+
+
+class ArticleFacts(NamedTuple):
+    """Quiz material extracted from one article"""
+    news_id: str
+    category: str
+    title: str
+    clozes: List[Cloze]  # best first
+    entities: List[str]  # every entity seen in the article, for distractors
+
+
+def entity_shape(text: str) -> str:
+    """Coarse entity kind, so distractors look like the answer"""
+    if _NUMBER_RE.fullmatch(text):
+        return "year" if len(text) == 4 and text.isdigit() else "number"
+    return "acronym" if text.isupper() else "name"
+
+
+def find_entities(sentence: str) -> List[Tuple[int, str]]:
+    """(offset, text) of named-entity-like spans and numbers in a sentence"""
+    spans = []
+    for match in _ENTITY_RE.finditer(sentence):
+        text = match.group()
+        start = match.start()
+        # Sentence-initial and connector words are capitalized without being names
+        words = text.split()
+        while words and words[0].lower() in _LEADING_WORDS:
+            start += len(words[0]) + 1
+            words = words[1:]
+        if not words:
+            continue
+        text = " ".join(words)
+        if start == 0 and len(words) == 1 and not text.isupper():
+            continue
+        if len(text) >= 3:
+            spans.append((start, text))
+    spans.extend((match.start(), match.group()) for match in _NUMBER_RE.finditer(sentence))
+    return spans
+
+
+def extract_facts(news_id: str, category: str, title: str, content: str) -> ArticleFacts:
+    """Pick cloze candidates and collect entities from one article"""
+    clozes = []
+    entities: Dict[str, None] = {}
+    for sentence in _split_sentences(content):
+        sentence = " ".join(sentence.split())
+        spans = find_entities(sentence)
+        for _, text in spans:
+            entities[text] = None
+
+        word_count = len(_WORD_RE.findall(sentence))
+        if sentence.endswith("?") or len(sentence) > MAX_SENTENCE_CHARS:
+            continue
+        if not MIN_SENTENCE_WORDS <= word_count <= MAX_SENTENCE_WORDS:
+            continue
+        # Blank the longest entity that occurs once, so the cloze has a single reading
+        unique = [(start, text) for start, text in spans if sentence.count(text) == 1]
+        if unique:
+            start, text = max(unique, key=lambda span: (len(span[1]), -span[0]))
+            clozes.append(Cloze(sentence, text, start))
+        if len(clozes) >= MAX_CLOZES_PER_ARTICLE:
+            break
+    return ArticleFacts(news_id, category, title, clozes, list(entities))
+
+
+def extract_batch(articles: List[Tuple[str, str, str, str]]) -> List[ArticleFacts]:
+    """Extract quiz material from (id, category, title, content) tuples; runs inside a worker process"""
+    return [extract_facts(*article) for article in articles]
+
+
+class DistractorPool:
+    """Entities of the day grouped by news category and shape"""
+
+    def __init__(self, facts: List[ArticleFacts]):
+        self._by_category: Dict[Tuple[str, str], List[str]] = {}
+        self._by_shape: Dict[str, List[str]] = {}
+        for article in facts:
+            for entity in article.entities:
+                shape = entity_shape(entity)
+                self._by_category.setdefault((article.category, shape), []).append(entity)
+                self._by_shape.setdefault(shape, []).append(entity)
+        # Sorted so generation is reproducible for a given day
+        for pool in (self._by_category, self._by_shape):
+            for key, entities in pool.items():
+                pool[key] = sorted(set(entities))
+
+    def draw(self, answer: str, category: str, count: int, rng: random.Random) -> List[str]:
+        """Up to count distractors for an answer, same-category entities first"""
+        shape = entity_shape(answer)
+        folded = answer.casefold()
+        chosen: List[str] = []
+        for candidates in (self._by_category.get((category, shape), []), self._by_shape.get(shape, [])):
+            usable = [
+                entity for entity in candidates
+                if folded not in entity.casefold() and entity.casefold() not in folded and entity not in chosen
+            ]
+            chosen.extend(rng.sample(usable, min(count - len(chosen), len(usable))))
+            if len(chosen) >= count:
+                break
+        return chosen
+
+
+def build_questions(
+    quiz_id: str,
+    facts: List[ArticleFacts],
+    count: int,
+    seed: int,
+    created_at: datetime
+) -> List[dict]:
+    """Question records for a quiz, one cloze per article per round until count is reached"""
+    rng = random.Random(seed)
+    pool = DistractorPool(facts)
+    picks: List[Tuple[ArticleFacts, Cloze]] = []
+    for round_index in range(MAX_CLOZES_PER_ARTICLE):
+        for article in facts:
+            if len(picks) < count and round_index < len(article.clozes):
+                picks.append((article, article.clozes[round_index]))
+
+    questions = []
+    for position, (article, cloze) in enumerate(picks):
+        question_type, points, difficulty = QUESTION_PLAN[position % len(QUESTION_PLAN)]
+        blanked = cloze.sentence[:cloze.start] + BLANK + cloze.sentence[cloze.start + len(cloze.answer):]
+        distractors = pool.draw(cloze.answer, article.category, DISTRACTORS, rng)
+
+        if question_type == QuestionType.MULTIPLE_CHOICE and len(distractors) < DISTRACTORS:
+            question_type, points, difficulty = QUESTION_PLAN[2]
+        if question_type == QuestionType.TRUE_FALSE and not distractors:
+            question_type, points, difficulty = QUESTION_PLAN[2]
+
+        if question_type == QuestionType.MULTIPLE_CHOICE:
+            options = [cloze.answer, *distractors]
+            rng.shuffle(options)
+            question_text = blanked
+            question_data = {"options": options, "correct_answer_index": options.index(cloze.answer)}
+        elif question_type == QuestionType.TRUE_FALSE:
+            is_true = rng.random() < 0.5
+            question_text = cloze.sentence if is_true else blanked.replace(BLANK, distractors[0], 1)
+            question_data = {"correct_answer": is_true}
+        else:
+            question_text = blanked
+            question_data = {"correct_answers": [cloze.answer]}
+
+        questions.append({
+            "id": f"{quiz_id}_q{position + 1}",
+            "question_text": question_text,
+            "question_type": question_type,
+            "difficulty": difficulty,
+            "explanation": f"{cloze.sentence} (from \"{article.title}\")",
+            "tags": [article.category],
+            "points": points,
+            "quiz_id": quiz_id,
+            "created_at": created_at,
+            "question_data": question_data
+        })
+    return questions
+
+
+def build_daily_quiz(
+    quiz_id: str,
+    quiz_date: date,
+    facts: List[ArticleFacts],
+    question_count: int,
+    created_at: datetime
+) -> Tuple[dict, List[dict]]:
+    """Quiz record and questions for one date; generation is deterministic per date"""
+    questions = build_questions(quiz_id, facts, question_count, quiz_date.toordinal(), created_at)
+    categories = sorted({question["tags"][0] for question in questions})
+    quiz_data = {
+        "id": quiz_id,
+        "title": f"Daily Defense Quiz - {quiz_date:%d %b %Y}",
+        "description": "Questions generated from the previous day's defense news",
+        "time_limit": 15,
+        "passing_score": 60,
+        "is_daily": True,
+        "is_active": True,
+        "tags": ["daily", *categories],
+        "created_by": "system",
+        "created_at": created_at,
+        "updated_at": None,
+        "total_questions": len(questions),
+        "total_points": sum(question["points"] for question in questions)
+    }
+    return quiz_data, questions
+
+
+class QuizGenerator:
+    """Runs quiz material extraction in a process pool
+
+    Sentence splitting and entity extraction happen in worker processes,
+    which load the NLTK sentence splitter once like the enrichment workers.
+    Question assembly is cheap and happens in the caller.
+    """
+
+    def __init__(self, workers: int = 1, batch_size: int = 16):
+        self.batch_size = batch_size
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def extract(self, news_items: List[dict]) -> List[ArticleFacts]:
+        """Quiz material for each article, in input order"""
+        articles = [
+            (news_data["id"], NewsCategory(news_data["category"]).value, news_data["title"], news_data["content"])
+            for news_data in news_items
+        ]
+        if not articles:
+            return []
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, extract_batch, articles[start:start + self.batch_size])
+            for start in range(0, len(articles), self.batch_size)
+        ))
+        return [facts for batch in results for facts in batch]
+
+    async def generate(
+        self,
+        quiz_id: str,
+        quiz_date: date,
+        news_items: List[dict],
+        question_count: int
+    ) -> Optional[Tuple[dict, List[dict]]]:
+        """Quiz record and questions built from news items, or None if there is too little material"""
+        facts = [article for article in await self.extract(news_items) if article.clozes]
+        if not facts:
+            return None
+        return build_daily_quiz(quiz_id, quiz_date, facts, question_count, datetime.now())
@@ -0,0 +1,221 @@
+"""
+TF-IDF related article recommendations for the Comrade backend
+"""
+
+import hashlib
+import math
+from itertools import islice
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from services.enrichment import STOPWORDS
+from services.search_index import tokenize
+
+# Term frequency weight per field; tags are prefixed so they never collide with words
+FIELD_WEIGHTS = {
+    "title": 2.0,
+    "description": 1.0,
+    "content": 1.0,
+}
+TAG_WEIGHT = 2.0
+
+MIN_SIMILARITY = 0.05
+BATCH_ROWS = 256
+
+
+def _text_key(news_data: dict) -> str:
+    parts = [news_data[field] for field in FIELD_WEIGHTS] + list(news_data.get("tags", []))
+    return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).hexdigest()
+
+
+def term_weights(news_data: dict) -> Dict[str, float]:
+    """Sublinear, field-weighted term frequencies of an article"""
+    weights: Dict[str, float] = {}
+    for field, field_weight in FIELD_WEIGHTS.items():
+        counts: Dict[str, int] = {}
+        for token in tokenize(news_data[field]):
+            if len(token) > 2 and token not in STOPWORDS:
+                counts[token] = counts.get(token, 0) + 1
+        for token, count in counts.items():
+            weights[token] = weights.get(token, 0.0) + field_weight * (1 + math.log(count))
+    for tag in news_data.get("tags", []):
+        weights["tag:" + " ".join(tokenize(tag))] = TAG_WEIGHT
+    return weights
+
+
+class RelatedArticles:
+    """Top-k cosine neighbours over a sparse TF-IDF matrix
+
+    Rows hold raw term weights; IDF is applied at scoring time, so new
+    articles only append rows. Each refresh scores the pending articles
+    against the whole matrix in sparse batches, stores their top-k lists and
+    pushes them into the lists of existing articles they now beat. Scores
+    already stored are not recomputed when IDF drifts.
+    """
+
+    def __init__(self, neighbours: int = 10):
+        self.neighbours = neighbours
+        self.version = 0
+        self._vocabulary: Dict[str, int] = {}
+        self._df = np.zeros(0, dtype=np.int64)
+        self._matrix = sparse.csr_matrix((0, 0), dtype=np.float64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._floor = np.zeros(0, dtype=np.float64)
+        self._row_ids: List[str] = []
+        self._rows: Dict[str, int] = {}  # news ID -> live row
+        self._text_keys: Dict[str, str] = {}
+        self._pending: Dict[str, dict] = {}
+        self._related: Dict[str, List[Tuple[str, float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def track(self, news_data: dict) -> None:
+        """Queue a new or re-worded article for the next refresh (news store listener)"""
+        if self._text_keys.get(news_data["id"]) != _text_key(news_data):
+            self._pending[news_data["id"]] = news_data
+
+    def discard(self, news_data: dict) -> None:
+        """Drop an article that left the news store (removal listener)"""
+        news_id = news_data["id"]
+        self._pending.pop(news_id, None)
+        self._text_keys.pop(news_id, None)
+        self._related.pop(news_id, None)
+        self._retire(news_id)
+        if len(self._row_ids) > 2 * max(len(self._rows), BATCH_ROWS):
+            self._compact()
+
+    def related(self, news_id: str, limit: int = 10) -> List[str]:
+        """IDs of the most similar articles, best first"""
+        if self._pending:
+            self.refresh()
+        # Lists may still name discarded articles until they are pushed out
+        related_ids = (related_id for related_id, _ in self._related.get(news_id, ()) if related_id in self._rows)
+        return list(islice(related_ids, limit))
+
+    def refresh(self) -> None:
+        """Add pending articles to the matrix and update neighbour lists"""
+        if not self._pending:
+            return
+        pending = list(self._pending.values())
+        self._pending.clear()
+
+        for news_data in pending:
+            self._retire(news_data["id"])
+        first_row = len(self._row_ids)
+        new_rows = self._build_rows(pending)
+        self._matrix = sparse.vstack([self._resized(), new_rows], format="csr")
+        self._alive = np.concatenate([self._alive, np.ones(len(pending), dtype=bool)])
+        self._floor = np.concatenate([self._floor, np.full(len(pending), MIN_SIMILARITY)])
+
+        # IDF and row norms under the current document frequencies, O(nnz)
+        documents = max(int(self._alive.sum()), 1)
+        idf = np.log((1 + documents) / (1 + self._df)) + 1.0
+        idf_squared = idf ** 2
+        norms = np.sqrt(self._matrix.multiply(self._matrix) @ idf_squared)
+        inverse_norms = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        inverse_norms[~self._alive] = 0.0
+        normalized = sparse.diags(inverse_norms) @ self._matrix
+        columns = normalized.T.tocsr()
+
+        for start in range(first_row, len(self._row_ids), BATCH_ROWS):
+            rows = range(start, min(start + BATCH_ROWS, len(self._row_ids)))
+            scores = (normalized[rows.start:rows.stop].multiply(idf_squared).tocsr() @ columns).tocsr()
+            for offset, row in enumerate(rows):
+                start, end = scores.indptr[offset], scores.indptr[offset + 1]
+                self._update_row(row, scores.indices[start:end], scores.data[start:end], first_row)
+        self.version += 1
+
+    def _build_rows(self, news_items: List[dict]) -> sparse.csr_matrix:
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for news_data in news_items:
+            for term, weight in term_weights(news_data).items():
+                column = self._vocabulary.get(term)
+                if column is None:
+                    column = self._vocabulary[term] = len(self._vocabulary)
+                indices.append(column)
+                data.append(weight)
+            indptr.append(len(indices))
+
+            news_id = news_data["id"]
+            self._rows[news_id] = len(self._row_ids)
+            self._row_ids.append(news_id)
+            self._text_keys[news_id] = _text_key(news_data)
+
+        if len(self._vocabulary) > len(self._df):
+            self._df = np.concatenate(
+                [self._df, np.zeros(len(self._vocabulary) - len(self._df), dtype=np.int64)]
+            )
+        indices_array = np.asarray(indices, dtype=np.int64)
+        np.add.at(self._df, indices_array, 1)
+        return sparse.csr_matrix(
+            (np.asarray(data), indices_array, np.asarray(indptr)),
+            shape=(len(news_items), len(self._vocabulary))
+        )
+
+    def _resized(self) -> sparse.csr_matrix:
+        matrix = self._matrix
+        vocabulary_size = len(self._vocabulary)
+        if matrix.shape[1] != vocabulary_size:
+            matrix = sparse.csr_matrix(
+                (matrix.data, matrix.indices, matrix.indptr),
+                shape=(matrix.shape[0], vocabulary_size)
+            )
+        return matrix
+
+    def _retire(self, news_id: str) -> None:
+        """Drop the old row of a re-worded article from document frequencies"""
+        row = self._rows.pop(news_id, None)
+        if row is None:
+            return
+        self._alive[row] = False
+        self._floor[row] = np.inf
+        start, end = self._matrix.indptr[row], self._matrix.indptr[row + 1]
+        np.subtract.at(self._df, self._matrix.indices[start:end], 1)
+
+    def _compact(self) -> None:
+        """Rebuild the matrix without retired rows and unused terms"""
+        alive_rows = np.flatnonzero(self._alive)
+        alive_terms = np.flatnonzero(self._df > 0)
+        self._matrix = self._resized()[alive_rows][:, alive_terms].tocsr()
+        self._df = self._df[alive_terms]
+        terms = list(self._vocabulary)
+        self._vocabulary = {terms[column]: position for position, column in enumerate(alive_terms)}
+        self._alive = self._alive[alive_rows]
+        self._floor = self._floor[alive_rows]
+        self._row_ids = [self._row_ids[row] for row in alive_rows]
+        self._rows = {news_id: row for row, news_id in enumerate(self._row_ids)}
+
+    def _update_row(self, row: int, candidates: np.ndarray, values: np.ndarray, first_new_row: int) -> None:
+        news_id = self._row_ids[row]
+        keep = (candidates != row) & (values >= MIN_SIMILARITY)
+        candidates, values = candidates[keep], values[keep]
+
+        if len(values) > self.neighbours:
+            top = np.argpartition(-values, self.neighbours)[:self.neighbours]
+            top = top[np.argsort(-values[top], kind="stable")]
+        else:
+            top = np.argsort(-values, kind="stable")
+        self._set_related(row, [(self._row_ids[candidates[i]], float(values[i])) for i in top])
+
+        # Offer this article to older articles whose k-th neighbour it beats;
+        # articles of the same refresh already scored against it
+        beats = (candidates < first_new_row) & (values > self._floor[candidates])
+        for candidate, value in zip(candidates[beats], values[beats]):
+            self._offer(int(candidate), news_id, float(value))
+
+    def _offer(self, row: int, related_id: str, score: float) -> None:
+        news_id = self._row_ids[row]
+        neighbours = [entry for entry in self._related.get(news_id, ()) if entry[0] != related_id]
+        neighbours.append((related_id, score))
+        neighbours.sort(key=lambda entry: entry[1], reverse=True)
+        self._set_related(row, neighbours[:self.neighbours])
+
+    def _set_related(self, row: int, neighbours: List[Tuple[str, float]]) -> None:
+        self._related[self._row_ids[row]] = neighbours
+        # Score a newcomer must beat to enter the list
+        self._floor[row] = neighbours[-1][1] if len(neighbours) >= self.neighbours else MIN_SIMILARITY
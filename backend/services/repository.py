@@ -0,0 +1,808 @@
+"""
+Persistent repository layer for the Comrade backend
+"""
+
+import asyncio
+import logging
+import sqlite3
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, TypeVar
+
+from pydantic_core import from_json, to_json
+
+from config import settings
+from services.news_store import NewsStore, to_epoch_us
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Fields restored to datetime objects when rows are decoded
+NEWS_DATETIMES = ("published_at", "created_at", "updated_at")
+USER_DATETIMES = ("created_at", "last_login_at")
+TOKEN_DATETIMES = ("expires_at",)
+QUIZ_DATETIMES = ("created_at", "updated_at")
+QUESTION_DATETIMES = ("created_at", "updated_at")
+RESULT_DATETIMES = ("submitted_at",)
+
+
+def encode(data: dict) -> str:
+    """Serialize a stored dict (datetimes, enums and models included) to JSON"""
+    return to_json(data).decode()
+
+
+def decode(payload: str, datetime_fields: Sequence[str]) -> dict:
+    """Parse a stored JSON payload, restoring its datetime fields"""
+    data = from_json(payload)
+    for field in datetime_fields:
+        if data.get(field) is not None:
+            data[field] = datetime.fromisoformat(data[field])
+    return data
+
+
+class Repository(ABC):
+    """Storage used by the routers; every method is a coroutine except the queue_* ones"""
+
+    async def connect(self) -> None:
+        """Open connections and create the schema"""
+
+    async def close(self) -> None:
+        """Flush pending writes and release connections"""
+
+    def attach_news_store(self, news_store: NewsStore) -> None:
+        """Hand the backend the in-process news store (backends that persist news ignore it)"""
+
+    # Users and tokens
+    @abstractmethod
+    async def get_user(self, user_id: str) -> Optional[dict]:
+        """User by ID"""
+
+    @abstractmethod
+    async def get_users(self, user_ids: Iterable[str]) -> Dict[str, dict]:
+        """Users by ID, keyed by ID; unknown IDs are left out"""
+
+    @abstractmethod
+    async def find_user(self, email: Optional[str] = None, phone_number: Optional[str] = None) -> Optional[dict]:
+        """User with the given email or phone number"""
+
+    @abstractmethod
+    async def count_users(self) -> int:
+        """Number of registered users"""
+
+    @abstractmethod
+    def queue_user_stats(self, user_id: str, stats: dict) -> None:
+        """Persist a user's stats in the background; user reads see them immediately"""
+
+    @abstractmethod
+    async def save_user(self, user: dict) -> None:
+        """Insert or replace a user"""
+
+    @abstractmethod
+    async def get_token(self, token: str) -> Optional[dict]:
+        """Access token data"""
+
+    @abstractmethod
+    async def save_token(self, token: str, token_data: dict) -> None:
+        """Store an access token"""
+
+    @abstractmethod
+    async def delete_token(self, token: str) -> None:
+        """Revoke an access token"""
+
+    # News and bookmarks
+    @abstractmethod
+    async def load_news(self, since: Optional[datetime] = None) -> List[dict]:
+        """Stored news items published at or after since (all when None), oldest first"""
+
+    @abstractmethod
+    async def list_news_ids(self, before: datetime) -> List[str]:
+        """IDs of stored news items published before a time"""
+
+    @abstractmethod
+    async def get_news(self, news_ids: Iterable[str]) -> List[dict]:
+        """Stored news items with the given IDs; unknown IDs are left out"""
+
+    @abstractmethod
+    async def save_news(self, news_items: List[dict]) -> None:
+        """Insert or replace news items"""
+
+    @abstractmethod
+    def queue_news(self, news_data: dict) -> None:
+        """Persist a news item in the background (news store listener)"""
+
+    @abstractmethod
+    async def load_bookmarks(self) -> Dict[str, Set[str]]:
+        """Bookmarked news IDs per user"""
+
+    @abstractmethod
+    async def add_bookmark(self, user_id: str, news_id: str) -> None:
+        """Bookmark a news item for a user"""
+
+    @abstractmethod
+    async def remove_bookmark(self, user_id: str, news_id: str) -> None:
+        """Remove a user's bookmark"""
+
+    # Quizzes, questions and results
+    @abstractmethod
+    async def get_quiz(self, quiz_id: str) -> Optional[dict]:
+        """Quiz by ID"""
+
+    @abstractmethod
+    async def find_daily_quiz(self) -> Optional[dict]:
+        """Earliest created daily quiz"""
+
+    @abstractmethod
+    async def save_quiz(self, quiz: dict) -> None:
+        """Insert or replace a quiz"""
+
+    @abstractmethod
+    async def get_question(self, question_id: str) -> Optional[dict]:
+        """Question by ID"""
+
+    @abstractmethod
+    async def list_questions(self, quiz_id: str) -> List[dict]:
+        """Questions of a quiz in insertion order"""
+
+    @abstractmethod
+    async def save_questions(self, questions: List[dict]) -> None:
+        """Insert or replace questions"""
+
+    @abstractmethod
+    async def get_result(self, result_key: str) -> Optional[dict]:
+        """Quiz result by result key"""
+
+    @abstractmethod
+    async def list_results(self, user_id: str, limit: int) -> List[dict]:
+        """A user's quiz results, newest first"""
+
+    @abstractmethod
+    async def load_results(self, since: datetime) -> List[dict]:
+        """Quiz results submitted at or after a time"""
+
+    @abstractmethod
+    async def count_results(self) -> int:
+        """Number of stored quiz results"""
+
+    @abstractmethod
+    async def save_result(self, result_key: str, result: dict) -> None:
+        """Store a quiz result and wait until it is written"""
+
+    @abstractmethod
+    def queue_result(self, result_key: str, result: dict) -> None:
+        """Persist a quiz result in the background; get_result sees it immediately"""
+
+
+class MemoryRepository(Repository):
+    """Dict-backed repository; state lives and dies with the process
+
+    News is not copied: the attached NewsStore already holds every article
+    in its compact columns, so news reads are served from it and queued
+    writes have nothing left to do.
+    """
+
+    def __init__(self):
+        self.news_store: Optional[NewsStore] = None
+        self.users: Dict[str, dict] = {}
+        self.tokens: Dict[str, dict] = {}
+        self.bookmarks: Dict[str, Set[str]] = {}
+        self.quizzes: Dict[str, dict] = {}
+        self.questions: Dict[str, dict] = {}
+        self.quiz_questions: Dict[Optional[str], List[str]] = {}  # quiz_id -> question IDs in insertion order
+        self.results: Dict[str, dict] = {}
+        self.user_results: Dict[str, List[Tuple[int, str]]] = {}  # user_id -> (submitted_at_us, result_key), oldest first
+
+    async def get_user(self, user_id: str) -> Optional[dict]:
+        return self.users.get(user_id)
+
+    async def get_users(self, user_ids: Iterable[str]) -> Dict[str, dict]:
+        return {user_id: self.users[user_id] for user_id in user_ids if user_id in self.users}
+
+    async def find_user(self, email: Optional[str] = None, phone_number: Optional[str] = None) -> Optional[dict]:
+        for user in self.users.values():
+            if (email and user.get("email") == email) or \
+               (phone_number and user.get("phone_number") == phone_number):
+                return user
+        return None
+
+    async def count_users(self) -> int:
+        return len(self.users)
+
+    def queue_user_stats(self, user_id: str, stats: dict) -> None:
+        user = self.users.get(user_id)
+        if user is not None:
+            user["stats"] = stats
+
+    async def save_user(self, user: dict) -> None:
+        self.users[user["id"]] = user
+
+    async def get_token(self, token: str) -> Optional[dict]:
+        return self.tokens.get(token)
+
+    async def save_token(self, token: str, token_data: dict) -> None:
+        self.tokens[token] = token_data
+
+    async def delete_token(self, token: str) -> None:
+        self.tokens.pop(token, None)
+
+    def attach_news_store(self, news_store: NewsStore) -> None:
+        self.news_store = news_store
+
+    async def load_news(self, since: Optional[datetime] = None) -> List[dict]:
+        if self.news_store is None:
+            return []
+        news_items = self.news_store.iter_published_between(since, None)
+        return [dict(news_data) for news_data in reversed(list(news_items))]
+
+    async def list_news_ids(self, before: datetime) -> List[str]:
+        if self.news_store is None:
+            return []
+        return [news_data["id"] for news_data in self.news_store.iter_published_between(None, before)]
+
+    async def get_news(self, news_ids: Iterable[str]) -> List[dict]:
+        if self.news_store is None:
+            return []
+        return [dict(news_data) for news_data in map(self.news_store.get, news_ids) if news_data is not None]
+
+    async def save_news(self, news_items: List[dict]) -> None:
+        if self.news_store is not None:
+            self.news_store.add_many(news_items)
+
+    def queue_news(self, news_data: dict) -> None:
+        # Called by the attached store itself, which already holds the article
+        pass
+
+    async def load_bookmarks(self) -> Dict[str, Set[str]]:
+        return {user_id: set(news_ids) for user_id, news_ids in self.bookmarks.items()}
+
+    async def add_bookmark(self, user_id: str, news_id: str) -> None:
+        self.bookmarks.setdefault(user_id, set()).add(news_id)
+
+    async def remove_bookmark(self, user_id: str, news_id: str) -> None:
+        self.bookmarks.get(user_id, set()).discard(news_id)
+
+    async def get_quiz(self, quiz_id: str) -> Optional[dict]:
+        return self.quizzes.get(quiz_id)
+
+    async def find_daily_quiz(self) -> Optional[dict]:
+        for quiz in self.quizzes.values():
+            if quiz["is_daily"]:
+                return quiz
+        return None
+
+    async def save_quiz(self, quiz: dict) -> None:
+        self.quizzes[quiz["id"]] = quiz
+
+    async def get_question(self, question_id: str) -> Optional[dict]:
+        return self.questions.get(question_id)
+
+    async def list_questions(self, quiz_id: str) -> List[dict]:
+        return [self.questions[question_id] for question_id in self.quiz_questions.get(quiz_id, ())]
+
+    async def save_questions(self, questions: List[dict]) -> None:
+        for question in questions:
+            previous = self.questions.get(question["id"])
+            if previous is None or previous["quiz_id"] != question["quiz_id"]:
+                if previous is not None:
+                    self.quiz_questions[previous["quiz_id"]].remove(question["id"])
+                self.quiz_questions.setdefault(question["quiz_id"], []).append(question["id"])
+            self.questions[question["id"]] = question
+
+    async def get_result(self, result_key: str) -> Optional[dict]:
+        return self.results.get(result_key)
+
+    async def list_results(self, user_id: str, limit: int) -> List[dict]:
+        entries = self.user_results.get(user_id, ())
+        return [self.results[result_key] for _, result_key in reversed(entries[-limit:])] if limit > 0 else []
+
+    async def load_results(self, since: datetime) -> List[dict]:
+        since_us = to_epoch_us(since)
+        return [result for result in self.results.values() if to_epoch_us(result["submitted_at"]) >= since_us]
+
+    async def count_results(self) -> int:
+        return len(self.results)
+
+    async def save_result(self, result_key: str, result: dict) -> None:
+        self.queue_result(result_key, result)
+
+    def queue_result(self, result_key: str, result: dict) -> None:
+        previous = self.results.get(result_key)
+        if previous is not None:
+            entries = self.user_results[previous["user_id"]]
+            del entries[bisect_left(entries, (to_epoch_us(previous["submitted_at"]), result_key))]
+        insort(self.user_results.setdefault(result["user_id"], []), (to_epoch_us(result["submitted_at"]), result_key))
+        self.results[result_key] = result
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT,
+    phone_number TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_email ON users (email) WHERE email IS NOT NULL;
+CREATE INDEX IF NOT EXISTS users_phone_number ON users (phone_number) WHERE phone_number IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS tokens (
+    token TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS news (
+    id TEXT PRIMARY KEY,
+    published_at_us INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS news_published_at ON news (published_at_us);
+
+CREATE TABLE IF NOT EXISTS bookmarks (
+    user_id TEXT NOT NULL,
+    news_id TEXT NOT NULL,
+    PRIMARY KEY (user_id, news_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS quizzes (
+    id TEXT PRIMARY KEY,
+    is_daily INTEGER NOT NULL,
+    created_at_us INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS quizzes_daily ON quizzes (is_daily, created_at_us);
+
+CREATE TABLE IF NOT EXISTS questions (
+    id TEXT PRIMARY KEY,
+    quiz_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS questions_quiz_id ON questions (quiz_id);
+
+CREATE TABLE IF NOT EXISTS quiz_results (
+    result_key TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    submitted_at_us INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS quiz_results_user ON quiz_results (user_id, submitted_at_us);
+CREATE INDEX IF NOT EXISTS quiz_results_submitted ON quiz_results (submitted_at_us);
+"""
+
+# Statements are module constants so each connection's statement cache reuses them
+SELECT_USER = "SELECT data FROM users WHERE id = ?"
+SELECT_USERS = "SELECT data FROM users WHERE id IN ({})"
+SELECT_USER_BY_EMAIL = "SELECT data FROM users WHERE email = ? LIMIT 1"
+SELECT_USER_BY_PHONE = "SELECT data FROM users WHERE phone_number = ? LIMIT 1"
+COUNT_USERS = "SELECT count(*) FROM users"
+UPDATE_USER_STATS = "UPDATE users SET data = json_set(data, '$.stats', json(?)) WHERE id = ?"
+UPSERT_USER = """
+INSERT INTO users (id, email, phone_number, data) VALUES (?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    email = excluded.email, phone_number = excluded.phone_number, data = excluded.data
+"""
+SELECT_TOKEN = "SELECT data FROM tokens WHERE token = ?"
+UPSERT_TOKEN = "INSERT OR REPLACE INTO tokens (token, data) VALUES (?, ?)"
+DELETE_TOKEN = "DELETE FROM tokens WHERE token = ?"
+SELECT_NEWS = "SELECT data FROM news ORDER BY published_at_us"
+SELECT_NEWS_SINCE = "SELECT data FROM news WHERE published_at_us >= ? ORDER BY published_at_us"
+SELECT_NEWS_IDS_BEFORE = "SELECT id FROM news WHERE published_at_us < ?"
+SELECT_NEWS_BY_IDS = "SELECT data FROM news WHERE id IN ({})"
+UPSERT_NEWS = """
+INSERT INTO news (id, published_at_us, data) VALUES (?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET published_at_us = excluded.published_at_us, data = excluded.data
+"""
+SELECT_BOOKMARKS = "SELECT user_id, news_id FROM bookmarks"
+INSERT_BOOKMARK = "INSERT OR IGNORE INTO bookmarks (user_id, news_id) VALUES (?, ?)"
+DELETE_BOOKMARK = "DELETE FROM bookmarks WHERE user_id = ? AND news_id = ?"
+SELECT_QUIZ = "SELECT data FROM quizzes WHERE id = ?"
+SELECT_DAILY_QUIZ = "SELECT data FROM quizzes WHERE is_daily = 1 ORDER BY created_at_us LIMIT 1"
+UPSERT_QUIZ = """
+INSERT INTO quizzes (id, is_daily, created_at_us, data) VALUES (?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    is_daily = excluded.is_daily, created_at_us = excluded.created_at_us, data = excluded.data
+"""
+SELECT_QUESTION = "SELECT data FROM questions WHERE id = ?"
+SELECT_QUIZ_QUESTIONS = "SELECT data FROM questions WHERE quiz_id = ? ORDER BY rowid"
+UPSERT_QUESTION = """
+INSERT INTO questions (id, quiz_id, data) VALUES (?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET quiz_id = excluded.quiz_id, data = excluded.data
+"""
+SELECT_RESULT = "SELECT data FROM quiz_results WHERE result_key = ?"
+SELECT_USER_RESULTS = """
+SELECT result_key, submitted_at_us, data FROM quiz_results WHERE user_id = ? ORDER BY submitted_at_us DESC LIMIT ?
+"""
+SELECT_RESULTS_SINCE = "SELECT result_key, submitted_at_us, data FROM quiz_results WHERE submitted_at_us >= ?"
+COUNT_RESULTS = "SELECT count(*) FROM quiz_results"
+UPSERT_RESULT = """
+INSERT INTO quiz_results (result_key, user_id, submitted_at_us, data) VALUES (?, ?, ?, ?)
+ON CONFLICT (result_key) DO UPDATE SET
+    user_id = excluded.user_id, submitted_at_us = excluded.submitted_at_us, data = excluded.data
+"""
+
+# IDs bound per IN (...) query, well under SQLite's bound-parameter limit
+_MAX_PARAMETERS = 500
+
+# (sql, parameter rows, future resolved once the batch commits)
+_Write = Tuple[str, List[tuple], Optional["asyncio.Future[None]"]]
+
+
+def _news_row(news_data: Mapping) -> tuple:
+    return (news_data["id"], to_epoch_us(news_data["published_at"]), encode(dict(news_data)))
+
+
+def _result_row(result_key: str, result: dict) -> tuple:
+    return (result_key, result["user_id"], to_epoch_us(result["submitted_at"]), encode(result))
+
+
+def _merge_results(rows: List[tuple], queued: List[tuple]) -> List[tuple]:
+    """Stored (result_key, submitted_at_us, data) rows overlaid with queued result rows, newest first"""
+    merged = {row[0]: row for row in rows}
+    for result_key, _, submitted_at_us, payload in queued:
+        merged[result_key] = (result_key, submitted_at_us, payload)
+    return sorted(merged.values(), key=lambda row: row[1], reverse=True)
+
+
+class SQLiteRepository(Repository):
+    """SQLite repository in WAL mode
+
+    Reads run on a bounded pool of connections in worker threads, so WAL
+    readers never wait for the writer. All writes go through one writer
+    connection that group-commits whatever queued up while the previous
+    transaction was running. News items queued by the store listener, quiz
+    results queued by submissions and user stats are serialized when queued
+    and coalesced by ID or result key until their batch commits; reads merge
+    queued and committing results and stats so callers see their own writes.
+    If a batch fails, those queued rows go back in the queue and are retried
+    with backoff; close() lets the writer drain the queue before it returns.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        pool_size: int = 4,
+        batch_size: int = 500,
+        retry_delay: float = 0.5,
+        retry_max_delay: float = 30.0,
+        close_attempts: int = 3
+    ):
+        self.path = path
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.retry_max_delay = retry_max_delay
+        self.close_attempts = close_attempts
+        self._pool: Optional["asyncio.Queue[sqlite3.Connection]"] = None
+        self._connections: List[sqlite3.Connection] = []
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writes: List[_Write] = []
+        self._pending_news: Dict[str, tuple] = {}  # news ID -> serialized row
+        self._pending_results: Dict[str, tuple] = {}  # result key -> serialized row
+        self._pending_stats: Dict[str, str] = {}  # user ID -> serialized stats
+        # Rows of the batch being committed, still visible to readers until it succeeds
+        self._committing_results: Dict[str, tuple] = {}
+        self._committing_stats: Dict[str, str] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, cached_statements=128
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=5000")
+        connection.execute("PRAGMA temp_store=MEMORY")
+        return connection
+
+    async def connect(self) -> None:
+        self._writer = await asyncio.to_thread(self._open)
+        await asyncio.to_thread(self._writer.executescript, SCHEMA)
+        self._pool = asyncio.Queue()
+        for _ in range(self.pool_size):
+            connection = await asyncio.to_thread(self._open)
+            self._connections.append(connection)
+            self._pool.put_nowait(connection)
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._writer_task = asyncio.create_task(self._write_loop())
+
+    async def close(self) -> None:
+        if self._writer_task is not None:
+            # Not cancelled: a commit may be running in a worker thread on the writer connection
+            self._stopping.set()
+            self._wakeup.set()
+            await self._writer_task
+            self._writer_task = None
+        for connection in self._connections:
+            connection.close()
+        self._connections.clear()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    # Connection plumbing
+    async def _read(self, query: Callable[[sqlite3.Connection], T]) -> T:
+        connection = await self._pool.get()
+        try:
+            return await asyncio.to_thread(query, connection)
+        finally:
+            self._pool.put_nowait(connection)
+
+    async def _fetch_one(self, sql: str, params: tuple, datetime_fields: Sequence[str]) -> Optional[dict]:
+        row = await self._read(lambda connection: connection.execute(sql, params).fetchone())
+        return decode(row[0], datetime_fields) if row else None
+
+    async def _fetch_all(self, sql: str, params: tuple, datetime_fields: Sequence[str]) -> List[dict]:
+        rows = await self._read(lambda connection: connection.execute(sql, params).fetchall())
+        return [decode(row[0], datetime_fields) for row in rows]
+
+    async def _scalar(self, sql: str) -> Any:
+        return await self._read(lambda connection: connection.execute(sql).fetchone()[0])
+
+    async def _write(self, sql: str, rows: List[tuple]) -> None:
+        """Queue a statement for the next group commit and wait until it is durable"""
+        future = asyncio.get_running_loop().create_future()
+        self._writes.append((sql, rows, future))
+        self._wakeup.set()
+        await future
+
+    def _has_pending(self) -> bool:
+        return bool(self._writes or self._pending_news or self._pending_results or self._pending_stats)
+
+    async def _write_loop(self) -> None:
+        failures = 0
+        while True:
+            if not self._has_pending():
+                if self._stopping.is_set():
+                    return
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            if await self._flush():
+                failures = 0
+                continue
+            
+            failures += 1
+            if self._stopping.is_set() and failures >= self.close_attempts:
+                logger.error(
+                    "Closing with %d news, %d result and %d stats rows unwritten",
+                    len(self._pending_news), len(self._pending_results), len(self._pending_stats)
+                )
+                return
+            delay = min(self.retry_max_delay, self.retry_delay * 2 ** (failures - 1))
+            try:
+                # close() cuts the backoff short so shutdown only waits for the final attempts
+                await asyncio.wait_for(self._stopping.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _flush(self) -> bool:
+        """Commit one batch; returns False if it failed and queued rows were put back"""
+        writes = self._writes[:self.batch_size]
+        del self._writes[:self.batch_size]
+        news, self._pending_news = self._pending_news, {}
+        results, self._pending_results = self._pending_results, {}
+        stats, self._pending_stats = self._pending_stats, {}
+        self._committing_results, self._committing_stats = results, stats
+        if news:
+            writes.append((UPSERT_NEWS, list(news.values()), None))
+        if results:
+            writes.append((UPSERT_RESULT, list(results.values()), None))
+        if stats:
+            writes.append((UPDATE_USER_STATS, [(payload, user_id) for user_id, payload in stats.items()], None))
+
+        try:
+            errors = await asyncio.to_thread(self._commit, writes)
+        except sqlite3.Error as exc:
+            self._committing_results, self._committing_stats = {}, {}
+            logger.error("SQLite batch of %d writes failed, retrying queued rows: %r", len(writes), exc)
+            # Rows queued since take precedence over the ones being put back
+            self._pending_news = {**news, **self._pending_news}
+            self._pending_results = {**results, **self._pending_results}
+            self._pending_stats = {**stats, **self._pending_stats}
+            for _, _, future in writes:
+                if future is not None and not future.done():
+                    future.set_exception(exc)
+            return False
+        
+        self._committing_results, self._committing_stats = {}, {}
+        for (_, _, future), error in zip(writes, errors):
+            if future is None:
+                if error is not None:
+                    logger.error("Background SQLite write failed: %r", error)
+            elif not future.done():
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+        return True
+
+    def _commit(self, writes: List[_Write]) -> List[Optional[Exception]]:
+        """Apply a batch in one transaction; a failing statement only fails its own write"""
+        errors: List[Optional[Exception]] = []
+        self._writer.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, rows, _ in writes:
+                try:
+                    self._writer.executemany(sql, rows)
+                    errors.append(None)
+                except sqlite3.IntegrityError as exc:
+                    errors.append(exc)
+            self._writer.execute("COMMIT")
+        except BaseException:
+            self._writer.execute("ROLLBACK")
+            raise
+        return errors
+
+    # Users and tokens
+    async def get_user(self, user_id: str) -> Optional[dict]:
+        return self._with_pending_stats(await self._fetch_one(SELECT_USER, (user_id,), USER_DATETIMES))
+
+    async def get_users(self, user_ids: Iterable[str]) -> Dict[str, dict]:
+        user_ids = list(dict.fromkeys(user_ids))
+        users = {}
+        for start in range(0, len(user_ids), _MAX_PARAMETERS):
+            chunk = user_ids[start:start + _MAX_PARAMETERS]
+            sql = SELECT_USERS.format(", ".join("?" * len(chunk)))
+            for user in await self._fetch_all(sql, tuple(chunk), USER_DATETIMES):
+                users[user["id"]] = self._with_pending_stats(user)
+        return users
+
+    async def find_user(self, email: Optional[str] = None, phone_number: Optional[str] = None) -> Optional[dict]:
+        user = None
+        if email:
+            user = await self._fetch_one(SELECT_USER_BY_EMAIL, (email,), USER_DATETIMES)
+        if user is None and phone_number:
+            user = await self._fetch_one(SELECT_USER_BY_PHONE, (phone_number,), USER_DATETIMES)
+        return self._with_pending_stats(user)
+
+    async def count_users(self) -> int:
+        return await self._scalar(COUNT_USERS)
+
+    def queue_user_stats(self, user_id: str, stats: dict) -> None:
+        self._pending_stats[user_id] = encode(stats)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _with_pending_stats(self, user: Optional[dict]) -> Optional[dict]:
+        if user is not None:
+            payload = self._pending_stats.get(user["id"]) or self._committing_stats.get(user["id"])
+            if payload is not None:
+                user["stats"] = from_json(payload)
+        return user
+
+    async def save_user(self, user: dict) -> None:
+        await self._write(UPSERT_USER, [(user["id"], user.get("email"), user.get("phone_number"), encode(user))])
+
+    async def get_token(self, token: str) -> Optional[dict]:
+        return await self._fetch_one(SELECT_TOKEN, (token,), TOKEN_DATETIMES)
+
+    async def save_token(self, token: str, token_data: dict) -> None:
+        await self._write(UPSERT_TOKEN, [(token, encode(token_data))])
+
+    async def delete_token(self, token: str) -> None:
+        await self._write(DELETE_TOKEN, [(token,)])
+
+    # News and bookmarks
+    async def load_news(self, since: Optional[datetime] = None) -> List[dict]:
+        if since is None:
+            return await self._fetch_all(SELECT_NEWS, (), NEWS_DATETIMES)
+        return await self._fetch_all(SELECT_NEWS_SINCE, (to_epoch_us(since),), NEWS_DATETIMES)
+
+    async def list_news_ids(self, before: datetime) -> List[str]:
+        params = (to_epoch_us(before),)
+        rows = await self._read(lambda connection: connection.execute(SELECT_NEWS_IDS_BEFORE, params).fetchall())
+        return [row[0] for row in rows]
+
+    async def get_news(self, news_ids: Iterable[str]) -> List[dict]:
+        news_ids = list(news_ids)
+        news_items = []
+        for start in range(0, len(news_ids), _MAX_PARAMETERS):
+            chunk = news_ids[start:start + _MAX_PARAMETERS]
+            sql = SELECT_NEWS_BY_IDS.format(", ".join("?" * len(chunk)))
+            news_items += await self._fetch_all(sql, tuple(chunk), NEWS_DATETIMES)
+        return news_items
+
+    async def save_news(self, news_items: List[dict]) -> None:
+        await self._write(UPSERT_NEWS, [_news_row(news_data) for news_data in news_items])
+
+    def queue_news(self, news_data: dict) -> None:
+        # Serialized now: store records are views that do not outlive row removal
+        self._pending_news[news_data["id"]] = _news_row(news_data)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def load_bookmarks(self) -> Dict[str, Set[str]]:
+        rows = await self._read(lambda connection: connection.execute(SELECT_BOOKMARKS).fetchall())
+        bookmarks: Dict[str, Set[str]] = {}
+        for user_id, news_id in rows:
+            bookmarks.setdefault(user_id, set()).add(news_id)
+        return bookmarks
+
+    async def add_bookmark(self, user_id: str, news_id: str) -> None:
+        await self._write(INSERT_BOOKMARK, [(user_id, news_id)])
+
+    async def remove_bookmark(self, user_id: str, news_id: str) -> None:
+        await self._write(DELETE_BOOKMARK, [(user_id, news_id)])
+
+    # Quizzes, questions and results
+    async def get_quiz(self, quiz_id: str) -> Optional[dict]:
+        return await self._fetch_one(SELECT_QUIZ, (quiz_id,), QUIZ_DATETIMES)
+
+    async def find_daily_quiz(self) -> Optional[dict]:
+        return await self._fetch_one(SELECT_DAILY_QUIZ, (), QUIZ_DATETIMES)
+
+    async def save_quiz(self, quiz: dict) -> None:
+        await self._write(UPSERT_QUIZ, [
+            (quiz["id"], int(quiz["is_daily"]), to_epoch_us(quiz["created_at"]), encode(quiz))
+        ])
+
+    async def get_question(self, question_id: str) -> Optional[dict]:
+        return await self._fetch_one(SELECT_QUESTION, (question_id,), QUESTION_DATETIMES)
+
+    async def list_questions(self, quiz_id: str) -> List[dict]:
+        return await self._fetch_all(SELECT_QUIZ_QUESTIONS, (quiz_id,), QUESTION_DATETIMES)
+
+    async def save_questions(self, questions: List[dict]) -> None:
+        await self._write(UPSERT_QUESTION, [
+            (question["id"], question["quiz_id"], encode(question)) for question in questions
+        ])
+
+    async def get_result(self, result_key: str) -> Optional[dict]:
+        queued = self._pending_results.get(result_key) or self._committing_results.get(result_key)
+        if queued is not None:
+            return decode(queued[3], RESULT_DATETIMES)
+        return await self._fetch_one(SELECT_RESULT, (result_key,), RESULT_DATETIMES)
+
+    async def list_results(self, user_id: str, limit: int) -> List[dict]:
+        if limit <= 0:
+            return []
+        queued = [row for row in self._queued_results() if row[1] == user_id]
+        # Queued rows may replace stored ones, so fetch enough to fill the page either way
+        params = (user_id, limit + len(queued))
+        rows = await self._read(lambda connection: connection.execute(SELECT_USER_RESULTS, params).fetchall())
+        return [decode(row[2], RESULT_DATETIMES) for row in _merge_results(rows, queued)[:limit]]
+
+    async def load_results(self, since: datetime) -> List[dict]:
+        since_us = to_epoch_us(since)
+        queued = [row for row in self._queued_results() if row[2] >= since_us]
+        rows = await self._read(lambda connection: connection.execute(SELECT_RESULTS_SINCE, (since_us,)).fetchall())
+        return [decode(row[2], RESULT_DATETIMES) for row in _merge_results(rows, queued)]
+
+    def _queued_results(self) -> List[tuple]:
+        """Result rows not yet committed; newer queued rows win over committing ones"""
+        return list({**self._committing_results, **self._pending_results}.values())
+
+    async def count_results(self) -> int:
+        return await self._scalar(COUNT_RESULTS)
+
+    async def save_result(self, result_key: str, result: dict) -> None:
+        await self._write(UPSERT_RESULT, [_result_row(result_key, result)])
+
+    def queue_result(self, result_key: str, result: dict) -> None:
+        # Later submissions under the same key replace queued ones before they are written
+        self._pending_results[result_key] = _result_row(result_key, result)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+
+def create_repository(database_url: Optional[str]) -> Repository:
+    """Repository for a database URL: unset or memory:// for memory, sqlite:///path for SQLite"""
+    if not database_url or database_url == "memory://":
+        return MemoryRepository()
+    if database_url.startswith("sqlite:///"):
+        path = database_url[len("sqlite:///"):]
+        if not path or path == ":memory:":
+            raise ValueError("Use memory:// instead of an in-memory SQLite database")
+        return SQLiteRepository(
+            path,
+            pool_size=settings.database_pool_size,
+            batch_size=settings.database_write_batch_size
+        )
+    raise ValueError(f"Unsupported database URL: {database_url}")
+
+
+# Global repository instance
+repository = create_repository(settings.database_url)
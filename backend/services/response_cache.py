@@ -0,0 +1,119 @@
+"""
+Pre-serialized news response cache for the Comrade backend
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Response
+from pydantic_core import to_json
+
+from models.news import NewsCardResponse, NewsResponse, NewsView
+
+# Both response models end with view_count and is_bookmarked, the only per-request fields
+_VOLATILE_SUFFIX = b'0,"is_bookmarked":false}'
+
+_CARD_FIELDS = [
+    field for field in NewsCardResponse.model_fields
+    if field not in ("excerpt", "view_count", "is_bookmarked")
+]
+
+# (view, excerpt length or 0) - one cached fragment per variant
+FragmentVariant = Tuple[NewsView, int]
+
+
+def make_excerpt(content: str, max_chars: int) -> str:
+    """Truncate content at a word boundary"""
+    if len(content) <= max_chars:
+        return content
+    cut = content.rfind(" ", 0, max_chars)
+    return content[:cut if cut > 0 else max_chars].rstrip(" ,;:.") + "…"
+
+
+class NewsResponseCache:
+    """Per-article response JSON cached up to the volatile trailing fields
+
+    Each fragment is the serialized article (full or card view) with its
+    final ``0,"is_bookmarked":false}`` cut off, so the live view count and
+    the caller's bookmark flag are appended as bytes without touching
+    pydantic. All variants of an article are dropped whenever the news store
+    reports an update. At most capacity articles are cached; the least
+    recently rendered one is evicted first.
+    """
+
+    def __init__(self, capacity: int = 5000):
+        self.capacity = capacity
+        self._fragments: "OrderedDict[str, Dict[FragmentVariant, bytes]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+    def invalidate(self, news_data: dict) -> None:
+        """Drop the cached fragments of a news item (news store listener)"""
+        self._fragments.pop(news_data["id"], None)
+
+    def render(
+        self,
+        news_data: dict,
+        view_count: int,
+        is_bookmarked: bool,
+        view: NewsView = NewsView.FULL,
+        excerpt_chars: Optional[int] = None,
+        cache: bool = True
+    ) -> bytes:
+        """Serialized NewsResponse or NewsCardResponse for one article"""
+        variant = (view, (excerpt_chars or 0) if view == NewsView.CARD else 0)
+        if not cache:
+            prefix = self._serialize(news_data, *variant)
+        else:
+            variants = self._fragments.get(news_data["id"])
+            if variants is None:
+                variants = self._fragments[news_data["id"]] = {}
+                if len(self._fragments) > self.capacity:
+                    self._fragments.popitem(last=False)
+            else:
+                self._fragments.move_to_end(news_data["id"])
+            prefix = variants.get(variant)
+            if prefix is None:
+                prefix = variants[variant] = self._serialize(news_data, *variant)
+        return b"%s%d,\"is_bookmarked\":%s}" % (
+            prefix, view_count, b"true" if is_bookmarked else b"false"
+        )
+
+    @staticmethod
+    def _serialize(news_data: dict, view: NewsView, excerpt_chars: int) -> bytes:
+        if view == NewsView.CARD:
+            excerpt = make_excerpt(news_data["content"], excerpt_chars) if excerpt_chars else None
+            # Read only card fields so stored content bodies stay untouched
+            card_fields = {field: news_data[field] for field in _CARD_FIELDS if field in news_data}
+            model = NewsCardResponse(
+                **{**card_fields, "view_count": 0},
+                excerpt=excerpt,
+                is_bookmarked=False
+            )
+        else:
+            model = NewsResponse(**{**news_data, "view_count": 0}, is_bookmarked=False)
+
+        payload = model.model_dump_json().encode()
+        assert payload.endswith(_VOLATILE_SUFFIX), "response model field order changed"
+        return payload[:-len(_VOLATILE_SUFFIX)]
+
+
+def json_array(fragments: Iterable[bytes]) -> bytes:
+    """Join serialized fragments into a JSON array"""
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def json_object(fragments_key: str, fragments: List[bytes], fields: Dict[str, Any]) -> bytes:
+    """Build a JSON object from scalar fields plus one array of serialized fragments"""
+    body = to_json(fields)
+    head = b'{"%s":%s' % (fragments_key.encode(), json_array(fragments))
+    if len(body) > 2:
+        return head + b"," + body[1:]
+    return head + b"}"
+
+
+def json_response(content: bytes, etag: Optional[str] = None) -> Response:
+    """Wrap pre-serialized JSON without re-validating it through response_model"""
+    headers = {"ETag": etag} if etag else None
+    return Response(content=content, media_type="application/json", headers=headers)
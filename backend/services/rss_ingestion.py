@@ -0,0 +1,246 @@
+"""
+Concurrent RSS ingestion pipeline for the Comrade backend
+"""
+
+import asyncio
+import calendar
+import html
+import logging
+import random
+import re
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import feedparser
+import httpx
+from pydantic import ValidationError
+
+from config import Settings
+from models.news import NewsCategory, NewsCreate, NewsSource
+
+logger = logging.getLogger(__name__)
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+class FeedConfig(NamedTuple):
+    """An RSS feed to ingest"""
+    name: str
+    url: str
+    source: NewsSource
+    category: NewsCategory = NewsCategory.GENERAL
+
+
+class IngestedItem(NamedTuple):
+    """A validated feed entry ready to be upserted into the news store"""
+    news: NewsCreate
+    published_at: datetime
+
+
+# Applies a batch of ingested items to the news store, returning how many changed
+UpsertHandler = Callable[[List[IngestedItem]], int]
+
+# Optional stage that derives extra fields (read time, tags, ...) before upserting
+EnrichHandler = Callable[[List[IngestedItem]], Awaitable[List[IngestedItem]]]
+
+
+class FeedMetrics:
+    """Fetch counters and conditional request state of one feed"""
+
+    def __init__(self):
+        self.fetches = 0
+        self.not_modified = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.entries_parsed = 0
+        self.entries_invalid = 0
+        self.items_upserted = 0
+        self.last_status: Optional[int] = None
+        self.last_error: Optional[str] = None
+        self.last_duration_ms: Optional[float] = None
+        self.last_success_at: Optional[float] = None
+        self.next_attempt_at = 0.0
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+def default_feeds(settings: Settings) -> List[FeedConfig]:
+    """Feeds configured through Settings"""
+    return [
+        FeedConfig("pib", settings.pib_rss_url, NewsSource.PIB),
+        FeedConfig("hindu", settings.hindu_rss_url, NewsSource.HINDU),
+        FeedConfig("indian_express", settings.indian_express_rss_url, NewsSource.INDIAN_EXPRESS),
+    ]
+
+
+def clean_text(value: Optional[str]) -> str:
+    """Strip markup and collapse whitespace in feed text"""
+    if not value:
+        return ""
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", value))).strip()
+
+
+def entry_to_news(entry: dict, feed: FeedConfig) -> IngestedItem:
+    """Map a feedparser entry to a NewsCreate payload (raises ValidationError)"""
+    summary = clean_text(entry.get("summary"))
+    content = " ".join(clean_text(part.get("value")) for part in entry.get("content", []))
+    image_url = None
+    for media in entry.get("media_content", []) + entry.get("media_thumbnail", []):
+        if media.get("url"):
+            image_url = media["url"]
+            break
+    else:
+        for enclosure in entry.get("enclosures", []):
+            if enclosure.get("type", "").startswith("image/"):
+                image_url = enclosure.get("href")
+                break
+
+    content = content or summary
+    news = NewsCreate(
+        title=clean_text(entry.get("title")),
+        description=(summary or content[:300])[:1000],
+        content=content,
+        image_url=image_url,
+        source_url=entry.get("link"),
+        source=feed.source,
+        author=clean_text(entry.get("author")) or None,
+        category=feed.category,
+        tags=[clean_text(tag.get("term")) for tag in entry.get("tags", []) if tag.get("term")],
+    )
+
+    published = entry.get("published_parsed") or entry.get("updated_parsed")
+    if published:
+        published_at = datetime.fromtimestamp(calendar.timegm(published), tz=timezone.utc)
+    else:
+        published_at = datetime.now(timezone.utc)
+    return IngestedItem(news, published_at)
+
+
+def parse_feed(content: bytes, feed: FeedConfig) -> Tuple[List[IngestedItem], int]:
+    """Parse a feed document into valid items; runs in a worker thread"""
+    parsed = feedparser.parse(content)
+    items = []
+    invalid = 0
+    for entry in parsed.entries:
+        try:
+            items.append(entry_to_news(entry, feed))
+        except ValidationError:
+            invalid += 1
+    return items, invalid
+
+
+class FeedIngestor:
+    """Polls every feed concurrently over one pooled httpx.AsyncClient
+
+    Requests are conditional (If-None-Match / If-Modified-Since), each feed
+    has its own timeout, and failing feeds back off exponentially without
+    holding up the others. Parsing runs in a thread so the event loop never
+    blocks on feedparser.
+    """
+
+    def __init__(
+        self,
+        feeds: List[FeedConfig],
+        upsert: UpsertHandler,
+        timeout: float = 10.0,
+        max_connections: int = 10,
+        backoff_base: float = 30.0,
+        backoff_max: float = 3600.0,
+        client: Optional[httpx.AsyncClient] = None,
+        enrich: Optional[EnrichHandler] = None
+    ):
+        self.feeds = feeds
+        self.upsert = upsert
+        self.enrich = enrich
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.metrics: Dict[str, FeedMetrics] = {feed.name: FeedMetrics() for feed in feeds}
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=max_connections),
+            follow_redirects=True,
+            headers={"User-Agent": "ComradeBot/1.0"}
+        )
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client if this ingestor created it"""
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def poll_all(self) -> int:
+        """Fetch every due feed concurrently; returns the number of upserted items"""
+        results = await asyncio.gather(
+            *(self.poll(feed) for feed in self.feeds),
+            return_exceptions=True
+        )
+        upserted = 0
+        for feed, result in zip(self.feeds, results):
+            if isinstance(result, Exception):
+                logger.error("RSS ingestion of %s crashed: %r", feed.name, result)
+            else:
+                upserted += result
+        return upserted
+
+    async def poll(self, feed: FeedConfig) -> int:
+        """Fetch, parse and upsert one feed unless it is backing off"""
+        metrics = self.metrics[feed.name]
+        if time.time() < metrics.next_attempt_at:
+            return 0
+
+        headers = {}
+        if metrics.etag:
+            headers["If-None-Match"] = metrics.etag
+        if metrics.last_modified:
+            headers["If-Modified-Since"] = metrics.last_modified
+
+        started = time.perf_counter()
+        metrics.fetches += 1
+        try:
+            response = await asyncio.wait_for(
+                self._client.get(feed.url, headers=headers),
+                timeout=self.timeout
+            )
+            metrics.last_status = response.status_code
+            if response.status_code == 304:
+                metrics.not_modified += 1
+                self._succeeded(metrics)
+                return 0
+            response.raise_for_status()
+
+            items, invalid = await asyncio.to_thread(parse_feed, response.content, feed)
+            if items and self.enrich is not None:
+                items = await self.enrich(items)
+            metrics.entries_parsed += len(items) + invalid
+            metrics.entries_invalid += invalid
+            upserted = self.upsert(items) if items else 0
+            metrics.items_upserted += upserted
+
+            metrics.etag = response.headers.get("ETag")
+            metrics.last_modified = response.headers.get("Last-Modified")
+            self._succeeded(metrics)
+            return upserted
+        except (httpx.HTTPError, asyncio.TimeoutError) as exc:
+            self._failed(metrics, feed, exc)
+            return 0
+        finally:
+            metrics.last_duration_ms = (time.perf_counter() - started) * 1000
+
+    def _succeeded(self, metrics: FeedMetrics) -> None:
+        metrics.consecutive_failures = 0
+        metrics.last_error = None
+        metrics.last_success_at = time.time()
+
+    def _failed(self, metrics: FeedMetrics, feed: FeedConfig, exc: Exception) -> None:
+        metrics.failures += 1
+        metrics.consecutive_failures += 1
+        metrics.last_error = repr(exc)
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (metrics.consecutive_failures - 1))
+        metrics.next_attempt_at = time.time() + delay * random.uniform(0.8, 1.2)
+        logger.warning("RSS feed %s failed (%r); retrying in %.0fs", feed.name, exc, delay)
@@ -0,0 +1,249 @@
+"""
+Inverted full-text search index for the Comrade backend
+"""
+
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+_QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+# Field name -> term frequency weight (a light BM25F variant)
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "tags": 2.0,
+    "description": 1.5,
+    "content": 1.0,
+}
+
+# Position gap between fields so phrases never match across field boundaries
+FIELD_GAP = 16
+
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_EXPANSIONS = 64
+
+
+def normalize(text: str) -> str:
+    """Lowercase text and fold accented characters to ASCII"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized alphanumeric tokens"""
+    return _TOKEN_RE.findall(normalize(text))
+
+
+class Posting(NamedTuple):
+    """Occurrences of one term in one document"""
+    weight: float
+    positions: List[int]
+
+
+class QueryClause(NamedTuple):
+    """A parsed query clause: a term, a prefix or a phrase"""
+    kind: str  # "term", "prefix" or "phrase"
+    terms: List[str]
+
+
+def parse_query(query: str) -> List[QueryClause]:
+    """Parse a search string into term, prefix (foo*) and phrase ("a b") clauses"""
+    clauses = []
+    for phrase, word in _QUERY_RE.findall(query):
+        if phrase:
+            terms = tokenize(phrase)
+            if len(terms) > 1:
+                clauses.append(QueryClause("phrase", terms))
+            elif terms:
+                clauses.append(QueryClause("term", terms))
+            continue
+
+        if word.endswith("*"):
+            terms = tokenize(word[:-1])
+            if len(terms) == 1 and len(terms[0]) >= MIN_PREFIX_LENGTH:
+                clauses.append(QueryClause("prefix", terms))
+                continue
+
+        terms = tokenize(word)
+        if len(terms) > 1:
+            # Punctuated words such as "make-in-india" behave like phrases
+            clauses.append(QueryClause("phrase", terms))
+        elif terms:
+            clauses.append(QueryClause("term", terms))
+    return clauses
+
+
+class SearchIndex:
+    """BM25-ranked inverted index over news title, description, content and tags
+
+    Queries are conjunctive: every clause must match. Candidates are taken
+    from the rarest clause and checked against the others, so query cost
+    grows with posting list sizes rather than with the corpus.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, Posting]] = {}
+        self._doc_terms: Dict[str, List[str]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._vocabulary: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def index_news(self, news_data: dict) -> None:
+        """Add or re-index a news item"""
+        fields = {
+            "title": news_data.get("title") or "",
+            "description": news_data.get("description") or "",
+            "content": news_data.get("content") or "",
+            "tags": " ".join(news_data.get("tags") or []),
+        }
+        self.add_document(news_data["id"], fields)
+
+    def remove_news(self, news_data: dict) -> None:
+        """Drop a news item from the index (news store removal listener)"""
+        self.remove_document(news_data["id"])
+
+    def add_document(self, doc_id: str, fields: Dict[str, str]) -> None:
+        """Add or replace a document made of named text fields"""
+        self.remove_document(doc_id)
+
+        weights: Dict[str, float] = {}
+        positions: Dict[str, List[int]] = {}
+        position = 0
+        for field, text in fields.items():
+            field_weight = FIELD_WEIGHTS.get(field, 1.0)
+            for token in tokenize(text):
+                weights[token] = weights.get(token, 0.0) + field_weight
+                positions.setdefault(token, []).append(position)
+                position += 1
+            position += FIELD_GAP
+
+        for term, weight in weights.items():
+            term_postings = self._postings.get(term)
+            if term_postings is None:
+                term_postings = self._postings[term] = {}
+                insort(self._vocabulary, term)
+            term_postings[doc_id] = Posting(weight, positions[term])
+
+        length = sum(len(term_positions) for term_positions in positions.values())
+        self._doc_terms[doc_id] = list(weights)
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+
+    def remove_document(self, doc_id: str) -> None:
+        """Remove a document from the index if present"""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            term_postings = self._postings[term]
+            del term_postings[doc_id]
+            if not term_postings:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Return (doc_id, score) pairs matching every query clause, best first"""
+        clauses = parse_query(query)
+        if not clauses or not self._doc_lengths:
+            return []
+
+        clause_postings = [self._clause_postings(clause) for clause in clauses]
+        if any(not postings for postings in clause_postings):
+            return []
+
+        # Drive the intersection from the clause with the fewest candidates
+        order = sorted(
+            range(len(clauses)),
+            key=lambda i: self._candidate_count(clauses[i], clause_postings[i])
+        )
+        candidates: Optional[Set[str]] = None
+        for i in order:
+            candidates = self._match(clauses[i], clause_postings[i], candidates)
+            if not candidates:
+                return []
+
+        scores = []
+        for doc_id in candidates:
+            score = sum(self._score(doc_id, postings) for postings in clause_postings)
+            scores.append((doc_id, score))
+        scores.sort(key=lambda item: (-item[1], item[0]))
+        return scores[:limit] if limit is not None else scores
+
+    def _clause_postings(self, clause: QueryClause) -> List[Dict[str, Posting]]:
+        """Posting lists that contribute to a clause"""
+        if clause.kind == "prefix":
+            return [self._postings[term] for term in self._expand_prefix(clause.terms[0])]
+        return [self._postings.get(term, {}) for term in clause.terms]
+
+    def _expand_prefix(self, prefix: str) -> Iterable[str]:
+        position = bisect_left(self._vocabulary, prefix)
+        expansions = []
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(prefix):
+            expansions.append(self._vocabulary[position])
+            position += 1
+        if len(expansions) > MAX_PREFIX_EXPANSIONS:
+            # Keep the most common expansions so broad prefixes stay bounded
+            expansions.sort(key=lambda term: -len(self._postings[term]))
+            expansions = expansions[:MAX_PREFIX_EXPANSIONS]
+        return expansions
+
+    @staticmethod
+    def _candidate_count(clause: QueryClause, postings: List[Dict[str, Posting]]) -> int:
+        if clause.kind == "prefix":
+            return sum(len(p) for p in postings)
+        return min(len(p) for p in postings)
+
+    def _match(
+        self,
+        clause: QueryClause,
+        postings: List[Dict[str, Posting]],
+        candidates: Optional[Set[str]]
+    ) -> Set[str]:
+        """Narrow the candidate set to documents matching one clause"""
+        if clause.kind == "prefix":
+            if candidates is None:
+                return set().union(*postings)
+            return {doc_id for doc_id in candidates if any(doc_id in p for p in postings)}
+
+        if candidates is None:
+            candidates = set(min(postings, key=len))
+        matched = {doc_id for doc_id in candidates if all(doc_id in p for p in postings)}
+        if clause.kind == "phrase":
+            matched = {doc_id for doc_id in matched if self._has_phrase(doc_id, postings)}
+        return matched
+
+    @staticmethod
+    def _has_phrase(doc_id: str, postings: List[Dict[str, Posting]]) -> bool:
+        """Check that the phrase terms occur at consecutive positions"""
+        starts = set(postings[0][doc_id].positions)
+        for offset, term_postings in enumerate(postings[1:], start=1):
+            starts &= {position - offset for position in term_postings[doc_id].positions}
+            if not starts:
+                return False
+        return True
+
+    def _score(self, doc_id: str, postings: List[Dict[str, Posting]]) -> float:
+        """BM25 contribution of the clause terms present in a document"""
+        total_docs = len(self._doc_lengths)
+        average_length = self._total_length / total_docs
+        length_norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+
+        score = 0.0
+        for term_postings in postings:
+            posting = term_postings.get(doc_id)
+            if posting is None:
+                continue
+            doc_freq = len(term_postings)
+            idf = math.log(1 + (total_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+            score += idf * posting.weight * (self.k1 + 1) / (posting.weight + length_norm)
+        return score
@@ -0,0 +1,131 @@
+"""
+Time-decayed trending engine for the Comrade backend
+"""
+
+import heapq
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+from services.news_store import to_epoch_us
+
+# Rebase scores before exp() growth gets anywhere near float overflow
+_MAX_EXPONENT = 500.0
+
+
+class TrendingEngine:
+    """Exponentially decayed view scores with per-category ranked boards
+
+    A view at time t adds exp(rate * (t - reference)) to an article's score.
+    Ordering by that value is the same as ordering by the decayed score at
+    any later instant, so a view only moves one article on its boards.
+
+    Each board ranks every in-window article of its category in a
+    SortedList, so writes cost O(log n) and removals leave no gaps to
+    refill. Articles leave the boards as they fall out of the ranking
+    window, found through a heap of publication times, so a read only
+    slices the first entries of a board.
+    """
+
+    def __init__(self, half_life_hours: float, window_hours: float, capacity: int):
+        self.decay_rate = math.log(2) / (half_life_hours * 3600)
+        self.window_seconds = window_hours * 3600
+        self.capacity = capacity  # most articles a read returns
+        self._reference = time.time()
+        self._scores: Dict[str, float] = {}
+        self._articles: Dict[str, Tuple[str, float]] = {}  # id -> (category, published ts)
+        self._ranked: Dict[str, float] = {}  # id -> score its board entries are keyed by
+        self._boards: Dict[Optional[str], SortedList] = {None: SortedList()}  # (-score, id), best first
+        self._expiry: List[Tuple[float, str]] = []  # (published ts, id) heap; outdated entries are skipped
+
+    def track(self, news_data: dict) -> None:
+        """Register or refresh an article; seeds its score from existing views"""
+        news_id = news_data["id"]
+        published_ts = to_epoch_us(news_data["published_at"]) / 1_000_000
+
+        previous = self._articles.get(news_id)
+        if previous is None:
+            # Treat historical views as if they happened at publication time
+            self._scores[news_id] = news_data.get("view_count", 0) * self._weight(published_ts)
+        else:
+            self._unrank(news_id, previous[0])
+        self._articles[news_id] = (news_data["category"], published_ts)
+        if previous is None or previous[1] != published_ts:
+            heapq.heappush(self._expiry, (published_ts, news_id))
+        self._expire()
+        if published_ts >= self._cutoff():
+            self._rank(news_id)
+
+    def untrack(self, news_data: dict) -> None:
+        """Forget an article and drop it from its boards"""
+        article = self._articles.pop(news_data["id"], None)
+        if article is None:
+            return
+        self._unrank(news_data["id"], article[0])
+        del self._scores[news_data["id"]]
+
+    def record_view(self, news_id: str, count: int = 1, at: Optional[float] = None) -> None:
+        """Add views to an article's decayed score"""
+        if news_id not in self._articles:
+            return
+        self._scores[news_id] += count * self._weight(time.time() if at is None else at)
+        self._expire()
+        if news_id in self._ranked:
+            self._unrank(news_id, self._articles[news_id][0])
+            self._rank(news_id)
+
+    def top(self, limit: int, category: Optional[str] = None) -> List[str]:
+        """Return the IDs of the highest scoring in-window articles"""
+        self._expire()
+        board = self._boards.get(category)
+        if board is None:
+            return []
+        return [news_id for _, news_id in board.islice(0, min(limit, self.capacity))]
+
+    def _weight(self, at: float) -> float:
+        exponent = self.decay_rate * (at - self._reference)
+        if exponent > _MAX_EXPONENT:
+            self._rebase(at)
+            exponent = 0.0
+        return math.exp(exponent)
+
+    def _rebase(self, at: float) -> None:
+        """Move the reference time forward, rescaling every score (keeps every ranking)"""
+        factor = math.exp(-self.decay_rate * (at - self._reference))
+        self._reference = at
+        for news_id in self._scores:
+            self._scores[news_id] *= factor
+        ranked = list(self._ranked)
+        self._ranked.clear()
+        self._boards = {None: SortedList()}
+        for news_id in ranked:
+            self._rank(news_id)
+
+    def _cutoff(self) -> float:
+        return time.time() - self.window_seconds
+
+    def _expire(self) -> None:
+        """Drop articles that fell out of the ranking window from the boards"""
+        cutoff = self._cutoff()
+        while self._expiry and self._expiry[0][0] < cutoff:
+            published_ts, news_id = heapq.heappop(self._expiry)
+            article = self._articles.get(news_id)
+            if article is not None and article[1] == published_ts:
+                self._unrank(news_id, article[0])
+
+    def _rank(self, news_id: str) -> None:
+        score = self._scores[news_id]
+        self._ranked[news_id] = score
+        self._boards[None].add((-score, news_id))
+        board = self._boards.get(self._articles[news_id][0])
+        if board is None:
+            board = self._boards[self._articles[news_id][0]] = SortedList()
+        board.add((-score, news_id))
+
+    def _unrank(self, news_id: str, category: str) -> None:
+        score = self._ranked.pop(news_id, None)
+        if score is not None:
+            self._boards[None].remove((-score, news_id))
+            self._boards[category].remove((-score, news_id))
@@ -0,0 +1,173 @@
+"""
+Incremental user stats and streaks for the Comrade backend
+"""
+
+import logging
+from collections import OrderedDict
+from datetime import date
+from typing import List, Optional, Set
+
+from models.user import UserStats
+
+logger = logging.getLogger(__name__)
+
+WEEK_DAYS = 7
+_WEEK_MASK = (1 << WEEK_DAYS) - 1
+
+
+def mask_from_week(weekly_streak: List[bool]) -> int:
+    """Pack a weekly_streak list (oldest first) into a bitmask; bit 0 is the newest day"""
+    mask = 0
+    for active in weekly_streak[-WEEK_DAYS:]:
+        mask = (mask << 1) | int(bool(active))
+    return mask
+
+
+def week_from_mask(mask: int) -> List[bool]:
+    """Unpack a bitmask into a weekly_streak list, oldest first"""
+    return [bool(mask >> shift & 1) for shift in range(WEEK_DAYS - 1, -1, -1)]
+
+
+class _Activity:
+    """Running counters of one user; the activity mask is anchored at last_day"""
+
+    __slots__ = (
+        "current_streak", "best_streak", "quizzes_taken", "minutes_practiced",
+        "last_day", "mask", "read_day", "read_ids"
+    )
+
+    def __init__(self, stats: UserStats):
+        self.rebase(stats)
+        self.read_day: Optional[date] = None
+        self.read_ids: Set[str] = set()  # articles already counted on read_day
+
+    def rebase(self, stats: UserStats) -> None:
+        """Adopt stored stats as the new starting point"""
+        self.current_streak = stats.current_streak
+        self.best_streak = stats.best_streak
+        self.quizzes_taken = stats.quizzes_taken
+        self.minutes_practiced = stats.minutes_practiced
+        self.last_day: Optional[date] = stats.last_active_date
+        self.mask = mask_from_week(stats.weekly_streak) if stats.last_active_date else 0
+
+    def is_behind(self, stats: UserStats) -> bool:
+        """Whether stored stats include everything counted here (counters only ever grow)"""
+        return self.quizzes_taken <= stats.quizzes_taken and self.minutes_practiced <= stats.minutes_practiced
+
+
+class UserStatsEngine:
+    """Keeps streaks and practice counters current as activity happens
+
+    Every quiz submission or article read updates the user's counters in
+    O(1): the last active local day decides whether the streak grows,
+    continues or restarts, and the last seven days live in a rolling
+    bitmask shifted by the days elapsed since. Reading stats re-anchors the
+    stored values to today without touching any result history, so a
+    streak shows as broken as soon as a local day is missed.
+
+    Stats are stored relative to last_active_date (weekly_streak ends on
+    that day); stats() returns them relative to the requested day. Every
+    stats() call, which get_current_user makes before any activity can be
+    recorded, rebases the counters on the stored stats, so activity written
+    by other workers is picked up instead of being overwritten. A stored
+    snapshot read before this process's latest update is ignored.
+
+    At most capacity users are kept, least recently used evicted first; an
+    evicted user is rebuilt from stored stats by their next stats() call.
+    """
+
+    def __init__(self, capacity: int = 50000):
+        self.capacity = capacity
+        self._users: "OrderedDict[str, _Activity]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def stats(self, user_id: str, stored: UserStats, day: date) -> UserStats:
+        """Stats as of a local day, rebased on the user's stored stats"""
+        activity = self._users.get(user_id)
+        if activity is None:
+            activity = self._users[user_id] = _Activity(stored)
+            if len(self._users) > self.capacity:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+            if activity.is_behind(stored):
+                activity.rebase(stored)
+        if activity.last_day is None:
+            return UserStats(
+                best_streak=activity.best_streak,
+                quizzes_taken=activity.quizzes_taken,
+                minutes_practiced=activity.minutes_practiced
+            )
+        elapsed = (day - activity.last_day).days
+        mask = activity.mask << min(elapsed, WEEK_DAYS) & _WEEK_MASK if elapsed >= 0 else activity.mask
+        return UserStats(
+            current_streak=activity.current_streak if elapsed <= 1 else 0,
+            best_streak=activity.best_streak,
+            quizzes_taken=activity.quizzes_taken,
+            minutes_practiced=activity.minutes_practiced,
+            weekly_streak=week_from_mask(mask),
+            last_active_date=activity.last_day
+        )
+
+    def record_quiz(self, user_id: str, day: date, seconds: Optional[int]) -> Optional[UserStats]:
+        """Count a submitted quiz; returns the stats to persist, or None if the user is not loaded"""
+        activity = self._activity(user_id)
+        if activity is None:
+            return None
+        activity.quizzes_taken += 1
+        activity.minutes_practiced += (seconds + 30) // 60 if seconds else 0
+        self._mark_active(activity, day)
+        return self._stored(activity)
+
+    def record_reading(self, user_id: str, day: date, news_id: str, minutes: int) -> Optional[UserStats]:
+        """Count an article read; returns the stats to persist, or None if already read that day or not loaded"""
+        activity = self._activity(user_id)
+        if activity is None:
+            return None
+        if activity.read_day != day:
+            activity.read_day = day
+            activity.read_ids = set()
+        elif news_id in activity.read_ids:
+            return None
+        activity.read_ids.add(news_id)
+        activity.minutes_practiced += minutes
+        self._mark_active(activity, day)
+        return self._stored(activity)
+
+    def _activity(self, user_id: str) -> Optional[_Activity]:
+        activity = self._users.get(user_id)
+        if activity is None:
+            # Authenticated users were loaded by stats(); counting from zero would overwrite their stored stats
+            logger.warning("Dropping activity of user %s: stats not loaded in this process", user_id)
+            return None
+        self._users.move_to_end(user_id)
+        return activity
+
+    @staticmethod
+    def _mark_active(activity: _Activity, day: date) -> None:
+        if activity.last_day is None:
+            activity.current_streak = 1
+            activity.last_day = day
+            activity.mask = 1
+        elif day > activity.last_day:
+            elapsed = (day - activity.last_day).days
+            activity.current_streak = activity.current_streak + 1 if elapsed == 1 else 1
+            activity.last_day = day
+            activity.mask = (activity.mask << min(elapsed, WEEK_DAYS) | 1) & _WEEK_MASK
+        elif (activity.last_day - day).days < WEEK_DAYS:
+            # Late (e.g. offline-synced) activity fills in the week but never rewrites the streak
+            activity.mask |= 1 << (activity.last_day - day).days
+        activity.best_streak = max(activity.best_streak, activity.current_streak)
+
+    @staticmethod
+    def _stored(activity: _Activity) -> UserStats:
+        return UserStats(
+            current_streak=activity.current_streak,
+            best_streak=activity.best_streak,
+            quizzes_taken=activity.quizzes_taken,
+            minutes_practiced=activity.minutes_practiced,
+            weekly_streak=week_from_mask(activity.mask),
+            last_active_date=activity.last_day
+        )
@@ -0,0 +1,51 @@
+"""
+Store versions and ETag helpers for the Comrade backend
+"""
+
+import hashlib
+import os
+from typing import Any, Dict, Hashable
+
+from fastapi import Request, Response, status
+
+# Versions restart from zero with the process, so ETags are salted per boot
+_BOOT_ID = os.urandom(8).hex()
+
+
+class VersionMap:
+    """Monotonically increasing version counters keyed by store entry"""
+
+    def __init__(self):
+        self._versions: Dict[Hashable, int] = {}
+
+    def get(self, key: Hashable) -> int:
+        """Current version of a key (0 if it never changed)"""
+        return self._versions.get(key, 0)
+
+    def bump(self, key: Hashable) -> int:
+        """Record a change to a key and return its new version"""
+        version = self._versions.get(key, 0) + 1
+        self._versions[key] = version
+        return version
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag derived from the versions (and parameters) a response depends on"""
+    digest = hashlib.blake2b(repr((_BOOT_ID,) + parts).encode(), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match against an ETag (weak comparison, as RFC 9110 requires)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
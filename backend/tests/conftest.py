@@ -0,0 +1,47 @@
+"""
+Shared pytest setup for the Comrade backend tests
+"""
+
+import os
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Keep background jobs and downloads out of test runs; set before config is imported
+os.environ.setdefault("NLTK_DOWNLOAD_ENABLED", "false")
+os.environ.setdefault("RSS_INGESTION_ENABLED", "false")
+os.environ.setdefault("QUIZ_GENERATION_ENABLED", "false")
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Client for the app with its startup run once (the routers keep module-level state)"""
+    from main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Bearer headers of a freshly registered user"""
+    response = client.post("/api/v1/auth/register", json={
+        "name": "Test Cadet",
+        "email": f"cadet-{uuid.uuid4().hex[:12]}@example.org",
+        "password": "secret-password"
+    })
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def host_timezone(monkeypatch):
+    """Switch the process timezone, as if the server ran in another zone; restored afterwards"""
+    def switch(name: str) -> None:
+        monkeypatch.setenv("TZ", name)
+        time.tzset()
+
+    yield switch
+    monkeypatch.undo()
+    time.tzset()
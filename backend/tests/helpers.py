@@ -0,0 +1,42 @@
+"""
+Test data builders for the Comrade backend tests
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from models.news import NewsCategory, NewsSource
+
+BASE_TIME = datetime(2024, 5, 6, 6, 0, tzinfo=timezone.utc)
+
+
+def make_news(
+    index: int,
+    title: Optional[str] = None,
+    content: Optional[str] = None,
+    category: NewsCategory = NewsCategory.DEFENSE,
+    published_at: Optional[datetime] = None,
+    **fields
+) -> dict:
+    """News record shaped like the ones the routers store"""
+    published_at = published_at or BASE_TIME - timedelta(hours=index)
+    return {
+        "id": f"news_{index}",
+        "title": title or f"Defense update number {index} for aspirants",
+        "description": f"Summary of defense update number {index} for the daily feed.",
+        "content": content or f"Detailed report {index} on defense preparedness and training. " * 3,
+        "image_url": None,
+        "source_url": f"https://example.org/news/{index}",
+        "source": NewsSource.PIB,
+        "author": None,
+        "category": category,
+        "tags": [],
+        "read_time": 3,
+        "published_at": published_at,
+        "created_at": published_at,
+        "updated_at": None,
+        "also_reported_by": [],
+        "is_featured": False,
+        "view_count": 0,
+        **fields
+    }
@@ -0,0 +1,50 @@
+"""
+Per-day news bucket tests
+"""
+
+from datetime import date, datetime
+
+from services.daily_buckets import DailyBuckets
+from services.news_store import NewsStore, from_epoch_us, to_epoch_us
+from tests.helpers import BASE_TIME, make_news
+
+
+def test_buckets_follow_the_local_day_with_counts():
+    buckets = DailyBuckets()
+    # 06:00 UTC is 11:30 IST on the same day; 20:00 UTC the day before is 01:30 IST
+    buckets.track(make_news(1, published_at=BASE_TIME))
+    buckets.track(make_news(2, published_at=BASE_TIME.replace(day=5, hour=20)))
+    buckets.track(make_news(3, published_at=BASE_TIME.replace(day=5, hour=17)))
+
+    assert list(buckets.get(date(2024, 5, 6)).newest_first()) == ["news_1", "news_2"]
+    assert buckets.get(date(2024, 5, 6)).categories_count == {"defense": 2}
+    assert list(buckets.get(date(2024, 5, 5)).newest_first()) == ["news_3"]
+
+
+def test_moved_articles_leave_their_old_bucket():
+    buckets = DailyBuckets()
+    buckets.track(make_news(1, published_at=BASE_TIME))
+    version = buckets.get(date(2024, 5, 6)).version
+
+    buckets.track(make_news(1, published_at=BASE_TIME.replace(day=7)))
+
+    assert len(buckets.get(date(2024, 5, 6))) == 0
+    assert buckets.get(date(2024, 5, 6)).version > version
+    assert list(buckets.get(date(2024, 5, 7)).newest_first()) == ["news_1"]
+
+
+def test_naive_times_are_server_local_on_a_non_utc_host(host_timezone):
+    host_timezone("America/New_York")
+    # 15:00 in New York is 19:00 UTC, already 00:30 on the next day in IST
+    naive = datetime(2024, 5, 6, 15, 0)
+    buckets = DailyBuckets()
+    buckets.track(make_news(1, published_at=naive))
+
+    assert list(buckets.get(date(2024, 5, 7)).newest_first()) == ["news_1"]
+    assert to_epoch_us(naive) == to_epoch_us(BASE_TIME.replace(hour=19))
+    assert from_epoch_us(to_epoch_us(naive), naive=True) == naive
+
+    store = NewsStore()
+    store.add_many([make_news(1, published_at=naive), make_news(2, published_at=BASE_TIME.replace(hour=18))])
+    assert store.get("news_1")["published_at"] == naive
+    assert [news_data["id"] for news_data in store.iter_published_between(None, None)] == ["news_1", "news_2"]
@@ -0,0 +1,78 @@
+"""
+SimHash near-duplicate detection tests
+"""
+
+from services.dedup import DuplicateIndex, canonicalize_url, simhash
+
+STORY = (
+    "The Indian Navy commissioned its newest stealth frigate at Mazagon Dock in Mumbai on Monday, "
+    "adding advanced sensors, long range missiles and an indigenous combat management system to "
+    "the western fleet as part of the Project 17A programme. Officials said the frigate completed "
+    "extensive sea trials in the Arabian Sea over the past year, including weapon firings and "
+    "machinery trials, before it was accepted by the navy. The ship will be based in Mumbai and is "
+    "expected to deploy with the carrier group later this year, according to the defence ministry."
+)
+# Another outlet's copy: re-cased, re-punctuated and with one detail added
+REWORDED = STORY.upper().replace(",", "").replace("on Monday", "on Monday morning")
+UNRELATED = (
+    "The finance ministry raised the defence budget by fifteen percent, with new funds for "
+    "aircraft procurement, border roads and the modernization of army communication networks."
+)
+
+
+def distance(left: int, right: int) -> int:
+    return bin(left ^ right).count("1")
+
+
+def test_simhash_is_close_for_rewordings_and_far_for_other_stories():
+    assert distance(simhash(STORY), simhash(REWORDED)) <= 3
+    assert distance(simhash(STORY), simhash(UNRELATED)) > 10
+
+
+def test_index_finds_near_duplicates_only():
+    index = DuplicateIndex(max_distance=3)
+    index.register("news_frigate", canonicalize_url("https://example.org/frigate"), simhash(STORY))
+
+    assert index.find_similar(simhash(REWORDED)) == "news_frigate"
+    assert index.find_similar(simhash(UNRELATED)) is None
+
+
+def test_index_finds_signatures_differing_in_any_band():
+    index = DuplicateIndex(max_distance=3)
+    signature = simhash(STORY)
+    index.register("news_frigate", "https://example.org/frigate", signature)
+
+    # Flip one bit in each of three different bands
+    flipped = signature ^ (1 << 0) ^ (1 << 20) ^ (1 << 40)
+    assert index.find_similar(flipped) == "news_frigate"
+    assert index.find_similar(flipped ^ (1 << 60)) is None
+
+
+def test_canonical_urls_ignore_tracking_and_presentation_noise():
+    canonical = canonicalize_url("https://example.org/news/frigate")
+
+    assert canonicalize_url("http://www.example.org/news/frigate/?utm_source=rss&fbclid=x") == canonical
+    assert canonicalize_url("https://m.example.org/news/frigate/amp") == canonical
+    assert canonicalize_url("https://example.org/news/frigate?id=2") != canonical
+
+
+def test_canonical_urls_keep_content_bearing_parameters():
+    wire = canonicalize_url("https://example.org/story?source=reuters&utm_medium=rss")
+    release = canonicalize_url("https://example.org/story?source=mod")
+
+    assert wire == "https://example.org/story?source=reuters"
+    assert wire != release
+    assert canonicalize_url("https://example.org/story?ref=2024-117") != canonicalize_url("https://example.org/story")
+
+
+def test_discarded_articles_leave_the_index():
+    index = DuplicateIndex(max_distance=3)
+    index.register("news_frigate", "https://example.org/frigate", simhash(STORY))
+    index.register("news_frigate", "https://other.example.org/frigate")
+
+    index.discard({"id": "news_frigate"})
+
+    assert index.find_similar(simhash(REWORDED)) is None
+    assert index.lookup_url("https://example.org/frigate") is None
+    assert index.lookup_url("https://other.example.org/frigate") is None
+    assert not any(index._band_tables)
@@ -0,0 +1,81 @@
+"""
+Process-pool article enrichment tests
+"""
+
+from concurrent.futures import Executor
+
+import pytest
+
+from models.news import NewsCreate, NewsSource
+from services.enrichment import MAX_TAGS, EnrichmentStage, enrich_text
+from services.rss_ingestion import IngestedItem
+
+from tests.helpers import BASE_TIME
+
+CONTENT = (
+    "The Navy commissioned a new stealth frigate at Mumbai on Monday. "
+    "The frigate carries indigenous sensors and anti-ship missiles. "
+    "Officials said the frigate strengthens maritime patrols in the region. "
+    "Weather delayed the ceremony by an hour. "
+) * 40  # 1320 words, a seven minute read
+
+
+class RefusingExecutor(Executor):
+    """Fails the test if anything is sent to the pool"""
+
+    def submit(self, fn, *args, **kwargs):
+        raise AssertionError("cached enrichment was recomputed")
+
+
+def make_item(title: str = "Navy commissions stealth frigate", **fields) -> IngestedItem:
+    news = NewsCreate(
+        title=title,
+        description=fields.pop("description", CONTENT[:60]),
+        content=fields.pop("content", CONTENT),
+        source_url="https://example.org/news/frigate",
+        source=NewsSource.PIB,
+        **fields
+    )
+    return IngestedItem(news, BASE_TIME)
+
+
+def test_enrichment_derives_read_time_tags_and_summary():
+    enrichment = enrich_text("Navy commissions stealth frigate", CONTENT)
+
+    assert enrichment.read_time == 7
+    assert enrichment.tags[0] == "Frigate"
+    assert "Navy" in enrichment.tags
+    assert "frigate" in enrichment.summary
+    assert len(enrichment.summary) < len(CONTENT)
+
+
+@pytest.mark.asyncio
+async def test_stage_fills_fields_and_reuses_cached_results():
+    stage = EnrichmentStage(workers=1)
+    try:
+        item = make_item(tags=["Defence"])
+        enriched, = await stage.enrich([item])
+    finally:
+        stage.shutdown()
+
+    assert enriched.news.read_time == 7
+    assert enriched.news.tags[0] == "Defence"
+    assert "Frigate" in enriched.news.tags and len(enriched.news.tags) <= MAX_TAGS
+    # The description repeated the body, so it is replaced by the summary
+    assert enriched.news.description != item.news.description
+
+    stage._executor = RefusingExecutor()
+    again, = await stage.enrich([make_item(tags=["Defence"])])
+    assert again.news == enriched.news
+
+
+@pytest.mark.asyncio
+async def test_stage_keeps_feed_summaries():
+    stage = EnrichmentStage(workers=1)
+    description = "Editor's summary of the frigate commissioning, written by the feed itself for readers."
+    try:
+        enriched, = await stage.enrich([make_item(description=description)])
+    finally:
+        stage.shutdown()
+
+    assert enriched.news.description == description
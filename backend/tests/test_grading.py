@@ -0,0 +1,77 @@
+"""
+Compiled answer-key grading tests
+"""
+
+from models.quiz import QuestionType, UserAnswer
+from services.grading import AnswerKey
+
+QUESTIONS = [
+    {
+        "id": "q1", "question_type": QuestionType.MULTIPLE_CHOICE, "points": 2,
+        "question_data": {"options": ["a", "b", "c", "d"], "correct_answer_index": 2},
+    },
+    {
+        "id": "q2", "question_type": QuestionType.TRUE_FALSE, "points": 1,
+        "question_data": {"correct_answer": False},
+    },
+    {
+        "id": "q3", "question_type": QuestionType.FILL_IN_BLANK, "points": 3,
+        "question_data": {"correct_answers": ["Line of Actual Control", "LAC"]},
+    },
+]
+
+
+def answers(**values):
+    return [UserAnswer(question_id=question_id, answer=value) for question_id, value in values.items()]
+
+
+def test_all_correct_and_all_wrong():
+    key = AnswerKey(QUESTIONS)
+
+    perfect = key.grade(answers(q1=2, q2=False, q3="LAC"))
+    wrong = key.grade(answers(q1=1, q2=True, q3="McMahon Line"))
+
+    assert (perfect.points_earned, perfect.total_points, perfect.score) == (6, 6, 100)
+    assert perfect.correct == [True, True, True]
+    assert (wrong.points_earned, wrong.score, wrong.correct) == (0, 0, [False, False, False])
+
+
+def test_unanswered_questions_count_as_wrong():
+    grade = AnswerKey(QUESTIONS).grade(answers(q3="lac"))
+
+    assert grade.correct == [False, False, True]
+    assert (grade.points_earned, grade.score) == (3, 50)
+
+
+def test_fill_in_blank_answers_are_normalized():
+    key = AnswerKey(QUESTIONS)
+
+    assert key.grade(answers(q3="  line   of ACTUAL control ")).correct[2]
+    assert key.grade(answers(q3="ＬＡＣ")).correct[2]  # full-width letters fold under NFKC
+    assert not AnswerKey(QUESTIONS, normalize_unicode=False).grade(answers(q3="ＬＡＣ")).correct[2]
+
+
+def test_answers_of_the_wrong_type_never_match():
+    grade = AnswerKey(QUESTIONS).grade(answers(q1=True, q2=0, q3=None))
+
+    assert grade.correct == [False, False, False]
+
+
+def test_unknown_questions_are_reported():
+    grade = AnswerKey(QUESTIONS).grade(answers(q1=2, q9=1))
+
+    assert grade.unknown_question_ids == ["q9"]
+    assert grade.correct == [True, False, False]
+
+
+def test_batch_grading_matches_single_grading():
+    key = AnswerKey(QUESTIONS)
+    attempts = [
+        answers(q1=2, q2=False, q3="LAC"),
+        answers(q1=0),
+        answers(q2=False, q3="line of actual control"),
+        [],
+    ]
+
+    assert key.grade_many(attempts) == [key.grade(attempt) for attempt in attempts]
+    assert [grade.points_earned for grade in key.grade_many(attempts)] == [6, 0, 4, 0]
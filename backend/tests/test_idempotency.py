@@ -0,0 +1,24 @@
+"""
+Idempotency-Key replay cache tests
+"""
+
+import pytest
+
+from services.idempotency import IdempotencyCache
+
+
+async def outcome(value):
+    return value
+
+
+@pytest.mark.asyncio
+async def test_replayed_keys_are_evicted_last():
+    cache = IdempotencyCache(capacity=2)
+    await cache.run("user_1", "first", "payload", lambda: outcome(1))
+    await cache.run("user_1", "second", "payload", lambda: outcome(2))
+
+    assert await cache.run("user_1", "first", "payload", lambda: outcome(-1)) == (1, True)
+    await cache.run("user_1", "third", "payload", lambda: outcome(3))
+
+    assert await cache.run("user_1", "first", "payload", lambda: outcome(-1)) == (1, True)
+    assert await cache.run("user_1", "second", "payload", lambda: outcome(-2)) == (-2, False)
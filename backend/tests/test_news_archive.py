@@ -0,0 +1,81 @@
+"""
+News archive segment tests
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from services.clock import start_of_day
+from services.news_archive import ArchiveSegment, NewsArchive, write_segment
+from services.repository import SQLiteRepository
+from tests.helpers import BASE_TIME, make_news
+
+
+def test_segment_finds_every_article_by_id(tmp_path):
+    path = str(tmp_path / "2024-05-06.seg")
+    news_items = [make_news(index) for index in range(50)]
+    assert write_segment(path, date(2024, 5, 6), news_items) == 50
+
+    segment = ArchiveSegment(path, version=1)
+    try:
+        for news_data in news_items:
+            archived = segment.find(news_data["id"])
+            assert archived["id"] == news_data["id"]
+            assert archived["content"] == news_data["content"]
+        assert segment.find("news_missing") is None
+        assert [archived["id"] for archived in segment.newest_first()] == [
+            news_data["id"] for news_data in news_items
+        ]
+    finally:
+        segment.close()
+
+
+def test_sealing_switches_readers_only_when_applied(tmp_path):
+    archive = NewsArchive(str(tmp_path))
+    archive.open()
+    day = date(2024, 5, 6)
+    archive.seal({day: [make_news(1)]}, date(2024, 5, 7))
+    version = archive.day(day).version
+
+    # Late arrival for the sealed day, written as a worker thread would
+    sealed_days = archive.write_days({day: [make_news(2)]}, date(2024, 5, 7))
+    assert archive.get("news_2") is None
+    assert archive.day(day).version == version
+
+    assert archive.apply(sealed_days) == 2
+    assert archive.get("news_2")["id"] == "news_2"
+    assert archive.get("news_1")["id"] == "news_1"
+    assert len(archive) == 2
+    archive.close()
+
+    reopened = NewsArchive(str(tmp_path))
+    reopened.open()
+    try:
+        assert reopened.sealed_before == date(2024, 5, 7)
+        assert reopened.indexes("news_2") and not reopened.indexes("news_3")
+    finally:
+        reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_unsealed_late_arrivals_can_be_found_after_a_restart(tmp_path):
+    archive = NewsArchive(str(tmp_path / "archive"))
+    archive.open()
+    archive.seal({date(2024, 5, 6): [make_news(1)]}, date(2024, 5, 7))
+    repository = SQLiteRepository(str(tmp_path / "comrade.db"), pool_size=1)
+    await repository.connect()
+    try:
+        # Both stored; only news_1 made it into a segment before the crash
+        await repository.save_news([
+            make_news(1), make_news(2), make_news(3, published_at=BASE_TIME + timedelta(days=2))
+        ])
+
+        before = start_of_day(archive.sealed_before)
+        late_ids = [news_id for news_id in await repository.list_news_ids(before) if not archive.indexes(news_id)]
+
+        assert late_ids == ["news_2"]
+        assert [news_data["id"] for news_data in await repository.get_news(late_ids)] == ["news_2"]
+    finally:
+        await repository.close()
+        archive.close()
@@ -0,0 +1,76 @@
+"""
+Bulk news ingestion API tests
+"""
+
+import json
+
+import pytest
+
+from config import settings
+
+IMPORTER_TOKEN = "importer-test-token"
+
+
+def bulk_item(index: int) -> dict:
+    return {
+        "title": f"Bulk imported defense story number {index}",
+        "description": "A story imported through the bulk endpoint for testing.",
+        "content": "Content of a story imported through the bulk endpoint, long enough to validate.",
+        "source_url": f"https://example.org/bulk/{index}",
+        "source": "Press Information Bureau",
+    }
+
+
+@pytest.fixture
+def importer_token(monkeypatch):
+    monkeypatch.setattr(settings, "news_importer_token", IMPORTER_TOKEN)
+    return {"X-Importer-Token": IMPORTER_TOKEN}
+
+
+def test_regular_users_cannot_bulk_ingest(client, auth_headers, importer_token):
+    response = client.post("/api/v1/news/bulk", headers=auth_headers, json=[bulk_item(1)])
+
+    assert response.status_code == 403
+
+
+def test_endpoint_is_closed_without_a_configured_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "news_importer_token", None)
+
+    response = client.post("/api/v1/news/bulk", headers={"X-Importer-Token": ""}, json=[bulk_item(1)])
+
+    assert response.status_code == 403
+
+
+def test_importer_can_bulk_ingest(client, importer_token):
+    body = "\n".join(json.dumps(bulk_item(index)) for index in (1, 2)) + "\n{not json}\n"
+
+    response = client.post(
+        "/api/v1/news/bulk",
+        headers={**importer_token, "Content-Type": "application/x-ndjson"},
+        content=body
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["received"] == 3
+    assert response.json()["failed"] == 1
+    assert [news_id is not None for news_id in response.json()["news_ids"]] == [True, True, False]
+
+
+def test_oversized_body_is_refused_by_content_length(client, importer_token, monkeypatch):
+    monkeypatch.setattr(settings, "news_bulk_max_bytes", 64)
+
+    response = client.post("/api/v1/news/bulk", headers=importer_token, json=[bulk_item(1)])
+
+    assert response.status_code == 413
+
+
+def test_oversized_chunked_body_is_refused_while_streaming(client, importer_token, monkeypatch):
+    monkeypatch.setattr(settings, "news_bulk_max_bytes", 64)
+
+    def chunks():
+        for _ in range(10):
+            yield b"[" + b" " * 30
+
+    response = client.post("/api/v1/news/bulk", headers=importer_token, content=chunks())
+
+    assert response.status_code == 413
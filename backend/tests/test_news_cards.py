@@ -0,0 +1,39 @@
+"""
+Compact card view tests for the news list endpoints
+"""
+
+from config import settings
+from services.response_cache import make_excerpt
+
+
+def test_excerpts_end_on_a_word_boundary():
+    assert make_excerpt("Short content", 50) == "Short content"
+    assert make_excerpt("Navy commissions a new frigate today", 20) == "Navy commissions a…"
+
+
+def test_full_view_is_the_default(client, auth_headers):
+    news = client.get("/api/v1/news/", headers=auth_headers).json()["news"]
+
+    assert news and all("content" in news_data for news_data in news)
+
+
+def test_card_view_omits_content(client, auth_headers):
+    news = client.get("/api/v1/news/", params={"view": "card"}, headers=auth_headers).json()["news"]
+
+    assert news
+    for news_data in news:
+        assert "content" not in news_data
+        assert "created_at" not in news_data
+        assert news_data["excerpt"] is None
+        assert {"id", "title", "view_count", "is_bookmarked"} <= set(news_data)
+
+
+def test_card_view_adds_excerpts_on_request(client, auth_headers):
+    news = client.get(
+        "/api/v1/news/", params={"view": "card", "excerpt": "true"}, headers=auth_headers
+    ).json()["news"]
+
+    for news_data in news:
+        full = client.get(f"/api/v1/news/{news_data['id']}", headers=auth_headers).json()
+        assert news_data["excerpt"] == make_excerpt(full["content"], settings.news_card_excerpt_chars)
+        assert len(news_data["excerpt"]) <= settings.news_card_excerpt_chars + 1
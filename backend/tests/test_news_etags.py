@@ -0,0 +1,47 @@
+"""
+ETag and 304 tests for the polled news endpoints
+"""
+
+import pytest
+
+from services.clock import local_date
+
+LISTINGS = ["/api/v1/news/", "/api/v1/news/daily"]
+
+
+def listing_params(path: str) -> dict:
+    """Query parameters that make the listing include news_1"""
+    if not path.endswith("/daily"):
+        return {}
+    from routers.news_router import news_store
+    return {"date": local_date(news_store.get("news_1")["published_at"]).isoformat()}
+
+
+def view_counts(payload: dict) -> dict:
+    return {news_data["id"]: news_data["view_count"] for news_data in payload["news"]}
+
+
+@pytest.mark.parametrize("path", LISTINGS)
+def test_unchanged_listing_is_not_modified(client, auth_headers, path):
+    first = client.get(path, params=listing_params(path), headers=auth_headers)
+
+    again = client.get(
+        path, params=listing_params(path), headers={**auth_headers, "If-None-Match": first.headers["ETag"]}
+    )
+
+    assert again.status_code == 304
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+
+@pytest.mark.parametrize("path", LISTINGS)
+def test_views_change_the_etag_of_listings_showing_counts(client, auth_headers, path):
+    first = client.get(path, params=listing_params(path), headers=auth_headers)
+
+    client.get("/api/v1/news/news_1", headers=auth_headers)
+    again = client.get(
+        path, params=listing_params(path), headers={**auth_headers, "If-None-Match": first.headers["ETag"]}
+    )
+
+    assert again.status_code == 200
+    assert again.headers["ETag"] != first.headers["ETag"]
+    assert view_counts(again.json())["news_1"] == view_counts(first.json())["news_1"] + 1
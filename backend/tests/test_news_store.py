@@ -0,0 +1,78 @@
+"""
+News store cursor pagination tests
+"""
+
+from datetime import timedelta
+
+from models.news import NewsCategory
+from services.news_store import NewsStore, decode_cursor, encode_cursor
+
+from tests.helpers import BASE_TIME, make_news
+
+
+def page_through(store: NewsStore, per_page: int, **filters):
+    """Follow cursors the way GET /news does, returning the IDs of each page"""
+    pages = []
+    before = None
+    while True:
+        page = []
+        for news_data in store.iter_newest(before=before, **filters):
+            page.append(news_data["id"])
+            if len(page) == per_page:
+                break
+        if not page:
+            return pages
+        pages.append(page)
+        before = decode_cursor(encode_cursor(store.key_of(page[-1])))
+
+
+def test_cursor_pages_cover_every_item_once_newest_first():
+    store = NewsStore()
+    store.add_many([make_news(index) for index in range(7)])
+
+    pages = page_through(store, per_page=3)
+
+    assert pages == [["news_0", "news_1", "news_2"], ["news_3", "news_4", "news_5"], ["news_6"]]
+
+
+def test_cursor_is_stable_when_newer_items_arrive():
+    store = NewsStore()
+    store.add_many([make_news(index) for index in range(1, 5)])
+    first_page = [news_data["id"] for news_data in store.iter_newest()][:2]
+    cursor = encode_cursor(store.key_of(first_page[-1]))
+
+    store.add(make_news(0, published_at=BASE_TIME + timedelta(hours=1)))
+    rest = [news_data["id"] for news_data in store.iter_newest(before=decode_cursor(cursor))]
+
+    assert first_page == ["news_1", "news_2"]
+    assert rest == ["news_3", "news_4"]
+
+
+def test_cursor_breaks_published_at_ties_by_id():
+    store = NewsStore()
+    store.add_many([make_news(index, published_at=BASE_TIME) for index in range(4)])
+
+    pages = page_through(store, per_page=2)
+
+    assert pages == [["news_3", "news_2"], ["news_1", "news_0"]]
+
+
+def test_cursor_paging_with_category_filter():
+    store = NewsStore()
+    store.add_many([
+        make_news(index, category=NewsCategory.DEFENSE if index % 2 else NewsCategory.ECONOMY)
+        for index in range(6)
+    ])
+
+    pages = page_through(store, per_page=2, category=NewsCategory.DEFENSE)
+
+    assert pages == [["news_1", "news_3"], ["news_5"]]
+
+
+def test_malformed_cursor_is_rejected():
+    for cursor in ("not-a-cursor!", encode_cursor((1, "x"))[:-3] + "@@"):
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            continue
+        raise AssertionError(f"{cursor!r} was accepted")
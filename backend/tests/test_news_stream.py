@@ -0,0 +1,60 @@
+"""
+Server-Sent Events hub tests
+"""
+
+from services.news_stream import NewsStreamHub
+
+
+def make_hub(queue_size: int = 5, buffer_size: int = 50) -> NewsStreamHub:
+    return NewsStreamHub(lambda news_data: b"{}", queue_size=queue_size, buffer_size=buffer_size)
+
+
+def last_id(hub: NewsStreamHub) -> str:
+    return f"{hub._epoch}-{hub._sequence}"
+
+
+def test_resume_replays_missed_events():
+    hub = make_hub()
+    hub.publish("article", "defense", b'{"n":1}')
+    resume_from = last_id(hub)
+    hub.publish("article", "defense", b'{"n":2}')
+    hub.publish("article", "economy", b'{"n":3}')
+
+    subscriber = hub.subscribe({"defense"}, resume_from)
+
+    assert len(subscriber.frames) == 1
+    assert b'{"n":2}' in subscriber.frames[0]
+
+
+def test_backlog_larger_than_the_outbox_sends_a_reset_instead():
+    hub = make_hub(queue_size=5)
+    resume_from = f"{hub._epoch}-0"
+    for index in range(8):
+        hub.publish("article", "defense", b'{"n":%d}' % index)
+
+    subscriber = hub.subscribe(None, resume_from)
+    hub.publish("article", "defense", b'{"n":8}')
+
+    assert subscriber in hub._subscribers
+    assert b"event: reset" in subscriber.frames[0]
+    assert len(subscriber.frames) == 2
+    assert hub.dropped_subscribers == 0
+
+
+def test_slow_subscribers_are_dropped():
+    hub = make_hub(queue_size=2)
+    subscriber = hub.subscribe()
+    for index in range(3):
+        hub.publish("article", "defense", b"{}")
+
+    assert subscriber.closed
+    assert hub.dropped_subscribers == 1
+
+
+def test_unknown_event_ids_get_a_reset():
+    hub = make_hub()
+    hub.publish("article", "defense", b"{}")
+
+    subscriber = hub.subscribe(None, "stale-epoch-1")
+
+    assert b"event: reset" in subscriber.frames[0]
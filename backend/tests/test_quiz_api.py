@@ -0,0 +1,132 @@
+"""
+Quiz submission API tests
+"""
+
+import uuid
+from datetime import datetime, time as day_time, timezone
+
+import pytest
+
+from services.clock import local_tz, today
+
+PERFECT_ANSWERS = [
+    {"question_id": "q1", "answer": 0},
+    {"question_id": "q2", "answer": True},
+    {"question_id": "q3", "answer": "line of actual control"},
+    {"question_id": "q4", "answer": 0},
+]
+
+
+@pytest.fixture
+def utc_host(monkeypatch, host_timezone):
+    """Run as a UTC host at 00:30 IST today, still yesterday in server-local time; yields today"""
+    local_day = today()
+    frozen = datetime.combine(local_day, day_time(0, 30), tzinfo=local_tz).astimezone(timezone.utc)
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return frozen.replace(tzinfo=None) if tz is None else frozen.astimezone(tz)
+
+    host_timezone("UTC")
+    monkeypatch.setattr("routers.quiz_router.datetime", FrozenDatetime)
+    return local_day
+
+
+def submit(client, headers, answers, idempotency_key=None, time_taken=300):
+    if idempotency_key:
+        headers = {**headers, "Idempotency-Key": idempotency_key}
+    return client.post("/api/v1/quiz/daily_quiz_1/submit", headers=headers, json={
+        "quiz_id": "daily_quiz_1", "answers": answers, "time_taken": time_taken
+    })
+
+
+def test_submission_is_graded(client, auth_headers):
+    response = submit(client, auth_headers, PERFECT_ANSWERS[:2])
+
+    assert response.status_code == 200
+    assert response.json()["points_earned"] == 3
+    assert response.json()["score"] == 37
+
+
+def test_retried_submission_is_replayed_not_recounted(client, auth_headers):
+    key = str(uuid.uuid4())
+    first = submit(client, auth_headers, PERFECT_ANSWERS, key)
+    retry = submit(client, auth_headers, PERFECT_ANSWERS, key)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.json() == first.json()
+    me = client.get("/api/v1/auth/me", headers=auth_headers).json()
+    assert me["stats"]["quizzes_taken"] == 1
+
+
+def test_reused_key_with_a_different_payload_is_rejected(client, auth_headers):
+    key = str(uuid.uuid4())
+    submit(client, auth_headers, PERFECT_ANSWERS, key)
+
+    response = submit(client, auth_headers, PERFECT_ANSWERS[:1], key)
+
+    assert response.status_code == 422
+
+
+def test_keys_are_scoped_per_user(client, auth_headers):
+    other = client.post("/api/v1/auth/register", json={
+        "name": "Other Cadet", "email": f"other-{uuid.uuid4().hex[:12]}@example.org", "password": "secret-password"
+    }).json()
+    other_headers = {"Authorization": f"Bearer {other['access_token']}"}
+    key = str(uuid.uuid4())
+
+    mine = submit(client, auth_headers, PERFECT_ANSWERS, key)
+    theirs = submit(client, other_headers, PERFECT_ANSWERS, key)
+
+    assert "Idempotent-Replayed" not in theirs.headers
+    assert theirs.json()["id"] != mine.json()["id"]
+
+
+def test_history_lists_summaries_with_same_day_resubmissions_replaced(client, auth_headers):
+    submit(client, auth_headers, PERFECT_ANSWERS[:1])
+    resubmitted = submit(client, auth_headers, PERFECT_ANSWERS).json()
+
+    history = client.get("/api/v1/quiz/history", headers=auth_headers).json()
+
+    assert [result["id"] for result in history] == [resubmitted["id"]]
+    assert history[0]["quiz"]["id"] == "daily_quiz_1"
+    assert history[0]["points_earned"] == resubmitted["points_earned"]
+    assert "questions_with_answers" not in history[0] and "user_answers" not in history[0]
+
+
+def test_history_expands_answers_on_request(client, auth_headers):
+    submitted = submit(client, auth_headers, PERFECT_ANSWERS).json()
+
+    history = client.get(
+        "/api/v1/quiz/history", params={"limit": 1, "include_answers": "true"}, headers=auth_headers
+    ).json()
+
+    assert [result["id"] for result in history] == [submitted["id"]]
+    assert [question["id"] for question in history[0]["questions_with_answers"]] == ["q1", "q2", "q3", "q4"]
+    assert history[0]["questions_with_answers"][0]["correct_answer_index"] == 0
+    assert len(history[0]["user_answers"]) == len(PERFECT_ANSWERS)
+
+
+def test_submission_after_local_midnight_counts_for_the_local_day(client, auth_headers, utc_host):
+    assert submit(client, auth_headers, PERFECT_ANSWERS).status_code == 200
+
+    daily = client.get("/api/v1/quiz/daily", params={"date": utc_host.isoformat()}, headers=auth_headers).json()
+
+    assert daily["has_attempted"] is True
+    assert daily["result"]["points_earned"] == 8
+
+
+def test_leaderboard_ranks_submissions_on_the_local_day_with_names(client, auth_headers, utc_host):
+    me = client.get("/api/v1/auth/me", headers=auth_headers).json()
+    submit(client, auth_headers, PERFECT_ANSWERS, time_taken=1)
+
+    board = client.get(
+        "/api/v1/quiz/daily_quiz_1/leaderboard", params={"date": utc_host.isoformat(), "limit": 100}, headers=auth_headers
+    ).json()
+
+    entry = next(entry for entry in board["entries"] if entry["user_id"] == me["id"])
+    assert entry["name"] == me["name"]
+    assert entry["score"] == 100
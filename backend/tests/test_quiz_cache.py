@@ -0,0 +1,101 @@
+"""
+Assembled quiz cache and question index tests
+"""
+
+from datetime import datetime
+
+import pytest
+
+from models.quiz import DifficultyLevel, QuestionType, UserAnswer
+from services.quiz_cache import QuizCache
+from services.repository import MemoryRepository
+
+
+def quiz(quiz_id: str, total_questions: int = 2) -> dict:
+    return {
+        "id": quiz_id, "title": f"Quiz {quiz_id}", "description": None, "time_limit": 10,
+        "passing_score": 60, "is_daily": False, "is_active": True, "tags": [],
+        "total_questions": total_questions, "total_points": 2 * total_questions,
+        "created_at": datetime(2024, 5, 6, 6, 0),
+    }
+
+
+def question(question_id: str, quiz_id: str, correct_answer_index: int = 1) -> dict:
+    return {
+        "id": question_id, "quiz_id": quiz_id, "question_text": f"Question {question_id}?",
+        "question_type": QuestionType.MULTIPLE_CHOICE, "difficulty": DifficultyLevel.EASY,
+        "tags": [], "points": 2, "explanation": "Because.",
+        "question_data": {"options": ["a", "b", "c"], "correct_answer_index": correct_answer_index},
+    }
+
+
+async def seeded() -> MemoryRepository:
+    repository = MemoryRepository()
+    await repository.save_quiz(quiz("quiz_1"))
+    await repository.save_quiz(quiz("quiz_2", 1))
+    await repository.save_questions([question("q2", "quiz_1"), question("q1", "quiz_1"), question("q3", "quiz_2")])
+    return repository
+
+
+@pytest.mark.asyncio
+async def test_question_index_keeps_quiz_order_and_follows_moves():
+    repository = await seeded()
+    assert [q["id"] for q in await repository.list_questions("quiz_1")] == ["q2", "q1"]
+
+    await repository.save_questions([question("q2", "quiz_2"), question("q1", "quiz_1", 2)])
+
+    assert [q["id"] for q in await repository.list_questions("quiz_1")] == ["q1"]
+    assert [q["id"] for q in await repository.list_questions("quiz_2")] == ["q3", "q2"]
+    assert (await repository.list_questions("quiz_1"))[0]["question_data"]["correct_answer_index"] == 2
+
+
+@pytest.mark.asyncio
+async def test_quizzes_are_assembled_once():
+    repository = await seeded()
+    cache = QuizCache(repository)
+
+    cached = await cache.get("quiz_1")
+
+    assert await cache.get("quiz_1") is cached
+    assert await cache.get("missing") is None
+    assert [q.id for q in cached.with_questions.questions] == ["q2", "q1"]
+    assert [q.correct_answer_index for q in cached.answer_key] == [1, 1]
+    assert cached.grading_key.grade([UserAnswer(question_id="q1", answer=1)]).points_earned == 2
+    assert b'"correct_answer_index"' not in cached.with_questions_json
+
+
+@pytest.mark.asyncio
+async def test_edited_questions_invalidate_their_old_and_new_quizzes():
+    repository = await seeded()
+    cache = QuizCache(repository)
+    first, second = await cache.get("quiz_1"), await cache.get("quiz_2")
+    versions = (cache.versions.get("quiz_1"), cache.versions.get("quiz_2"))
+
+    moved = question("q2", "quiz_2")
+    await repository.save_questions([moved])
+    cache.invalidate_questions([moved])
+
+    assert len(cache) == 0
+    assert (cache.versions.get("quiz_1"), cache.versions.get("quiz_2")) != versions
+    assert [q["id"] for q in (await cache.get("quiz_1")).questions] == ["q1"]
+    assert [q["id"] for q in (await cache.get("quiz_2")).questions] == ["q3", "q2"]
+    assert await cache.get("quiz_1") is not first and await cache.get("quiz_2") is not second
+
+
+@pytest.mark.asyncio
+async def test_loads_racing_an_edit_are_not_kept():
+    repository = await seeded()
+    cache = QuizCache(repository)
+    list_questions = repository.list_questions
+
+    async def edited_while_loading(quiz_id):
+        questions = await list_questions(quiz_id)
+        cache.invalidate(quiz_id)
+        return questions
+
+    repository.list_questions = edited_while_loading
+    assert await cache.get("quiz_1") is not None
+    assert len(cache) == 0
+
+    repository.list_questions = list_questions
+    assert await cache.get("quiz_1") is await cache.get("quiz_1")
@@ -0,0 +1,123 @@
+"""
+Daily quiz generation tests
+"""
+
+import random
+from datetime import date, datetime
+
+import pytest
+
+from models.news import NewsCategory
+from models.quiz import QuestionType
+from services.quiz_generation import (
+    BLANK, DistractorPool, QuizGenerator, build_daily_quiz, extract_facts, find_entities
+)
+
+from tests.helpers import make_news
+
+ARTICLES = [
+    (NewsCategory.DEFENSE, "Navy commissions INS Vikrant", (
+        "The Indian Navy commissioned INS Vikrant at Kochi after extensive sea trials. "
+        "The carrier was built by Cochin Shipyard over more than a decade of work. "
+        "Officials said the ship will operate with the Western Fleet from next year."
+    )),
+    (NewsCategory.DEFENSE, "Army exercise held in Ladakh", (
+        "The Indian Army held a high altitude exercise near Leh with armoured units. "
+        "Troops practised logistics along the Line of Actual Control for two weeks. "
+        "Commanders from the Northern Command reviewed the drills on the final day."
+    )),
+    (NewsCategory.INTERNATIONAL, "Joint drill with France", (
+        "India and France began the Varuna naval exercise in the Arabian Sea on Monday. "
+        "Ships from the French Navy joined destroyers of the Eastern Fleet for the drill. "
+        "The exercise was first held in 2001 and has grown every year since then."
+    )),
+]
+
+
+def day_news() -> list:
+    return [
+        make_news(index, title=title, content=content, category=category)
+        for index, (category, title, content) in enumerate(ARTICLES)
+    ]
+
+
+def day_facts() -> list:
+    return [
+        extract_facts(news_data["id"], news_data["category"].value, news_data["title"], news_data["content"])
+        for news_data in day_news()
+    ]
+
+
+def test_entities_skip_sentence_initial_words_and_keep_connectors():
+    entities = [text for _, text in find_entities("The troops patrol the Line of Actual Control since 2020.")]
+
+    assert entities == ["Line of Actual Control", "2020"]
+
+
+def test_clozes_blank_an_entity_that_occurs_once():
+    facts = day_facts()[1]
+
+    assert facts.clozes
+    for cloze in facts.clozes:
+        assert cloze.sentence.count(cloze.answer) == 1
+        assert cloze.sentence[cloze.start:cloze.start + len(cloze.answer)] == cloze.answer
+    assert "Line of Actual Control" in facts.entities
+
+
+def test_distractors_match_the_answer_shape():
+    pool = DistractorPool(day_facts())
+
+    assert pool.draw("2001", NewsCategory.INTERNATIONAL.value, 3, random.Random(1)) == []
+    names = pool.draw("Kochi", NewsCategory.DEFENSE.value, 3, random.Random(1))
+    assert len(names) == 3 and "Kochi" not in names
+    assert all(not name.isupper() and not name.isdigit() for name in names)
+
+
+def test_daily_quiz_is_deterministic_per_date():
+    created_at = datetime(2024, 5, 6, 23, 30)
+    quiz_data, questions = build_daily_quiz("daily_quiz_x", date(2024, 5, 7), day_facts(), 6, created_at)
+    again = build_daily_quiz("daily_quiz_x", date(2024, 5, 7), day_facts(), 6, created_at)
+
+    assert (quiz_data, questions) == again
+    assert quiz_data["is_daily"] and quiz_data["total_questions"] == len(questions) == 6
+    assert quiz_data["total_points"] == sum(question["points"] for question in questions)
+    assert [question["id"] for question in questions] == [f"daily_quiz_x_q{index}" for index in range(1, 7)]
+    for question in questions:
+        answer_data = question["question_data"]
+        if question["question_type"] == QuestionType.MULTIPLE_CHOICE:
+            answer = answer_data["options"][answer_data["correct_answer_index"]]
+            assert question["question_text"].replace(BLANK, answer) in question["explanation"]
+        elif question["question_type"] == QuestionType.FILL_IN_BLANK:
+            assert BLANK in question["question_text"]
+            assert question["question_text"].replace(BLANK, answer_data["correct_answers"][0]) in question["explanation"]
+
+
+@pytest.fixture
+def generator():
+    quiz_generator = QuizGenerator(workers=1)
+    yield quiz_generator
+    quiz_generator.shutdown()
+
+
+def test_generated_daily_quiz_is_served_and_never_regenerated(client, auth_headers, generator, monkeypatch):
+    from routers import news_router, quiz_router
+    quiz_date = date(2031, 1, 2)
+    monkeypatch.setattr(news_router, "news_of_day", lambda day: day_news() if day == date(2031, 1, 1) else [])
+
+    quiz_id = client.portal.call(quiz_router.generate_daily_quiz, generator, quiz_date)
+    daily = client.get("/api/v1/quiz/daily", params={"date": "2031-01-02"}, headers=auth_headers).json()
+
+    assert quiz_id == "daily_quiz_2031-01-02"
+    assert daily["quiz"]["id"] == quiz_id
+    assert "correct_answer_index" not in str(daily["quiz"]["questions"])
+
+    monkeypatch.setattr(news_router, "news_of_day", lambda day: day_news()[:1])
+    assert client.portal.call(quiz_router.generate_daily_quiz, generator, quiz_date) == quiz_id
+    assert client.get("/api/v1/quiz/daily", params={"date": "2031-01-02"}, headers=auth_headers).json() == daily
+
+
+def test_days_without_enough_news_get_no_quiz(client, generator, monkeypatch):
+    from routers import news_router, quiz_router
+    monkeypatch.setattr(news_router, "news_of_day", lambda day: [])
+
+    assert client.portal.call(quiz_router.generate_daily_quiz, generator, date(2031, 2, 2)) is None
@@ -0,0 +1,108 @@
+"""
+TF-IDF related article tests
+"""
+
+from services.related import BATCH_ROWS, RelatedArticles
+
+from tests.helpers import make_news
+
+TOPICS = {
+    "navy": "Navy frigate commissioned with missiles radar and sonar for maritime patrol duties.",
+    "economy": "Reserve bank holds repo rate as inflation eases and growth outlook improves.",
+    "space": "Isro launches satellite aboard rocket into orbit for earth observation mission.",
+}
+
+
+def topic_news(index: int, topic: str, **fields) -> dict:
+    text = TOPICS[topic]
+    return make_news(
+        index,
+        title=f"{topic.title()} story {index}: {text[:40]}",
+        content=f"{text} Report {index} adds detail. " * 3,
+        description=text,
+        **fields
+    )
+
+
+def build(*articles: dict, neighbours: int = 10) -> RelatedArticles:
+    engine = RelatedArticles(neighbours)
+    for news_data in articles:
+        engine.track(news_data)
+    return engine
+
+
+def test_articles_are_related_within_their_topic():
+    engine = build(
+        topic_news(0, "navy"), topic_news(1, "economy"), topic_news(2, "navy"),
+        topic_news(3, "space"), topic_news(4, "economy"),
+    )
+
+    assert engine.related("news_0") == ["news_2"]
+    assert engine.related("news_4") == ["news_1"]
+    assert engine.related("news_3") == []
+
+
+def test_later_articles_join_existing_neighbour_lists():
+    engine = build(topic_news(0, "navy"), topic_news(1, "economy"))
+    assert engine.related("news_0") == []
+
+    engine.track(topic_news(2, "navy"))
+    engine.track(topic_news(3, "navy", tags=["Navy"]))
+
+    assert set(engine.related("news_0")) == {"news_2", "news_3"}
+    assert len(engine.related("news_0", limit=1)) == 1
+    assert engine.version == 2
+
+
+def test_full_lists_keep_only_the_best_neighbours():
+    ports = ["Mumbai", "Kochi", "Visakhapatnam", "Karwar"]
+    articles = [
+        {**topic_news(index, "navy"), "description": f"{TOPICS['navy']} Based at {port}."}
+        for index, port in enumerate(ports)
+    ]
+    engine = build(*articles, neighbours=2)
+    assert len(engine.related("news_0")) == 2
+
+    # A copy of news_0 beats every neighbour it already has
+    engine.track({**articles[0], "id": "news_copy"})
+
+    assert engine.related("news_0")[0] == "news_copy"
+    assert len(engine.related("news_0")) == 2
+
+
+def test_discarded_and_reworded_articles_leave_the_lists():
+    navy, economy = topic_news(0, "navy"), topic_news(1, "economy")
+    engine = build(navy, topic_news(2, "navy"), economy)
+    assert engine.related("news_2") == ["news_0"]
+
+    engine.discard(navy)
+    assert engine.related("news_2") == []
+    assert len(engine) == 2
+
+    engine.track(topic_news(1, "navy"))
+    assert engine.related("news_2") == ["news_1"]
+
+
+def test_compaction_keeps_live_articles():
+    articles = [topic_news(index, "economy") for index in range(BATCH_ROWS + 4)]
+    engine = build(*articles, topic_news(1000, "navy"), topic_news(1001, "navy"))
+    engine.refresh()
+
+    for news_data in articles:
+        engine.discard(news_data)
+
+    assert len(engine) == 2
+    assert engine.related("news_1000") == ["news_1001"]
+    engine.track(topic_news(1002, "navy"))
+    assert set(engine.related("news_1000")) == {"news_1001", "news_1002"}
+
+
+def test_related_endpoint(client, auth_headers):
+    assert client.get("/api/v1/news/missing/related", headers=auth_headers).status_code == 404
+
+    response = client.get("/api/v1/news/news_1/related", params={"limit": 3}, headers=auth_headers)
+
+    assert response.status_code == 200
+    related = response.json()
+    assert len(related) <= 3
+    assert all("content" not in news_data and news_data["id"] != "news_1" for news_data in related)
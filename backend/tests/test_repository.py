@@ -0,0 +1,198 @@
+"""
+Repository tests for the memory and SQLite backends
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from services.repository import MemoryRepository, Repository, SQLiteRepository
+
+
+def result(index: int) -> dict:
+    return {
+        "id": f"result_{index}", "user_id": "user_1", "quiz_id": "quiz_1", "score": index,
+        "points_earned": index, "total_points": 10, "time_taken": None, "passed": False,
+        "submitted_at": datetime(2024, 5, 6, 10, index), "answers": []
+    }
+
+
+def test_repository_base_is_abstract():
+    with pytest.raises(TypeError):
+        Repository()
+    assert isinstance(MemoryRepository(), Repository)
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_the_batch_in_flight_and_drains_the_queue(tmp_path):
+    path = str(tmp_path / "comrade.db")
+    repository = SQLiteRepository(path, pool_size=1)
+    await repository.connect()
+    commit = repository._commit
+    started = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def slow_commit(writes):
+        loop.call_soon_threadsafe(started.set)
+        time.sleep(0.2)
+        return commit(writes)
+
+    repository._commit = slow_commit
+    repository.queue_result("key_1", result(1))
+    token_write = asyncio.create_task(repository.save_token("token_1", {"user_id": "user_1"}))
+    await started.wait()
+    # Queued while the first batch is still committing in its worker thread
+    repository.queue_result("key_2", result(2))
+    await repository.close()
+
+    assert token_write.done() and token_write.exception() is None
+    reopened = SQLiteRepository(path, pool_size=1)
+    await reopened.connect()
+    try:
+        assert await reopened.count_results() == 2
+        assert (await reopened.get_token("token_1"))["user_id"] == "user_1"
+    finally:
+        await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_retried_not_dropped(tmp_path):
+    path = str(tmp_path / "comrade.db")
+    repository = SQLiteRepository(path, pool_size=1, retry_delay=0.01)
+    await repository.connect()
+    commit = repository._commit
+    attempts = []
+
+    def flaky_commit(writes):
+        attempts.append(len(writes))
+        if len(attempts) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return commit(writes)
+
+    repository._commit = flaky_commit
+    repository.queue_result("key_1", result(1))
+    for _ in range(100):
+        if len(attempts) >= 2 and not repository._has_pending():
+            break
+        await asyncio.sleep(0.01)
+
+    assert len(attempts) == 2
+    assert (await repository.get_result("key_1"))["id"] == "result_1"
+    await repository.close()
+
+
+@pytest.mark.asyncio
+async def test_newer_rows_win_over_requeued_ones(tmp_path):
+    repository = SQLiteRepository(str(tmp_path / "comrade.db"), pool_size=1, retry_delay=0.05)
+    await repository.connect()
+    commit = repository._commit
+    loop = asyncio.get_running_loop()
+    failed = asyncio.Event()
+    calls = []
+
+    def failing_once(writes):
+        calls.append(writes)
+        if len(calls) == 1:
+            loop.call_soon_threadsafe(failed.set)
+            raise sqlite3.OperationalError("disk I/O error")
+        return commit(writes)
+
+    repository._commit = failing_once
+    repository.queue_result("key_1", result(1))
+    await failed.wait()
+    repository.queue_result("key_1", {**result(1), "score": 9})
+    await repository.close()
+
+    reopened = SQLiteRepository(str(tmp_path / "comrade.db"), pool_size=1)
+    await reopened.connect()
+    try:
+        assert (await reopened.get_result("key_1"))["score"] == 9
+    finally:
+        await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_reads_news_from_the_store_without_copies():
+    from services.news_store import NewsStore
+    from tests.helpers import BASE_TIME, make_news
+
+    repository = MemoryRepository()
+    store = NewsStore()
+    repository.attach_news_store(store)
+    store.add_listener(repository.queue_news)
+    store.add_many([make_news(index) for index in range(3)])
+
+    assert not hasattr(repository, "news")
+    assert [news_data["id"] for news_data in await repository.load_news()] == ["news_2", "news_1", "news_0"]
+    since = BASE_TIME.replace(hour=BASE_TIME.hour - 1)
+    assert [news_data["id"] for news_data in await repository.load_news(since)] == ["news_1", "news_0"]
+
+
+@pytest.mark.asyncio
+async def test_users_are_loaded_in_one_batch(tmp_path):
+    repository = SQLiteRepository(str(tmp_path / "comrade.db"), pool_size=1)
+    await repository.connect()
+    try:
+        for index in range(3):
+            await repository.save_user({"id": f"user_{index}", "name": f"Cadet {index}", "email": None})
+
+        users = await repository.get_users(["user_2", "user_missing", "user_0", "user_2"])
+
+        assert {user_id: user["name"] for user_id, user in users.items()} == {"user_2": "Cadet 2", "user_0": "Cadet 0"}
+    finally:
+        await repository.close()
+
+
+@pytest.mark.asyncio
+async def test_rows_stay_readable_while_their_batch_commits(tmp_path):
+    repository = SQLiteRepository(str(tmp_path / "comrade.db"), pool_size=1)
+    await repository.connect()
+    await repository.save_user({"id": "user_1", "name": "Cadet", "email": None, "stats": {"quizzes_taken": 0}})
+    commit = repository._commit
+    started = asyncio.Event()
+    release = threading.Event()
+    loop = asyncio.get_running_loop()
+
+    def slow_commit(writes):
+        loop.call_soon_threadsafe(started.set)
+        release.wait(5)
+        return commit(writes)
+
+    repository._commit = slow_commit
+    try:
+        repository.queue_result("key_1", result(1))
+        repository.queue_user_stats("user_1", {"quizzes_taken": 1})
+        await started.wait()
+
+        assert (await repository.get_result("key_1"))["id"] == "result_1"
+        assert [item["id"] for item in await repository.list_results("user_1", 10)] == ["result_1"]
+        assert [item["id"] for item in await repository.load_results(datetime(2024, 5, 6))] == ["result_1"]
+        assert (await repository.get_user("user_1"))["stats"] == {"quizzes_taken": 1}
+
+        # A retake queued mid-commit replaces the committing row under the same key
+        repository.queue_result("key_1", {**result(2), "id": "result_retake"})
+        assert [item["id"] for item in await repository.list_results("user_1", 10)] == ["result_retake"]
+    finally:
+        release.set()
+        await repository.close()
+
+
+@pytest.mark.asyncio
+async def test_memory_results_are_listed_newest_first_from_the_user_index():
+    repository = MemoryRepository()
+    for index in (3, 1, 2):
+        await repository.save_result(f"key_{index}", result(index))
+    await repository.save_result("key_other", {**result(9), "user_id": "user_2"})
+
+    assert [row["id"] for row in await repository.list_results("user_1", 2)] == ["result_3", "result_2"]
+    assert await repository.list_results("user_1", 0) == []
+
+    # A replaced result moves to its new submission time
+    await repository.save_result("key_1", {**result(1), "submitted_at": datetime(2024, 5, 6, 11, 0)})
+
+    assert [row["id"] for row in await repository.list_results("user_1", 5)] == ["result_1", "result_3", "result_2"]
+    assert [row["id"] for row in await repository.list_results("user_2", 5)] == ["result_9"]
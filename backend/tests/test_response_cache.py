@@ -0,0 +1,45 @@
+"""
+Pre-serialized news response cache tests
+"""
+
+import json
+
+from models.news import NewsView
+from services.response_cache import NewsResponseCache
+
+from tests.helpers import make_news
+
+
+def test_rendered_fragments_carry_live_fields():
+    cache = NewsResponseCache()
+    news_data = make_news(1)
+
+    payload = json.loads(cache.render(news_data, 42, True))
+
+    assert payload["id"] == "news_1"
+    assert payload["view_count"] == 42
+    assert payload["is_bookmarked"] is True
+    assert "content" not in json.loads(cache.render(news_data, 0, False, NewsView.CARD))
+
+
+def test_cache_evicts_least_recently_rendered_articles():
+    cache = NewsResponseCache(capacity=2)
+    articles = [make_news(index) for index in range(3)]
+    cache.render(articles[0], 0, False)
+    cache.render(articles[1], 0, False)
+    cache.render(articles[0], 0, False, NewsView.CARD)  # touches news_0
+    cache.render(articles[2], 0, False)
+
+    assert len(cache) == 2
+    assert set(cache._fragments) == {"news_0", "news_2"}
+
+
+def test_invalidate_drops_every_variant():
+    cache = NewsResponseCache()
+    news_data = make_news(1)
+    cache.render(news_data, 0, False)
+    cache.render(news_data, 0, False, NewsView.CARD, 100)
+
+    cache.invalidate(news_data)
+
+    assert len(cache) == 0
@@ -0,0 +1,158 @@
+"""
+RSS ingestion tests against a local stub feed server
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from models.news import NewsSource
+from services.rss_ingestion import FeedConfig, FeedIngestor
+
+FIXTURES = Path(__file__).parent / "fixtures"
+FEED_ETAG = '"defense-feed-v1"'
+
+
+class StubFeedHandler(BaseHTTPRequestHandler):
+    """Serves fixture feeds: conditional /feed.xml, a hanging /slow.xml and a failing /broken.xml"""
+
+    requests = []  # (path, If-None-Match) of every request seen
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/feed.xml":
+            if self.headers.get("If-None-Match") == FEED_ETAG:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = (FIXTURES / "defense_feed.xml").read_bytes()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("ETag", FEED_ETAG)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/slow.xml":
+            time.sleep(1.0)
+            self.send_response(200)
+            self.end_headers()
+        else:
+            self.send_response(500)
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def feed_server():
+    StubFeedHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubFeedHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_ingestor(base_url: str, path: str, upserted: list, **options) -> FeedIngestor:
+    feed = FeedConfig("stub", f"{base_url}{path}", NewsSource.PIB)
+
+    def upsert(items):
+        upserted.extend(items)
+        return len(items)
+
+    return FeedIngestor([feed], upsert, **options)
+
+
+@pytest.mark.asyncio
+async def test_fetch_parses_valid_entries_and_counts_invalid(feed_server):
+    upserted = []
+    ingestor = make_ingestor(feed_server, "/feed.xml", upserted)
+    try:
+        assert await ingestor.poll_all() == 2
+    finally:
+        await ingestor.close()
+
+    titles = [item.news.title for item in upserted]
+    assert titles == [
+        "Indian Navy Commissions New Stealth Frigate",
+        "Army Holds Joint Exercise With Air Force in Rajasthan",
+    ]
+    assert upserted[0].news.description.startswith("The Indian Navy commissioned")
+    assert upserted[0].published_at.isoformat() == "2024-05-06T09:30:00+00:00"
+    metrics = ingestor.metrics["stub"]
+    assert metrics.entries_parsed == 3
+    assert metrics.entries_invalid == 1
+    assert metrics.etag == FEED_ETAG
+
+
+@pytest.mark.asyncio
+async def test_second_poll_is_conditional_and_skips_unchanged_feed(feed_server):
+    upserted = []
+    ingestor = make_ingestor(feed_server, "/feed.xml", upserted)
+    try:
+        await ingestor.poll_all()
+        assert await ingestor.poll_all() == 0
+    finally:
+        await ingestor.close()
+
+    assert StubFeedHandler.requests == [("/feed.xml", None), ("/feed.xml", FEED_ETAG)]
+    metrics = ingestor.metrics["stub"]
+    assert metrics.last_status == 304
+    assert metrics.not_modified == 1
+    assert len(upserted) == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_feed_times_out_without_blocking_others(feed_server):
+    upserted = []
+    feeds = [
+        FeedConfig("slow", f"{feed_server}/slow.xml", NewsSource.PIB),
+        FeedConfig("stub", f"{feed_server}/feed.xml", NewsSource.PIB),
+    ]
+    ingestor = FeedIngestor(feeds, lambda items: upserted.extend(items) or len(items), timeout=0.2)
+    started = time.perf_counter()
+    try:
+        assert await ingestor.poll_all() == 2
+    finally:
+        await ingestor.close()
+
+    assert time.perf_counter() - started < 1.0
+    slow = ingestor.metrics["slow"]
+    assert slow.failures == 1
+    assert "Timeout" in slow.last_error
+    assert ingestor.metrics["stub"].failures == 0
+
+
+@pytest.mark.asyncio
+async def test_failing_feed_backs_off_exponentially(feed_server, monkeypatch):
+    monkeypatch.setattr("services.rss_ingestion.random.uniform", lambda low, high: 1.0)
+    clock = [1000.0]
+    monkeypatch.setattr("services.rss_ingestion.time.time", lambda: clock[0])
+    ingestor = make_ingestor(feed_server, "/broken.xml", [], backoff_base=30.0, backoff_max=100.0)
+    metrics = ingestor.metrics["stub"]
+    try:
+        await ingestor.poll_all()
+        assert metrics.next_attempt_at == 1030.0
+
+        # Still backing off: no request is made
+        await ingestor.poll_all()
+        assert len(StubFeedHandler.requests) == 1
+
+        clock[0] = 1030.0
+        await ingestor.poll_all()
+        assert metrics.next_attempt_at == 1090.0
+
+        clock[0] = 1090.0
+        await ingestor.poll_all()
+        assert metrics.next_attempt_at == 1190.0  # capped at backoff_max
+    finally:
+        await ingestor.close()
+
+    assert metrics.consecutive_failures == 3
+    assert metrics.last_status == 500
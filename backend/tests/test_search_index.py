@@ -0,0 +1,59 @@
+"""
+BM25 search index tests
+"""
+
+from services.search_index import SearchIndex
+
+
+def build_index() -> SearchIndex:
+    index = SearchIndex()
+    index.add_document("frigate", {
+        "title": "Navy commissions stealth frigate",
+        "content": "The navy commissioned a stealth frigate built in Mumbai.",
+    })
+    index.add_document("exercise", {
+        "title": "Army exercise along the border",
+        "content": "The army held an exercise. Navy observers attended the exercise briefly.",
+    })
+    index.add_document("budget", {
+        "title": "Defense budget raised",
+        "content": "The budget raises spending on army and air force modernization.",
+    })
+    return index
+
+
+def test_title_matches_outrank_body_matches():
+    results = build_index().search("navy")
+
+    assert [doc_id for doc_id, _ in results] == ["frigate", "exercise"]
+    assert results[0][1] > results[1][1] > 0
+
+
+def test_queries_are_conjunctive():
+    assert [doc_id for doc_id, _ in build_index().search("army navy")] == ["exercise"]
+    assert build_index().search("army submarine") == []
+
+
+def test_phrase_and_prefix_clauses():
+    index = build_index()
+
+    assert [doc_id for doc_id, _ in index.search('"stealth frigate"')] == ["frigate"]
+    assert index.search('"frigate stealth"') == []
+    assert {doc_id for doc_id, _ in index.search("moderni*")} == {"budget"}
+
+
+def test_rare_terms_score_higher_than_common_ones():
+    index = build_index()
+    army_score = dict(index.search("army"))["exercise"]
+    observers_score = dict(index.search("observers"))["exercise"]
+
+    assert observers_score > army_score
+
+
+def test_removed_documents_stop_matching():
+    index = build_index()
+    index.remove_document("frigate")
+
+    assert [doc_id for doc_id, _ in index.search("navy")] == ["exercise"]
+    assert index.search("mumbai") == []
+    assert len(index) == 2
@@ -0,0 +1,69 @@
+"""
+Trending engine tests
+"""
+
+import time
+from datetime import datetime, timezone
+
+from models.news import NewsCategory
+from services.trending import TrendingEngine
+
+from tests.helpers import make_news
+
+
+def recent_news(index: int, category: NewsCategory = NewsCategory.DEFENSE) -> dict:
+    return make_news(index, category=category, published_at=datetime.fromtimestamp(time.time() - index * 60, timezone.utc))
+
+
+def test_more_viewed_articles_rank_first():
+    engine = TrendingEngine(half_life_hours=6, window_hours=72, capacity=5)
+    for index in range(3):
+        engine.track(recent_news(index))
+    engine.record_view("news_2", count=5)
+    engine.record_view("news_0", count=2)
+
+    assert engine.top(3) == ["news_2", "news_0", "news_1"]
+
+
+def test_untracked_members_are_backfilled_from_tracked_scores():
+    engine = TrendingEngine(half_life_hours=6, window_hours=72, capacity=3)
+    for index in range(6):
+        engine.track(recent_news(index))
+        engine.record_view(f"news_{index}", count=10 - index)
+
+    assert engine.top(3) == ["news_0", "news_1", "news_2"]
+    engine.untrack({"id": "news_0"})
+    engine.untrack({"id": "news_1"})
+
+    # news_3 and news_4 were turned away while the board was full
+    assert engine.top(3) == ["news_2", "news_3", "news_4"]
+    assert engine.top(3, NewsCategory.DEFENSE) == ["news_2", "news_3", "news_4"]
+
+
+def test_category_change_backfills_the_old_category():
+    engine = TrendingEngine(half_life_hours=6, window_hours=72, capacity=2)
+    for index in range(3):
+        engine.track(recent_news(index))
+        engine.record_view(f"news_{index}", count=10 - index)
+
+    engine.track(recent_news(0, NewsCategory.ECONOMY))
+
+    assert engine.top(2, NewsCategory.DEFENSE) == ["news_1", "news_2"]
+    assert engine.top(2, NewsCategory.ECONOMY) == ["news_0"]
+
+
+def test_articles_leave_the_boards_when_they_fall_out_of_the_window(monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr("services.trending.time.time", lambda: now[0])
+    engine = TrendingEngine(half_life_hours=6, window_hours=1, capacity=5)
+    engine.track(recent_news(0))
+    engine.track(make_news(1, published_at=datetime.fromtimestamp(now[0] - 3000, timezone.utc)))
+    engine.record_view("news_1", count=10)
+
+    assert engine.top(5) == ["news_1", "news_0"]
+
+    now[0] += 1200  # news_1 is now 70 minutes old
+    assert engine.top(5) == ["news_0"]
+    assert engine.top(5, NewsCategory.DEFENSE) == ["news_0"]
+    engine.record_view("news_1", count=10)
+    assert engine.top(5) == ["news_0"]
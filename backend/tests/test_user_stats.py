@@ -0,0 +1,131 @@
+"""
+Incremental streak and day rollover tests
+"""
+
+from datetime import date, timedelta
+
+from models.user import UserStats
+from services.user_stats import UserStatsEngine, mask_from_week, week_from_mask
+
+DAY = date(2024, 5, 6)
+
+
+def test_week_mask_round_trips():
+    week = [True, False, False, True, False, True, True]
+
+    assert week_from_mask(mask_from_week(week)) == week
+
+
+def test_consecutive_days_grow_the_streak():
+    engine = UserStatsEngine()
+    engine.stats("user_1", UserStats(), DAY)
+    for offset in range(3):
+        stored = engine.record_quiz("user_1", DAY + timedelta(days=offset), 90)
+
+    assert stored.current_streak == 3
+    assert stored.best_streak == 3
+    assert stored.quizzes_taken == 3
+    assert stored.minutes_practiced == 6  # 90 s rounds to 2 minutes
+    assert stored.weekly_streak == [False] * 4 + [True] * 3
+
+
+def test_same_day_activity_keeps_the_streak():
+    engine = UserStatsEngine()
+    engine.stats("user_1", UserStats(), DAY)
+    engine.record_quiz("user_1", DAY, None)
+    stored = engine.record_quiz("user_1", DAY, None)
+
+    assert stored.current_streak == 1
+    assert stored.quizzes_taken == 2
+
+
+def test_missed_day_restarts_the_streak():
+    engine = UserStatsEngine()
+    engine.stats("user_1", UserStats(), DAY)
+    engine.record_quiz("user_1", DAY, None)
+    engine.record_quiz("user_1", DAY + timedelta(days=1), None)
+    stored = engine.record_quiz("user_1", DAY + timedelta(days=3), None)
+
+    assert stored.current_streak == 1
+    assert stored.best_streak == 2
+    assert stored.weekly_streak == [False] * 3 + [True, True, False, True]
+
+
+def test_stats_roll_over_to_later_days_without_activity():
+    engine = UserStatsEngine()
+    engine.stats("user_1", UserStats(), DAY)
+    engine.record_quiz("user_1", DAY, None)
+
+    next_day = engine.stats("user_1", UserStats(), DAY + timedelta(days=1))
+    two_days_later = engine.stats("user_1", UserStats(), DAY + timedelta(days=2))
+    much_later = engine.stats("user_1", UserStats(), DAY + timedelta(days=30))
+
+    assert next_day.current_streak == 1  # today can still continue it
+    assert next_day.weekly_streak == [False] * 5 + [True, False]
+    assert two_days_later.current_streak == 0
+    assert two_days_later.weekly_streak == [False] * 4 + [True, False, False]
+    assert much_later.weekly_streak == [False] * 7
+    assert much_later.best_streak == 1
+
+
+def test_stored_stats_are_the_starting_point():
+    stored = UserStats(
+        current_streak=4, best_streak=9, quizzes_taken=20, minutes_practiced=100,
+        weekly_streak=[False, False, False, True, True, True, True], last_active_date=DAY
+    )
+    engine = UserStatsEngine()
+
+    assert engine.stats("user_1", stored, DAY).current_streak == 4
+    updated = engine.record_quiz("user_1", DAY + timedelta(days=1), 60)
+
+    assert (updated.current_streak, updated.best_streak, updated.quizzes_taken) == (5, 9, 21)
+    assert updated.weekly_streak == [False, False, True, True, True, True, True]
+
+
+def test_reads_rebase_on_activity_stored_by_other_workers():
+    engine = UserStatsEngine()
+    engine.stats("user_1", UserStats(), DAY)
+    engine.record_quiz("user_1", DAY, 60)
+    elsewhere = UserStats(
+        current_streak=1, best_streak=1, quizzes_taken=3, minutes_practiced=5,
+        weekly_streak=[False] * 6 + [True], last_active_date=DAY
+    )
+
+    assert engine.stats("user_1", elsewhere, DAY).quizzes_taken == 3
+    assert engine.record_quiz("user_1", DAY, 60).quizzes_taken == 4
+
+
+def test_snapshots_older_than_local_activity_are_ignored():
+    engine = UserStatsEngine()
+    snapshot = UserStats()
+    engine.stats("user_1", snapshot, DAY)
+    engine.record_quiz("user_1", DAY, 60)
+
+    # A request that read the user before the quiz was recorded
+    assert engine.stats("user_1", snapshot, DAY).quizzes_taken == 1
+
+
+def test_each_article_counts_once_per_day():
+    engine = UserStatsEngine()
+    engine.stats("user_1", UserStats(), DAY)
+
+    assert engine.record_reading("user_1", DAY, "news_1", 3).minutes_practiced == 3
+    assert engine.record_reading("user_1", DAY, "news_2", 2).minutes_practiced == 5
+    assert engine.record_reading("user_1", DAY, "news_1", 3) is None
+    assert engine.record_reading("user_1", DAY + timedelta(days=1), "news_1", 3).minutes_practiced == 8
+
+
+def test_least_recently_used_users_are_evicted_and_rebuilt_from_stored_stats():
+    engine = UserStatsEngine(capacity=2)
+    engine.stats("user_1", UserStats(), DAY)
+    stored = engine.record_quiz("user_1", DAY, None)
+    engine.stats("user_2", UserStats(), DAY)
+    engine.stats("user_1", stored, DAY)
+    engine.stats("user_3", UserStats(), DAY)
+
+    assert len(engine) == 2
+    # user_2 was evicted: its activity is not counted from zero
+    assert engine.record_quiz("user_2", DAY, None) is None
+    engine.stats("user_2", UserStats(quizzes_taken=4, last_active_date=DAY, weekly_streak=[True] * 7), DAY)
+    assert engine.record_quiz("user_2", DAY, None).quizzes_taken == 5
+    assert engine.record_quiz("user_3", DAY, None).quizzes_taken == 1
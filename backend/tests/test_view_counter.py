@@ -0,0 +1,76 @@
+"""
+Write-behind view counter tests
+"""
+
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from services.view_counter import ViewCounterBuffer
+
+from tests.helpers import make_news
+
+
+def test_views_are_merged_into_counts_until_flushed():
+    batches: List[Dict[str, int]] = []
+    counter = ViewCounterBuffer(batches.append, shards=4)
+    news_data = make_news(1, view_count=10)
+    for _ in range(3):
+        counter.increment("news_1")
+    counter.increment("news_2", count=2)
+
+    assert counter.view_count(news_data) == 13
+    assert batches == []
+
+    assert counter.flush() == 2
+    assert batches == [{"news_1": 3, "news_2": 2}]
+    assert counter.pending("news_1") == 0
+    assert counter.flush() == 0
+    assert counter.flushed_batches == 1
+
+
+def test_reaching_the_pending_threshold_flushes():
+    batches: List[Dict[str, int]] = []
+    counter = ViewCounterBuffer(batches.append, max_pending=5)
+    for index in range(4):
+        counter.increment(f"news_{index}")
+    assert batches == []
+
+    counter.increment("news_0")
+
+    assert batches == [{"news_0": 2, "news_1": 1, "news_2": 1, "news_3": 1}]
+
+
+def test_version_changes_with_every_view():
+    counter = ViewCounterBuffer(lambda batch: None)
+    counter.increment("news_1")
+    version = counter.version
+
+    counter.flush()
+    assert counter.version == version
+    counter.increment("news_1")
+    assert counter.version != version
+
+
+@pytest.mark.asyncio
+async def test_timer_flushes_and_stop_drains_the_rest():
+    batches: List[Dict[str, int]] = []
+    counter = ViewCounterBuffer(batches.append, flush_interval=0.01)
+    counter.start()
+    counter.increment("news_1")
+    await asyncio.sleep(0.05)
+    assert batches == [{"news_1": 1}]
+
+    counter.increment("news_2")
+    await counter.stop()
+
+    assert batches == [{"news_1": 1}, {"news_2": 1}]
+
+
+def test_article_reads_count_buffered_views(client, auth_headers):
+    first = client.get("/api/v1/news/news_1", headers=auth_headers).json()["view_count"]
+
+    second = client.get("/api/v1/news/news_1", headers=auth_headers).json()["view_count"]
+
+    assert second == first + 1